@@ -59,6 +59,7 @@ from src.analysis.predictive import (
     RiskForecast,
     ForecastAccuracy,
     PredictiveAlert,
+    RiskEventBatch,
 )
 from src.analysis.mitigation import (
     MitigationGenerator,
@@ -203,6 +204,7 @@ __all__ = [
     "RiskForecast",
     "ForecastAccuracy",
     "PredictiveAlert",
+    "RiskEventBatch",
     # Mitigation
     "MitigationGenerator",
     "MitigationRanker",
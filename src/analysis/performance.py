@@ -7,16 +7,21 @@ data retention policies, and horizontal scaling support.
 
 from __future__ import annotations
 
+from bisect import bisect_left, insort
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Any, Callable, TypeVar, Generic
-from collections import defaultdict
-from functools import wraps
+from typing import Any, Callable, TypeVar, Generic, cast
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import update_wrapper, wraps
+from itertools import islice
+import inspect
 import threading
 import time
 import asyncio
 import uuid
+import weakref
 import structlog
 
 logger = structlog.get_logger(__name__)
@@ -24,6 +29,16 @@ logger = structlog.get_logger(__name__)
 T = TypeVar("T")
 
 
+def _to_iso(timestamp_ns: int) -> str:
+    """Format an epoch timestamp in nanoseconds as an ISO-8601 UTC string."""
+    seconds, nanos = divmod(timestamp_ns, 1_000_000_000)
+    return (
+        datetime.fromtimestamp(seconds, tz=timezone.utc)
+        .replace(microsecond=nanos // 1000)
+        .isoformat()
+    )
+
+
 # =============================================================================
 # Enums and Data Classes
 # =============================================================================
@@ -153,6 +168,45 @@ class ThroughputMetrics:
 # =============================================================================
 
 
+class _PrefixIndex:
+    """
+    Sorted list of cache keys.
+
+    Keys sharing a prefix are contiguous, so prefix invalidation bisects to
+    the first match and stops at the first non-match instead of scanning
+    every key in the cache. Each key costs one list slot.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._keys: list[str] = []
+
+    def add(self, key: str) -> None:
+        """Index a key."""
+        insort(self._keys, key)
+
+    def discard(self, key: str) -> None:
+        """Remove a key from the index if present."""
+        keys = self._keys
+        i = bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            del keys[i]
+
+    def pop_prefix(self, prefix: str) -> list[str]:
+        """Remove and return all indexed keys starting with prefix."""
+        keys = self._keys
+        start = end = bisect_left(keys, prefix)
+        while end < len(keys) and keys[end].startswith(prefix):
+            end += 1
+        matches = keys[start:end]
+        del keys[start:end]
+        return matches
+
+    def clear(self) -> None:
+        """Remove all keys."""
+        self._keys.clear()
+
+
 class QueryCache(Generic[T]):
     """
     Thread-safe query caching with multiple eviction strategies.
@@ -178,6 +232,7 @@ class QueryCache(Generic[T]):
         self._default_ttl = default_ttl
         self._strategy = strategy
         self._cache: dict[str, CacheEntry[T]] = {}
+        self._prefix_index = _PrefixIndex()
         self._stats = CacheStats()
         self._lock = threading.RLock()
         self._invalidation_callbacks: list[Callable[[str], None]] = []
@@ -200,7 +255,7 @@ class QueryCache(Generic[T]):
                 return None
             
             if entry.is_expired():
-                del self._cache[key]
+                self._remove(key)
                 self._stats.misses += 1
                 self._stats.evictions += 1
                 return None
@@ -227,6 +282,8 @@ class QueryCache(Generic[T]):
                 self._evict()
             
             now = datetime.now(timezone.utc)
+            if key not in self._cache:
+                self._prefix_index.add(key)
             self._cache[key] = CacheEntry(
                 key=key,
                 value=value,
@@ -247,18 +304,20 @@ class QueryCache(Generic[T]):
             True if entry was removed.
         """
         with self._lock:
-            if key in self._cache:
-                del self._cache[key]
-                self._stats.size = len(self._cache)
-                
-                for callback in self._invalidation_callbacks:
-                    try:
-                        callback(key)
-                    except Exception as e:
-                        logger.error("Invalidation callback failed", error=str(e))
-                
-                return True
-            return False
+            try:
+                self._remove(key)
+            except KeyError:
+                return False
+            
+            self._stats.size = len(self._cache)
+            
+            for callback in self._invalidation_callbacks:
+                try:
+                    callback(key)
+                except Exception as e:
+                    logger.error("Invalidation callback failed", error=str(e))
+            
+            return True
 
     def invalidate_pattern(self, pattern: str) -> int:
         """
@@ -271,7 +330,7 @@ class QueryCache(Generic[T]):
             Number of entries invalidated.
         """
         with self._lock:
-            keys_to_remove = [k for k in self._cache if k.startswith(pattern)]
+            keys_to_remove = self._prefix_index.pop_prefix(pattern)
             
             for key in keys_to_remove:
                 del self._cache[key]
@@ -285,8 +344,14 @@ class QueryCache(Generic[T]):
         """Clear all cache entries."""
         with self._lock:
             self._cache.clear()
+            self._prefix_index.clear()
             self._stats.size = 0
 
+    def _remove(self, key: str) -> None:
+        """Remove an entry and its prefix index record."""
+        del self._cache[key]
+        self._prefix_index.discard(key)
+
     def _evict(self) -> None:
         """Evict entries based on strategy."""
         if not self._cache:
@@ -298,7 +363,7 @@ class QueryCache(Generic[T]):
                 self._cache.keys(),
                 key=lambda k: self._cache[k].last_accessed,
             )
-            del self._cache[oldest_key]
+            self._remove(oldest_key)
         
         elif self._strategy == CacheStrategy.LFU:
             # Remove least frequently used
@@ -306,7 +371,7 @@ class QueryCache(Generic[T]):
                 self._cache.keys(),
                 key=lambda k: self._cache[k].access_count,
             )
-            del self._cache[lfu_key]
+            self._remove(lfu_key)
         
         elif self._strategy == CacheStrategy.TTL:
             # Remove expired entries first, then oldest
@@ -315,25 +380,30 @@ class QueryCache(Generic[T]):
             
             if expired:
                 for key in expired[:1]:  # Remove one
-                    del self._cache[key]
+                    self._remove(key)
             else:
                 oldest_key = min(
                     self._cache.keys(),
                     key=lambda k: self._cache[k].created_at,
                 )
-                del self._cache[oldest_key]
+                self._remove(oldest_key)
         
         self._stats.evictions += 1
 
     def get_stats(self) -> CacheStats:
         """Get cache statistics."""
         with self._lock:
-            return CacheStats(
-                hits=self._stats.hits,
-                misses=self._stats.misses,
-                evictions=self._stats.evictions,
-                size=len(self._cache),
-            )
+            hits = self._stats.hits
+            misses = self._stats.misses
+            evictions = self._stats.evictions
+            size = len(self._cache)
+        
+        return CacheStats(
+            hits=hits,
+            misses=misses,
+            evictions=evictions,
+            size=size,
+        )
 
     def on_invalidate(self, callback: Callable[[str], None]) -> None:
         """Register an invalidation callback."""
@@ -345,6 +415,85 @@ class QueryCache(Generic[T]):
 # =============================================================================
 
 
+_CODEGEN_RESERVED = frozenset(
+    {"_cache", "_func", "_ttl", "_key_head", "_key", "_result"}
+)
+
+
+def _build_specialized_wrapper(
+    func: Callable,
+    cache: QueryCache,
+    key_head: str,
+    ttl: int | None,
+) -> Callable | None:
+    """
+    Generate a cache wrapper with the key computation inlined for func.
+
+    Returns None when the signature cannot be specialized (variadic
+    parameters, unsupported callables, or names that would shadow the
+    wrapper's own locals), in which case the generic wrapper is used.
+    """
+    try:
+        signature = inspect.signature(func)
+    except (TypeError, ValueError):
+        return None
+    
+    namespace: dict[str, Any] = {
+        "_cache": cache,
+        "_func": func,
+        "_ttl": ttl,
+        "_key_head": key_head,
+    }
+    params: list[str] = []
+    call_args: list[str] = []
+    seen_positional_only = False
+    seen_keyword_only = False
+    
+    for name, param in signature.parameters.items():
+        if param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+            return None
+        if name in _CODEGEN_RESERVED:
+            return None
+        
+        if param.kind == param.POSITIONAL_ONLY:
+            seen_positional_only = True
+        elif seen_positional_only:
+            params.append("/")
+            seen_positional_only = False
+        
+        if param.kind == param.KEYWORD_ONLY and not seen_keyword_only:
+            params.append("*")
+            seen_keyword_only = True
+        
+        if param.default is param.empty:
+            params.append(name)
+        else:
+            default_name = f"_default_{name}"
+            namespace[default_name] = param.default
+            params.append(f"{name}={default_name}")
+        
+        call_args.append(
+            f"{name}={name}" if param.kind == param.KEYWORD_ONLY else name
+        )
+    
+    if seen_positional_only:
+        params.append("/")
+    
+    key_expr = "".join(f":{{{name}!s}}" for name in signature.parameters)
+    source = (
+        f"def wrapper({', '.join(params)}):\n"
+        f"    _key = f\"{{_key_head}}{key_expr}\"\n"
+        f"    _result = _cache.get(_key)\n"
+        f"    if _result is not None:\n"
+        f"        return _result\n"
+        f"    _result = _func({', '.join(call_args)})\n"
+        f"    _cache.set(_key, _result, _ttl)\n"
+        f"    return _result\n"
+    )
+    exec(source, namespace)
+    return cast(Callable[..., Any], namespace["wrapper"])
+
+
 def cached(
     cache: QueryCache,
     key_prefix: str = "",
@@ -353,12 +502,22 @@ def cached(
     """
     Decorator for caching function results.
 
+    Functions with a fixed signature get a generated wrapper that builds the
+    cache key directly from the declared parameters; variadic functions use
+    a generic wrapper.
+
     Args:
         cache: QueryCache instance to use.
         key_prefix: Prefix for cache keys.
         ttl: Optional TTL override.
     """
     def decorator(func: Callable) -> Callable:
+        specialized = _build_specialized_wrapper(
+            func, cache, f"{key_prefix}:{func.__name__}", ttl
+        )
+        if specialized is not None:
+            return update_wrapper(specialized, func)
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
             # Generate cache key
@@ -401,20 +560,32 @@ class BatchProcessor:
         batch_size: int = 100,
         max_wait_seconds: float = 1.0,
         target_rate: float = 100.0,  # events per minute
+        max_workers: int | None = None,
+        max_batch_size: int | None = None,
     ):
         """
         Initialize the batch processor.
 
         Args:
-            batch_size: Maximum batch size.
+            batch_size: Batch size used by process_items, and the starting
+                point for adaptive sizing.
             max_wait_seconds: Maximum seconds to wait for batch.
             target_rate: Target throughput rate.
+            max_workers: Threads used to run I/O-bound processors
+                concurrently. None or 1 processes items sequentially.
+            max_batch_size: Upper bound for adaptive batch sizing. When set,
+                the batch size used by process_items grows while throughput
+                is below target and shrinks when batches exceed
+                max_wait_seconds.
         """
-        self._batch_size = batch_size
+        self._batch_size_cap = max_batch_size
+        self._current_batch_size = batch_size
         self._max_wait = max_wait_seconds
         self._target_rate = target_rate
+        self._workers = max_workers or 1
         self._metrics = ThroughputMetrics()
-        self._processing_times: list[float] = []
+        self._processing_times: deque[int] = deque(maxlen=100)
+        self._sum_processing_times = 0
         self._lock = threading.Lock()
 
     def process_batch(
@@ -433,32 +604,47 @@ class BatchProcessor:
             BatchResult with processing statistics.
         """
         batch_id = f"batch-{uuid.uuid4().hex[:8]}"
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
         processed = 0
         failed = 0
         errors: list[str] = []
         
-        for item in items:
-            try:
-                processor(item)
-                processed += 1
-            except Exception as e:
-                failed += 1
-                errors.append(str(e))
+        if self._workers > 1 and len(items) > 1:
+            with ThreadPoolExecutor(max_workers=self._workers) as executor:
+                futures = [executor.submit(processor, item) for item in items]
+                for future in futures:
+                    try:
+                        future.result()
+                        processed += 1
+                    except Exception as e:
+                        failed += 1
+                        errors.append(str(e))
+        else:
+            for item in items:
+                try:
+                    processor(item)
+                    processed += 1
+                except Exception as e:
+                    failed += 1
+                    errors.append(str(e))
         
-        duration_ms = int((time.time() - start_time) * 1000)
-        items_per_second = len(items) / max(duration_ms / 1000, 0.001)
+        duration_ns = time.perf_counter_ns() - start_ns
+        duration_ms = duration_ns // 1_000_000
+        items_per_second = len(items) * 1_000_000_000 / max(duration_ns, 1)
         
         # Update metrics
         with self._lock:
             self._metrics.events_processed += processed
-            self._processing_times.append(duration_ms)
-            if len(self._processing_times) > 100:
-                self._processing_times = self._processing_times[-100:]
+            # Keep a running sum so the rolling average is O(1) per batch
+            times = self._processing_times
+            if len(times) == times.maxlen:
+                self._sum_processing_times -= times[0]
+            times.append(duration_ms)
+            self._sum_processing_times += duration_ms
             
             self._metrics.avg_processing_time_ms = (
-                sum(self._processing_times) / len(self._processing_times)
+                self._sum_processing_times / len(times)
             )
             
             if items_per_second > self._metrics.peak_rate:
@@ -467,6 +653,8 @@ class BatchProcessor:
             # Calculate events per minute
             self._metrics.events_per_minute = items_per_second * 60
             self._metrics.last_updated = datetime.now(timezone.utc)
+            
+            self._adjust_batch_size()
         
         logger.info(
             "Batch processed",
@@ -485,6 +673,51 @@ class BatchProcessor:
             errors=errors,
         )
 
+    def _adjust_batch_size(self) -> None:
+        """Tune the recommended batch size from observed throughput and latency."""
+        cap = self._batch_size_cap
+        if cap is None:
+            return
+        
+        latency_budget_ms = self._max_wait * 1000
+        avg_ms = self._metrics.avg_processing_time_ms
+        
+        if avg_ms > latency_budget_ms:
+            self._current_batch_size = max(self._current_batch_size // 2, 1)
+        elif self._metrics.events_per_minute < self._target_rate:
+            self._current_batch_size = min(self._current_batch_size * 2, cap)
+
+    @property
+    def batch_size(self) -> int:
+        """Get the recommended size for the next batch."""
+        return self._current_batch_size
+
+    def process_items(
+        self,
+        items: list[Any],
+        processor: Callable[[Any], Any],
+    ) -> list[BatchResult]:
+        """
+        Process items in successive batches.
+
+        Each batch takes the current recommended batch size, so with
+        max_batch_size set the batches adapt as throughput is observed.
+
+        Args:
+            items: Items to process.
+            processor: Processing function.
+
+        Returns:
+            BatchResult for each batch, in order.
+        """
+        results = []
+        start = 0
+        while start < len(items):
+            end = start + self.batch_size
+            results.append(self.process_batch(items[start:end], processor))
+            start = end
+        return results
+
     async def process_batch_async(
         self,
         items: list[Any],
@@ -502,13 +735,20 @@ class BatchProcessor:
     def get_metrics(self) -> ThroughputMetrics:
         """Get current throughput metrics."""
         with self._lock:
-            return ThroughputMetrics(
-                events_processed=self._metrics.events_processed,
-                events_per_minute=self._metrics.events_per_minute,
-                peak_rate=self._metrics.peak_rate,
-                avg_processing_time_ms=self._metrics.avg_processing_time_ms,
-                last_updated=self._metrics.last_updated,
-            )
+            metrics = self._metrics
+            events_processed = metrics.events_processed
+            events_per_minute = metrics.events_per_minute
+            peak_rate = metrics.peak_rate
+            avg_processing_time_ms = metrics.avg_processing_time_ms
+            last_updated = metrics.last_updated
+        
+        return ThroughputMetrics(
+            events_processed=events_processed,
+            events_per_minute=events_per_minute,
+            peak_rate=peak_rate,
+            avg_processing_time_ms=avg_processing_time_ms,
+            last_updated=last_updated,
+        )
 
     def is_meeting_target(self) -> bool:
         """Check if meeting target throughput."""
@@ -527,6 +767,13 @@ class ResourceMonitor:
     Tracks CPU, memory, network, and disk usage with alerting.
     """
 
+    _LIMIT_ATTRS = {
+        ResourceType.CPU: "cpu_percent",
+        ResourceType.MEMORY: "memory_mb",
+        ResourceType.NETWORK: "network_mbps",
+        ResourceType.DISK: "disk_iops",
+    }
+
     def __init__(self, limits: ResourceLimits | None = None):
         """
         Initialize the resource monitor.
@@ -535,7 +782,9 @@ class ResourceMonitor:
             limits: Resource limits configuration.
         """
         self._limits = limits or ResourceLimits()
-        self._usage_history: dict[ResourceType, list[ResourceUsage]] = defaultdict(list)
+        self._usage_history: dict[ResourceType, deque[ResourceUsage]] = defaultdict(
+            lambda: deque(maxlen=100)
+        )
         self._violation_callbacks: list[Callable[[ResourceUsage], None]] = []
         self._lock = threading.Lock()
         
@@ -559,37 +808,32 @@ class ResourceMonitor:
         """
         current = self._current_usage.get(resource_type, 0.0)
         limit = self._get_limit(resource_type)
-        percentage = (current / limit * 100) if limit > 0 else 0.0
-        
         usage = ResourceUsage(
             resource_type=resource_type,
             current_value=current,
             limit=limit,
-            percentage=percentage,
+            percentage=(current / limit * 100) if limit > 0 else 0.0,
             timestamp=datetime.now(timezone.utc),
         )
         
         with self._lock:
+            # Bounded deque keeps the last 100 samples
             self._usage_history[resource_type].append(usage)
-            # Keep last 100 samples
-            if len(self._usage_history[resource_type]) > 100:
-                self._usage_history[resource_type] = (
-                    self._usage_history[resource_type][-100:]
-                )
         
         return usage
 
+    def _pct(self, resource_type: ResourceType) -> float:
+        """Get current usage as a percentage of the limit."""
+        current = self._current_usage.get(resource_type, 0.0)
+        limit = self._get_limit(resource_type)
+        return (current / limit * 100) if limit > 0 else 0.0
+
     def _get_limit(self, resource_type: ResourceType) -> float:
         """Get limit for resource type."""
-        if resource_type == ResourceType.CPU:
-            return self._limits.cpu_percent
-        elif resource_type == ResourceType.MEMORY:
-            return self._limits.memory_mb
-        elif resource_type == ResourceType.NETWORK:
-            return self._limits.network_mbps
-        elif resource_type == ResourceType.DISK:
-            return self._limits.disk_iops
-        return 100.0
+        attr = self._LIMIT_ATTRS.get(resource_type)
+        if attr is None:
+            return 100.0
+        return cast(float, getattr(self._limits, attr))
 
     def check_limits(self) -> list[ResourceUsage]:
         """
@@ -601,19 +845,20 @@ class ResourceMonitor:
         violations = []
         
         for resource_type in ResourceType:
+            if self._pct(resource_type) < 100:
+                continue
+            
             usage = self.get_usage(resource_type)
+            violations.append(usage)
             
-            if usage.percentage >= 100:
-                violations.append(usage)
-                
-                for callback in self._violation_callbacks:
-                    try:
-                        callback(usage)
-                    except Exception as e:
-                        logger.error(
-                            "Violation callback failed",
-                            error=str(e),
-                        )
+            for callback in self._violation_callbacks:
+                try:
+                    callback(usage)
+                except Exception as e:
+                    logger.error(
+                        "Violation callback failed",
+                        error=str(e),
+                    )
         
         return violations
 
@@ -625,8 +870,7 @@ class ResourceMonitor:
     def is_within_limits(self) -> bool:
         """Check if all resources are within limits."""
         for resource_type in ResourceType:
-            usage = self.get_usage(resource_type)
-            if usage.percentage >= 100:
+            if self._pct(resource_type) >= 100:
                 return False
         return True
 
@@ -641,7 +885,9 @@ class ResourceMonitor:
     ) -> list[ResourceUsage]:
         """Get usage history for a resource type."""
         with self._lock:
-            return self._usage_history[resource_type][-limit:]
+            history = self._usage_history[resource_type]
+            start = max(0, len(history) - limit)
+            return list(islice(history, start, None))
 
 
 # =============================================================================
@@ -656,6 +902,13 @@ class RetentionManager:
     Defines retention periods, archives old data, and runs cleanup jobs.
     """
 
+    _PERIOD_DAYS = {
+        RetentionPeriod.DAYS_7: 7,
+        RetentionPeriod.DAYS_30: 30,
+        RetentionPeriod.DAYS_90: 90,
+        RetentionPeriod.DAYS_365: 365,
+    }
+
     def __init__(self):
         """Initialize the retention manager."""
         self._policies: dict[str, RetentionPolicy] = {}
@@ -697,17 +950,8 @@ class RetentionManager:
         if policy.retention_period == RetentionPeriod.INDEFINITE:
             return None
         
-        now = datetime.now(timezone.utc)
-        
-        period_days = {
-            RetentionPeriod.DAYS_7: 7,
-            RetentionPeriod.DAYS_30: 30,
-            RetentionPeriod.DAYS_90: 90,
-            RetentionPeriod.DAYS_365: 365,
-        }
-        
-        days = period_days.get(policy.retention_period, 30)
-        return now - timedelta(days=days)
+        days = self._PERIOD_DAYS.get(policy.retention_period, 30)
+        return datetime.now(timezone.utc) - timedelta(days=days)
 
     def apply_retention(
         self,
@@ -738,12 +982,26 @@ class RetentionManager:
         to_archive = []
         to_delete = []
         
+        # Pick the comparison once per batch from the first dated item
+        sample = next(
+            (item.get(date_field) for item in items if item.get(date_field)),
+            None,
+        )
+        is_expired = _expiry_check(sample, cutoff)
+        
         for item in items:
             item_date = item.get(date_field)
-            if isinstance(item_date, str):
-                item_date = datetime.fromisoformat(item_date.replace("Z", "+00:00"))
+            if item_date is None or item_date == "":
+                retained.append(item)
+                continue
             
-            if item_date and item_date < cutoff:
+            try:
+                expired = is_expired(item_date)
+            except (TypeError, AttributeError):
+                # Mixed date types in one batch; fall back to full coercion
+                expired = _to_datetime(item_date) < cutoff
+            
+            if expired:
                 if policy.archive_enabled:
                     to_archive.append(item)
                     self._archived_counts[data_type] += 1
@@ -771,6 +1029,29 @@ class RetentionManager:
         }
 
 
+def _to_datetime(value: datetime | str | float) -> datetime:
+    """Coerce an ISO string or epoch timestamp to a datetime."""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, tz=timezone.utc)
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _expiry_check(sample: Any, cutoff: datetime) -> Callable[[Any], bool]:
+    """Build a cutoff comparison specialized for the sample's date type."""
+    if isinstance(sample, datetime):
+        return lambda value: value < cutoff
+    
+    if isinstance(sample, (int, float)):
+        cutoff_ts = cutoff.timestamp()
+        return lambda value: value < cutoff_ts
+    
+    return lambda value: (
+        datetime.fromisoformat(value.replace("Z", "+00:00")) < cutoff
+    )
+
+
 # =============================================================================
 # Horizontal Scaling Support
 # =============================================================================
@@ -783,16 +1064,23 @@ class ScalingManager:
     Supports multiple API instances with distributed state.
     """
 
-    def __init__(self, instance_id: str | None = None):
+    def __init__(
+        self,
+        instance_id: str | None = None,
+        max_shared_state: int | None = None,
+    ):
         """
         Initialize the scaling manager.
 
         Args:
             instance_id: Unique instance identifier.
+            max_shared_state: Optional cap on shared state entries; the least
+                recently written keys are dropped first.
         """
         self._instance_id = instance_id or f"instance-{uuid.uuid4().hex[:8]}"
         self._registered_instances: dict[str, dict] = {}
-        self._shared_state: dict[str, Any] = {}
+        self._shared_state: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._max_shared_state = max_shared_state
         self._lock = threading.Lock()
         
         # Register self
@@ -800,9 +1088,10 @@ class ScalingManager:
 
     def _register_instance(self) -> None:
         """Register this instance."""
+        # Timestamps are stored as epoch nanoseconds and formatted on read
         self._registered_instances[self._instance_id] = {
             "id": self._instance_id,
-            "registered_at": datetime.now(timezone.utc).isoformat(),
+            "registered_at_ns": time.time_ns(),
             "status": "active",
             "health": "healthy",
         }
@@ -815,22 +1104,52 @@ class ScalingManager:
     def get_instances(self) -> list[dict]:
         """Get all registered instances."""
         with self._lock:
-            return list(self._registered_instances.values())
+            snapshot = [dict(i) for i in self._registered_instances.values()]
+        
+        instances = []
+        for instance in snapshot:
+            registered_ns = instance.pop("registered_at_ns", None)
+            if registered_ns is not None:
+                instance["registered_at"] = _to_iso(registered_ns)
+            heartbeat_ns = instance.pop("last_heartbeat_ns", None)
+            if heartbeat_ns is not None:
+                instance["last_heartbeat"] = _to_iso(heartbeat_ns)
+            instances.append(instance)
+        
+        return instances
 
-    def set_shared_state(self, key: str, value: Any) -> None:
+    def set_shared_state(self, key: str, value: Any, weak: bool = False) -> None:
         """
         Set shared state.
 
         Args:
             key: State key.
             value: State value.
+            weak: Hold only a weak reference to the value, so the entry
+                disappears once the value is no longer used elsewhere.
+                Only weak-referenceable values (instances of ordinary
+                classes, functions, sets) can be held weakly; built-ins such
+                as dict, list, str, int and tuple are stored strongly.
         """
+        stored = value
+        if weak:
+            try:
+                stored = weakref.ref(value)
+            except TypeError:
+                weak = False
+        
         with self._lock:
             self._shared_state[key] = {
-                "value": value,
+                "value": stored,
+                "weak": weak,
                 "updated_by": self._instance_id,
-                "updated_at": datetime.now(timezone.utc).isoformat(),
+                "updated_at_ns": time.time_ns(),
             }
+            self._shared_state.move_to_end(key)
+            
+            if self._max_shared_state is not None:
+                while len(self._shared_state) > self._max_shared_state:
+                    self._shared_state.popitem(last=False)
 
     def get_shared_state(self, key: str) -> Any | None:
         """
@@ -844,21 +1163,33 @@ class ScalingManager:
         """
         with self._lock:
             state = self._shared_state.get(key)
-            return state["value"] if state else None
+            if not state:
+                return None
+            
+            if not state["weak"]:
+                return state["value"]
+            
+            value = state["value"]()
+            if value is None:
+                del self._shared_state[key]
+            return value
 
     def heartbeat(self) -> None:
         """Send heartbeat to indicate instance is alive."""
         with self._lock:
-            if self._instance_id in self._registered_instances:
-                self._registered_instances[self._instance_id]["last_heartbeat"] = (
-                    datetime.now(timezone.utc).isoformat()
-                )
+            try:
+                instance = self._registered_instances[self._instance_id]
+            except KeyError:
+                return
+            instance["last_heartbeat_ns"] = time.time_ns()
 
     def deregister(self) -> None:
         """Deregister this instance."""
         with self._lock:
-            if self._instance_id in self._registered_instances:
+            try:
                 del self._registered_instances[self._instance_id]
+            except KeyError:
+                pass
 
 
 # =============================================================================
@@ -13,21 +13,56 @@ Provides a comprehensive plugin system with:
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from collections import Counter, defaultdict, deque
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Callable, TypeVar, Generic
+from functools import lru_cache, partial, total_ordering
+from typing import Any, Callable, TypeVar, Generic, cast
 from pathlib import Path
+import importlib
 import importlib.util
 import inspect
+import itertools
+import json
+import os
 import re
-import uuid
+import secrets
 import structlog
 
 logger = structlog.get_logger(__name__)
 
+_UTC = timezone.utc
+
 T = TypeVar("T")
 
+# Generated IDs are "<prefix>-<nonce>-<counter>". The random per-process
+# nonce keeps them unique across restarts and replicas sharing a PID.
+_ID_PREFIX = secrets.token_hex(4)
+_ID_COUNTER = itertools.count()
+
+
+def _reset_ids() -> None:
+    """Restart ID generation in a forked child so it cannot repeat the parent."""
+    global _ID_PREFIX, _ID_COUNTER
+    _ID_PREFIX = secrets.token_hex(4)
+    _ID_COUNTER = itertools.count()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_ids)
+
+
+def _next_id(prefix: str) -> str:
+    """Generate a globally unique ID."""
+    return f"{prefix}-{_ID_PREFIX}-{next(_ID_COUNTER):x}"
+
+
+_VERSION_RE = re.compile(r"(\d+)\.(\d+)\.(\d+)(?:-(.+))?")
+_DEP_RE = re.compile(r"([a-z0-9_-]+)>=(\d+)\.(\d+)\.(\d+)")
+
 
 # =============================================================================
 # Enums and Data Classes
@@ -64,7 +99,8 @@ class CompatibilityLevel(str, Enum):
     INCOMPATIBLE = "incompatible"
 
 
-@dataclass
+@total_ordering
+@dataclass(slots=True)
 class PluginVersion:
     """Version information for a plugin."""
 
@@ -82,10 +118,7 @@ class PluginVersion:
     @classmethod
     def parse(cls, version_str: str) -> "PluginVersion":
         """Parse a version string."""
-        match = re.match(
-            r"(\d+)\.(\d+)\.(\d+)(?:-(.+))?",
-            version_str.strip(),
-        )
+        match = _VERSION_RE.match(version_str.strip())
         if not match:
             return cls(0, 0, 0)
         
@@ -96,12 +129,28 @@ class PluginVersion:
             prerelease=match.group(4) or "",
         )
 
+    @property
+    def sort_key(self) -> tuple[int, int, int, bool, str]:
+        """Tuple used for ordering; releases sort after their prereleases."""
+        return (
+            self.major,
+            self.minor,
+            self.patch,
+            not self.prerelease,
+            self.prerelease,
+        )
+
+    def __lt__(self, other: object) -> bool:
+        if not isinstance(other, PluginVersion):
+            return NotImplemented
+        return self.sort_key < other.sort_key
+
     def is_compatible_with(self, other: "PluginVersion") -> bool:
         """Check if compatible with another version (same major)."""
         return self.major == other.major
 
 
-@dataclass
+@dataclass(slots=True)
 class PluginMetadata:
     """Metadata for a plugin."""
 
@@ -119,7 +168,7 @@ class PluginMetadata:
     tags: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class PluginConfig:
     """Configuration for a plugin instance."""
 
@@ -128,7 +177,7 @@ class PluginConfig:
     priority: int = 100  # Lower = higher priority
 
 
-@dataclass
+@dataclass(slots=True)
 class PluginStatus:
     """Current status of a plugin."""
 
@@ -140,7 +189,7 @@ class PluginStatus:
     invocation_count: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class CustomRiskType:
     """Definition of a custom risk type."""
 
@@ -148,13 +197,13 @@ class CustomRiskType:
     name: str
     description: str
     severity_default: str = "Medium"
-    keywords: list[str] = field(default_factory=list)
+    keywords: list[str] | tuple[str, ...] = field(default_factory=list)
     extraction_patterns: list[str] = field(default_factory=list)
     color: str = "#6b7280"  # Gray default
     icon: str = "warning"
 
 
-@dataclass
+@dataclass(slots=True)
 class IntegrationEvent:
     """Event for bidirectional integration."""
 
@@ -166,6 +215,29 @@ class IntegrationEvent:
     timestamp: datetime
 
 
+def _dispatch(
+    event: IntegrationEvent,
+    handlers: Sequence[Callable[[IntegrationEvent], None]],
+    trusted: Sequence[Callable[[IntegrationEvent], None]],
+) -> None:
+    """
+    Run guarded handlers, then trusted ones, on the event as published.
+
+    Handlers share the event's payload dict without any copying, so a
+    handler can pass data to later ones through it. A handler that needs
+    private changes copies the payload before writing.
+    """
+    log_error = logger.error
+    for handler in handlers:
+        try:
+            handler(event)
+        except Exception as e:
+            log_error("Event handler failed", error=str(e))
+    
+    for handler in trusted:
+        handler(event)
+
+
 # =============================================================================
 # Plugin Base Class
 # =============================================================================
@@ -178,6 +250,8 @@ class Plugin(ABC):
     Plugins must implement lifecycle methods and provide metadata.
     """
 
+    __slots__ = ("_config", "_state", "_status", "_metadata", "_state_listener")
+
     def __init__(self, config: PluginConfig | None = None):
         """
         Initialize the plugin.
@@ -188,6 +262,10 @@ class Plugin(ABC):
         self._config = config or PluginConfig()
         self._state = PluginState.UNLOADED
         self._status: PluginStatus | None = None  # Lazy initialization
+        self._metadata: PluginMetadata | None = None  # Cached default metadata
+        self._state_listener: (
+            Callable[[Plugin, PluginState, PluginState], None] | None
+        ) = None
 
     @property
     @abstractmethod
@@ -215,6 +293,21 @@ class Plugin(ABC):
             )
         return self._status
 
+    def _set_state(self, new_state: PluginState) -> None:
+        """Move to a new lifecycle state and notify the owning manager."""
+        old_state = self._state
+        self._state = new_state
+        if self._status is not None:
+            self._status.state = new_state
+        if self._state_listener is not None and new_state is not old_state:
+            self._state_listener(self, old_state, new_state)
+
+    def _fail(self, error: Exception) -> bool:
+        """Record a lifecycle failure."""
+        self._set_state(PluginState.ERROR)
+        self.status.error_message = str(error)
+        return False
+
     def load(self) -> bool:
         """
         Load the plugin.
@@ -225,17 +318,12 @@ class Plugin(ABC):
         try:
             # Ensure status is initialized
             _ = self.status
-            self._state = PluginState.LOADED
-            self._status.state = PluginState.LOADED
-            self._status.loaded_at = datetime.now(timezone.utc)
+            self._set_state(PluginState.LOADED)
+            self._status.loaded_at = datetime.now(_UTC)
             logger.info("Plugin loaded", plugin_id=self.metadata.id)
             return True
         except Exception as e:
-            self._state = PluginState.ERROR
-            if self._status:
-                self._status.state = PluginState.ERROR
-                self._status.error_message = str(e)
-            return False
+            return self._fail(e)
 
     def initialize(self) -> bool:
         """
@@ -244,18 +332,15 @@ class Plugin(ABC):
         Returns:
             True if initialized successfully.
         """
-        if self._state != PluginState.LOADED:
+        if self._state is not PluginState.LOADED:
             return False
         
         try:
             self._on_initialize()
-            self._state = PluginState.INITIALIZED
-            self._status.state = PluginState.INITIALIZED
+            self._set_state(PluginState.INITIALIZED)
             return True
         except Exception as e:
-            self._state = PluginState.ERROR
-            self._status.error_message = str(e)
-            return False
+            return self._fail(e)
 
     def activate(self) -> bool:
         """
@@ -264,18 +349,15 @@ class Plugin(ABC):
         Returns:
             True if activated successfully.
         """
-        if self._state != PluginState.INITIALIZED:
+        if self._state is not PluginState.INITIALIZED:
             return False
         
         try:
             self._on_activate()
-            self._state = PluginState.ACTIVE
-            self._status.state = PluginState.ACTIVE
+            self._set_state(PluginState.ACTIVE)
             return True
         except Exception as e:
-            self._state = PluginState.ERROR
-            self._status.error_message = str(e)
-            return False
+            return self._fail(e)
 
     def deactivate(self) -> bool:
         """
@@ -284,18 +366,15 @@ class Plugin(ABC):
         Returns:
             True if deactivated successfully.
         """
-        if self._state != PluginState.ACTIVE:
+        if self._state is not PluginState.ACTIVE:
             return False
         
         try:
             self._on_deactivate()
-            self._state = PluginState.DISABLED
-            self._status.state = PluginState.DISABLED
+            self._set_state(PluginState.DISABLED)
             return True
         except Exception as e:
-            self._state = PluginState.ERROR
-            self._status.error_message = str(e)
-            return False
+            return self._fail(e)
 
     def unload(self) -> bool:
         """
@@ -306,13 +385,10 @@ class Plugin(ABC):
         """
         try:
             self._on_unload()
-            self._state = PluginState.UNLOADED
-            self._status.state = PluginState.UNLOADED
+            self._set_state(PluginState.UNLOADED)
             return True
         except Exception as e:
-            self._state = PluginState.ERROR
-            self._status.error_message = str(e)
-            return False
+            return self._fail(e)
 
     def _on_initialize(self) -> None:
         """Hook for plugin initialization. Override in subclass."""
@@ -343,16 +419,20 @@ class SourcePlugin(Plugin):
     Allows integration of custom news sources, APIs, or data feeds.
     """
 
+    __slots__ = ()
+
     @property
     def metadata(self) -> PluginMetadata:
         """Default metadata - override in subclass."""
-        return PluginMetadata(
-            id=f"source-{uuid.uuid4().hex[:8]}",
-            name="Source Plugin",
-            version=PluginVersion(1, 0, 0),
-            plugin_type=PluginType.SOURCE,
-            description="Custom data source plugin",
-        )
+        if self._metadata is None:
+            self._metadata = PluginMetadata(
+                id=_next_id("source"),
+                name="Source Plugin",
+                version=PluginVersion(1, 0, 0),
+                plugin_type=PluginType.SOURCE,
+                description="Custom data source plugin",
+            )
+        return self._metadata
 
     @abstractmethod
     def fetch_data(self) -> list[dict[str, Any]]:
@@ -407,16 +487,20 @@ class AnalysisPlugin(Plugin):
     Allows integration of custom DSPy modules or analysis pipelines.
     """
 
+    __slots__ = ()
+
     @property
     def metadata(self) -> PluginMetadata:
         """Default metadata - override in subclass."""
-        return PluginMetadata(
-            id=f"analysis-{uuid.uuid4().hex[:8]}",
-            name="Analysis Plugin",
-            version=PluginVersion(1, 0, 0),
-            plugin_type=PluginType.ANALYSIS,
-            description="Custom analysis plugin",
-        )
+        if self._metadata is None:
+            self._metadata = PluginMetadata(
+                id=_next_id("analysis"),
+                name="Analysis Plugin",
+                version=PluginVersion(1, 0, 0),
+                plugin_type=PluginType.ANALYSIS,
+                description="Custom analysis plugin",
+            )
+        return self._metadata
 
     @abstractmethod
     def analyze(self, data: dict[str, Any]) -> dict[str, Any]:
@@ -452,27 +536,47 @@ class IntegrationPlugin(Plugin):
     Supports receiving and sending events to external systems.
     """
 
+    __slots__ = (
+        "_event_handlers",
+        "_trusted_handlers",
+        "_event_types",
+        "_outbound_events",
+        "_dropped_outbound_events",
+    )
+
+    # Pending outbound events kept before the oldest are dropped
+    MAX_PENDING_OUTBOUND_EVENTS = 10_000
+
     def __init__(self, config: PluginConfig | None = None):
         """Initialize the integration plugin."""
         super().__init__(config)
-        self._event_handlers: dict[str, list[Callable]] = {}
-        self._outbound_events: list[IntegrationEvent] = []
+        # Handler tuples are replaced, never mutated, so dispatch needs no lock
+        self._event_handlers: dict[str, tuple[Callable, ...]] = {}
+        self._trusted_handlers: dict[str, tuple[Callable, ...]] = {}
+        self._event_types: tuple[str, ...] | None = None
+        self._outbound_events: deque[IntegrationEvent] = deque(
+            maxlen=self.MAX_PENDING_OUTBOUND_EVENTS
+        )
+        self._dropped_outbound_events = 0
 
     @property
     def metadata(self) -> PluginMetadata:
         """Default metadata - override in subclass."""
-        return PluginMetadata(
-            id=f"integration-{uuid.uuid4().hex[:8]}",
-            name="Integration Plugin",
-            version=PluginVersion(1, 0, 0),
-            plugin_type=PluginType.INTEGRATION,
-            description="Custom integration plugin",
-        )
+        if self._metadata is None:
+            self._metadata = PluginMetadata(
+                id=_next_id("integration"),
+                name="Integration Plugin",
+                version=PluginVersion(1, 0, 0),
+                plugin_type=PluginType.INTEGRATION,
+                description="Custom integration plugin",
+            )
+        return self._metadata
 
     def register_event_handler(
         self,
         event_type: str,
         handler: Callable[[IntegrationEvent], None],
+        trusted: bool = False,
     ) -> None:
         """
         Register a handler for an event type.
@@ -480,10 +584,12 @@ class IntegrationPlugin(Plugin):
         Args:
             event_type: Type of event to handle.
             handler: Handler function.
+            trusted: Handler is known not to raise; it runs without the
+                exception guard and after the guarded handlers.
         """
-        if event_type not in self._event_handlers:
-            self._event_handlers[event_type] = []
-        self._event_handlers[event_type].append(handler)
+        handlers = self._trusted_handlers if trusted else self._event_handlers
+        handlers[event_type] = handlers.get(event_type, ()) + (handler,)
+        self._event_types = None
 
     def handle_inbound_event(self, event: IntegrationEvent) -> bool:
         """
@@ -495,16 +601,12 @@ class IntegrationPlugin(Plugin):
         Returns:
             True if event was handled.
         """
-        handlers = self._event_handlers.get(event.event_type, [])
-        if not handlers:
+        handlers = self._event_handlers.get(event.event_type, ())
+        trusted = self._trusted_handlers.get(event.event_type, ())
+        if not handlers and not trusted:
             return False
         
-        for handler in handlers:
-            try:
-                handler(event)
-            except Exception as e:
-                logger.error("Event handler failed", error=str(e))
-        
+        _dispatch(event, handlers, trusted)
         return True
 
     def send_outbound_event(
@@ -525,25 +627,39 @@ class IntegrationPlugin(Plugin):
             Created event.
         """
         event = IntegrationEvent(
-            event_id=f"evt-{uuid.uuid4().hex[:8]}",
+            event_id=_next_id("evt"),
             event_type=event_type,
             source=self.metadata.id,
             target=target,
             payload=payload,
-            timestamp=datetime.now(timezone.utc),
+            timestamp=datetime.now(_UTC),
         )
+        
+        if len(self._outbound_events) == self._outbound_events.maxlen:
+            self._dropped_outbound_events += 1
         self._outbound_events.append(event)
         return event
 
     def get_pending_outbound_events(self) -> list[IntegrationEvent]:
         """Get all pending outbound events."""
-        events = self._outbound_events.copy()
+        events = list(self._outbound_events)
         self._outbound_events.clear()
         return events
 
-    def get_supported_event_types(self) -> list[str]:
-        """Get list of supported event types."""
-        return list(self._event_handlers.keys())
+    @property
+    def dropped_outbound_events(self) -> int:
+        """Number of pending outbound events dropped because the queue was full."""
+        return self._dropped_outbound_events
+
+    def get_supported_event_types(self) -> tuple[str, ...]:
+        """Get supported event types as a snapshot tuple."""
+        if self._event_types is None:
+            # Guarded types first, then trusted-only ones, each in
+            # registration order
+            self._event_types = tuple(dict.fromkeys(
+                itertools.chain(self._event_handlers, self._trusted_handlers)
+            ))
+        return self._event_types
 
 
 # =============================================================================
@@ -551,6 +667,114 @@ class IntegrationPlugin(Plugin):
 # =============================================================================
 
 
+class _KeywordIndex:
+    """
+    Single-pass keyword matcher over all registered risk types.
+
+    All keywords are compiled into one longest-first alternation inside a
+    lookahead, so a single ``finditer`` reports the longest keyword starting
+    at each position. Any shorter keyword matching at the same position is a
+    prefix of that one, so each keyword maps to the types of all keywords
+    that prefix it.
+    """
+
+    def __init__(self, risk_types: dict[str, CustomRiskType]):
+        """Build the index from the registered risk types."""
+        keyword_types: dict[str, set[str]] = {}
+        always: set[str] = set()
+        
+        for type_id, risk_type in risk_types.items():
+            for keyword in risk_type.keywords:
+                if keyword:
+                    keyword_types.setdefault(keyword, set()).add(type_id)
+                else:
+                    always.add(type_id)  # Empty keyword matches any text
+        
+        self._always = frozenset(always)
+        self._types: dict[str, frozenset[str]] = {
+            keyword: frozenset().union(*(
+                types for prefix, types in keyword_types.items()
+                if keyword.startswith(prefix)
+            ))
+            for keyword in keyword_types
+        }
+        
+        self._pattern: re.Pattern[str] | None = None
+        if keyword_types:
+            alternation = "|".join(
+                re.escape(keyword)
+                for keyword in sorted(keyword_types, key=len, reverse=True)
+            )
+            self._pattern = re.compile(f"(?=({alternation}))")
+
+    def match(self, text_lower: str) -> set[str]:
+        """Get the IDs of all types with a keyword occurring in the text."""
+        hits = set(self._always)
+        if self._pattern is not None:
+            for found in self._pattern.finditer(text_lower):
+                hits.update(self._types[found.group(1)])
+        return hits
+
+
+class _PatternIndex:
+    """
+    Union of all extraction patterns, one named group per pattern.
+
+    A single ``finditer`` tags each match with the type of the alternative
+    that produced it. An earlier alternative can mask a later one on the same
+    span, so once anything has matched the remaining types are still searched
+    one by one; a text with no union match skips the per-type searches.
+    Patterns using backreferences or conditional group references are never
+    put in the union, since group numbers shift inside it.
+    """
+
+    _BACKREF_RE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+
+    def __init__(self, compiled: dict[str, tuple[re.Pattern[str], ...]]):
+        """Build the union from the compiled patterns of each type."""
+        self._compiled = {type_id: pats for type_id, pats in compiled.items() if pats}
+        self._standalone: dict[str, tuple[re.Pattern[str], ...]] = {}
+        self._group_types: dict[str, str] = {}
+        alternatives: list[str] = []
+        
+        for type_id, patterns in self._compiled.items():
+            for pattern in patterns:
+                if self._BACKREF_RE.search(pattern.pattern):
+                    self._standalone[type_id] = self._standalone.get(type_id, ()) + (pattern,)
+                    continue
+                group = f"t{len(alternatives)}"
+                self._group_types[group] = type_id
+                alternatives.append(f"(?P<{group}>{pattern.pattern})")
+        
+        self._union: re.Pattern[str] | None = None
+        if alternatives:
+            try:
+                self._union = re.compile("|".join(alternatives), re.IGNORECASE)
+            except re.error:
+                # Clashing group names or inline global flags
+                self._standalone = self._compiled
+
+    def match(self, text: str, skip: set[str]) -> set[str]:
+        """Get the IDs of types not in ``skip`` with a pattern matching the text."""
+        hits: set[str] = set()
+        recheck = self._standalone
+        if self._union is not None:
+            group_types = self._group_types
+            for found in self._union.finditer(text):
+                group = found.lastgroup
+                assert group is not None  # Every alternative is a named group
+                hits.add(group_types[group])
+            if hits:
+                recheck = self._compiled
+        
+        for type_id, patterns in recheck.items():
+            if type_id in hits or type_id in skip:
+                continue
+            if any(pattern.search(text) for pattern in patterns):
+                hits.add(type_id)
+        return hits
+
+
 class RiskTypeRegistry:
     """
     Registry for custom risk types.
@@ -562,6 +786,10 @@ class RiskTypeRegistry:
         """Initialize the risk type registry."""
         self._risk_types: dict[str, CustomRiskType] = {}
         self._extraction_rules: dict[str, list[Callable[[str], bool]]] = {}
+        self._compiled_patterns: dict[str, tuple[re.Pattern[str], ...]] = {}
+        self._keyword_index: _KeywordIndex | None = None  # Rebuilt lazily
+        self._pattern_index: _PatternIndex | None = None
+        self._all_types: tuple[CustomRiskType, ...] | None = None
         
         # Register default risk types
         self._register_defaults()
@@ -608,7 +836,25 @@ class RiskTypeRegistry:
         ]
         
         for risk_type in defaults:
-            self._risk_types[risk_type.type_id] = risk_type
+            self._store(risk_type)
+        self._invalidate()
+
+    def _invalidate(self) -> None:
+        """Drop views derived from the registered risk types."""
+        self._keyword_index = None
+        self._pattern_index = None
+        self._all_types = None
+
+    def _store(self, risk_type: CustomRiskType) -> None:
+        """Store a normalized copy of a risk type and compile its patterns."""
+        self._risk_types[risk_type.type_id] = replace(
+            risk_type,
+            keywords=tuple(kw.lower() for kw in risk_type.keywords),
+        )
+        self._compiled_patterns[risk_type.type_id] = tuple(
+            re.compile(pattern, re.IGNORECASE)
+            for pattern in risk_type.extraction_patterns
+        )
 
     def register(self, risk_type: CustomRiskType) -> bool:
         """
@@ -623,7 +869,8 @@ class RiskTypeRegistry:
         if not risk_type.type_id:
             return False
         
-        self._risk_types[risk_type.type_id] = risk_type
+        self._store(risk_type)
+        self._invalidate()
         logger.info("Registered risk type", type_id=risk_type.type_id)
         return True
 
@@ -639,6 +886,8 @@ class RiskTypeRegistry:
         """
         if type_id in self._risk_types:
             del self._risk_types[type_id]
+            del self._compiled_patterns[type_id]
+            self._invalidate()
             return True
         return False
 
@@ -646,9 +895,11 @@ class RiskTypeRegistry:
         """Get a risk type by ID."""
         return self._risk_types.get(type_id)
 
-    def get_all(self) -> list[CustomRiskType]:
-        """Get all registered risk types."""
-        return list(self._risk_types.values())
+    def get_all(self) -> tuple[CustomRiskType, ...]:
+        """Get all registered risk types as a snapshot tuple."""
+        if self._all_types is None:
+            self._all_types = tuple(self._risk_types.values())
+        return self._all_types
 
     def add_extraction_rule(
         self,
@@ -676,27 +927,23 @@ class RiskTypeRegistry:
         Returns:
             List of matching risk type IDs.
         """
-        matches = []
-        text_lower = text.lower()
+        if self._keyword_index is None:
+            self._keyword_index = _KeywordIndex(self._risk_types)
+        if self._pattern_index is None:
+            self._pattern_index = _PatternIndex(self._compiled_patterns)
+        
+        # Keyword hits seed the set; remaining checks only run for the rest
+        matches: set[str] = self._keyword_index.match(text.lower())
+        matches |= self._pattern_index.match(text, matches)
         
-        for type_id, risk_type in self._risk_types.items():
-            # Check keywords
-            if any(kw in text_lower for kw in risk_type.keywords):
-                matches.append(type_id)
+        # Check custom rules
+        for type_id, rules in self._extraction_rules.items():
+            if type_id in matches or type_id not in self._risk_types:
                 continue
-            
-            # Check extraction patterns
-            for pattern in risk_type.extraction_patterns:
-                if re.search(pattern, text, re.IGNORECASE):
-                    matches.append(type_id)
-                    break
-            
-            # Check custom rules
-            rules = self._extraction_rules.get(type_id, [])
             if any(rule(text) for rule in rules):
-                matches.append(type_id)
+                matches.add(type_id)
         
-        return list(set(matches))
+        return list(matches)
 
 
 # =============================================================================
@@ -704,6 +951,17 @@ class RiskTypeRegistry:
 # =============================================================================
 
 
+@lru_cache(maxsize=1024)
+def _parse_dependency(spec: str) -> tuple[str, PluginVersion] | None:
+    """Parse a dependency spec of the form "plugin_id>=1.0.0"."""
+    match = _DEP_RE.match(spec)
+    if not match:
+        return None
+    
+    dep_id, major, minor, patch = match.groups()
+    return dep_id, PluginVersion(int(major), int(minor), int(patch))
+
+
 class VersionManager:
     """
     Manages plugin versions and compatibility.
@@ -740,22 +998,23 @@ class VersionManager:
         """
         min_version = plugin_metadata.min_system_version
         max_version = plugin_metadata.max_system_version
+        system_major = self.SYSTEM_VERSION.major
+        system = (system_major, self.SYSTEM_VERSION.minor)
         
         # Check minimum version
-        if self.SYSTEM_VERSION.major < min_version.major:
+        if system_major < min_version.major:
             return CompatibilityLevel.INCOMPATIBLE
         
-        if (self.SYSTEM_VERSION.major == min_version.major and
-            self.SYSTEM_VERSION.minor < min_version.minor):
+        # Majors are ordered by now, so a tuple compare only trips on minor
+        if system < (min_version.major, min_version.minor):
             return CompatibilityLevel.MAJOR_ISSUES
         
         # Check maximum version
         if max_version:
-            if self.SYSTEM_VERSION.major > max_version.major:
+            if system_major > max_version.major:
                 return CompatibilityLevel.INCOMPATIBLE
             
-            if (self.SYSTEM_VERSION.major == max_version.major and
-                self.SYSTEM_VERSION.minor > max_version.minor):
+            if system > (max_version.major, max_version.minor):
                 return CompatibilityLevel.MINOR_ISSUES
         
         return CompatibilityLevel.COMPATIBLE
@@ -806,11 +1065,9 @@ class VersionManager:
         results = {}
         
         for dependency in plugin_metadata.dependencies:
-            # Parse dependency format: "plugin_id>=1.0.0"
-            match = re.match(r"([a-z0-9_-]+)>=(\d+\.\d+\.\d+)", dependency)
-            if match:
-                dep_id = match.group(1)
-                required = PluginVersion.parse(match.group(2))
+            parsed = _parse_dependency(dependency)
+            if parsed:
+                dep_id, required = parsed
                 results[dep_id] = self.check_plugin_compatibility(dep_id, required)
             else:
                 results[dependency] = CompatibilityLevel.INCOMPATIBLE
@@ -823,12 +1080,12 @@ class VersionManager:
     ) -> bool:
         """Check if a plugin is fully compatible."""
         system_compat = self.check_system_compatibility(plugin_metadata)
-        if system_compat != CompatibilityLevel.COMPATIBLE:
+        if system_compat is not CompatibilityLevel.COMPATIBLE:
             return False
         
         dep_compat = self.check_all_dependencies(plugin_metadata)
         return all(
-            level == CompatibilityLevel.COMPATIBLE
+            level is CompatibilityLevel.COMPATIBLE
             for level in dep_compat.values()
         )
 
@@ -838,6 +1095,35 @@ class VersionManager:
 # =============================================================================
 
 
+def _metadata_from_dict(data: dict[str, Any]) -> PluginMetadata:
+    """Build plugin metadata from a plugin index entry."""
+    max_version = data.get("max_system_version")
+    return PluginMetadata(
+        id=data["id"],
+        name=data.get("name", data["id"]),
+        version=PluginVersion.parse(data.get("version", "1.0.0")),
+        plugin_type=PluginType(data["plugin_type"]),
+        description=data.get("description", ""),
+        author=data.get("author", ""),
+        min_system_version=PluginVersion.parse(
+            data.get("min_system_version", "1.0.0")
+        ),
+        max_system_version=(
+            PluginVersion.parse(max_version) if max_version else None
+        ),
+        dependencies=list(data.get("dependencies", [])),
+        tags=list(data.get("tags", [])),
+    )
+
+
+# Base class each plugin type must subclass to be registered
+_PLUGIN_BASES: dict[PluginType, type] = {
+    PluginType.SOURCE: SourcePlugin,
+    PluginType.ANALYSIS: AnalysisPlugin,
+    PluginType.INTEGRATION: IntegrationPlugin,
+}
+
+
 class PluginManager:
     """
     Central manager for all plugins.
@@ -845,18 +1131,133 @@ class PluginManager:
     Handles plugin lifecycle, registration, and integration.
     """
 
+    PLUGIN_INDEX_FILE = "plugins.json"
+
     def __init__(self, plugin_dir: Path | None = None):
         """
         Initialize the plugin manager.
 
         Args:
-            plugin_dir: Optional directory for plugin files.
+            plugin_dir: Optional directory for plugin files. If it contains a
+                plugin index file, the listed plugins are registered by
+                metadata only and loaded on first activation.
         """
         self._plugins: dict[str, Plugin] = {}
+        self._all_plugins: tuple[Plugin, ...] | None = None
+        self._pending: dict[str, tuple[str, PluginMetadata]] = {}
+        self._metadata: dict[str, PluginMetadata] = {}
+        self._summaries: dict[str, dict[str, str]] = {}  # Report rows by plugin ID
+        # Plugins of SOURCE/ANALYSIS/INTEGRATION type are checked against
+        # their base class on registration, so each of these lists can be
+        # cast to a list of that base class
+        self._by_type: dict[PluginType, list[Plugin]] = defaultdict(list)
+        self._state_counts: Counter[PluginState] = Counter()
+        self._type_counts: Counter[PluginType] = Counter()
         self._plugin_dir = plugin_dir
         self.risk_type_registry = RiskTypeRegistry()
         self.version_manager = VersionManager()
         self._event_bus: list[Callable[[IntegrationEvent], None]] = []
+        self._trusted_event_bus: list[Callable[[IntegrationEvent], None]] = []
+        
+        if plugin_dir is not None:
+            self.discover_plugins()
+
+    def discover_plugins(self) -> int:
+        """
+        Register plugins listed in the plugin directory's index file.
+
+        Each index entry holds an ``entry_point`` ("module.path:ClassName")
+        and a ``metadata`` object. Nothing is imported until activation.
+
+        Returns:
+            Number of plugins registered by metadata.
+        """
+        if self._plugin_dir is None:
+            return 0
+        
+        index_path = Path(self._plugin_dir) / self.PLUGIN_INDEX_FILE
+        if not index_path.exists():
+            return 0
+        
+        try:
+            entries = json.loads(index_path.read_text())
+        except (OSError, ValueError) as e:
+            logger.error("Plugin index unreadable", path=str(index_path), error=str(e))
+            return 0
+        
+        registered = 0
+        for entry in entries:
+            try:
+                metadata = _metadata_from_dict(entry["metadata"])
+                entry_point = entry["entry_point"]
+            except (KeyError, TypeError, ValueError) as e:
+                logger.error("Invalid plugin index entry", error=str(e))
+                continue
+            
+            if self.register_metadata(entry_point, metadata):
+                registered += 1
+        
+        return registered
+
+    def register_metadata(self, entry_point: str, metadata: PluginMetadata) -> bool:
+        """
+        Register a plugin by metadata only, deferring import and load.
+
+        Until its first activation the plugin is not returned by get_plugin,
+        get_plugins_by_type or get_all_plugins; get_status_report lists it
+        under ``pending_plugins`` and unregister_plugin can remove it.
+
+        Args:
+            entry_point: Import path of the plugin class ("module:ClassName").
+            metadata: Plugin metadata.
+
+        Returns:
+            True if the plugin was registered for lazy loading.
+        """
+        if metadata.id in self._plugins:
+            logger.error("Plugin already registered", plugin_id=metadata.id)
+            return False
+        
+        compat = self.version_manager.check_system_compatibility(metadata)
+        if compat is CompatibilityLevel.INCOMPATIBLE:
+            logger.error(
+                "Plugin incompatible with system",
+                plugin_id=metadata.id,
+            )
+            return False
+        
+        self.version_manager.register_plugin_version(metadata.id, metadata.version)
+        self._pending[metadata.id] = (entry_point, metadata)
+        return True
+
+    def _load_pending(self, plugin_id: str) -> Plugin | None:
+        """Import, instantiate, and register a lazily registered plugin."""
+        entry_point, metadata = self._pending.pop(plugin_id)
+        module_name, _, class_name = entry_point.partition(":")
+        
+        try:
+            plugin_class = getattr(importlib.import_module(module_name), class_name)
+            plugin: Plugin = plugin_class()
+        except Exception as e:
+            logger.error(
+                "Plugin import failed",
+                plugin_id=plugin_id,
+                entry_point=entry_point,
+                error=str(e),
+            )
+            return None
+        
+        if plugin.metadata.id != metadata.id:
+            logger.error(
+                "Plugin metadata does not match index",
+                plugin_id=plugin_id,
+                loaded_id=plugin.metadata.id,
+            )
+            return None
+        
+        if not self.register_plugin(plugin):
+            return None
+        return plugin
 
     def register_plugin(self, plugin: Plugin) -> bool:
         """
@@ -870,20 +1271,31 @@ class PluginManager:
         """
         metadata = plugin.metadata
         
+        # The typed indexes rely on the declared type matching the class
+        base = _PLUGIN_BASES.get(metadata.plugin_type)
+        if base is not None and not isinstance(plugin, base):
+            logger.error(
+                "Plugin class does not match its declared type",
+                plugin_id=metadata.id,
+                plugin_type=metadata.plugin_type.value,
+            )
+            return False
+        
         # Check compatibility
         compat = self.version_manager.check_system_compatibility(metadata)
-        if compat == CompatibilityLevel.INCOMPATIBLE:
+        if compat is CompatibilityLevel.INCOMPATIBLE:
             logger.error(
                 "Plugin incompatible with system",
                 plugin_id=metadata.id,
             )
             return False
         
-        # Register version
-        self.version_manager.register_plugin_version(
-            metadata.id,
-            metadata.version,
-        )
+        # Re-registering the same instance reloads it in place, so it has to
+        # leave the indexes first; a different instance replaces the old one
+        # only once it has loaded and initialized
+        existing = self._plugins.get(metadata.id)
+        if existing is plugin:
+            self.unregister_plugin(metadata.id)
         
         # Load and initialize
         if not plugin.load():
@@ -892,7 +1304,31 @@ class PluginManager:
         if not plugin.initialize():
             return False
         
+        if existing is not None and existing is not plugin:
+            self.unregister_plugin(metadata.id)
+        
+        # Register version
+        self.version_manager.register_plugin_version(
+            metadata.id,
+            metadata.version,
+        )
+        
+        self._pending.pop(metadata.id, None)
         self._plugins[metadata.id] = plugin
+        self._all_plugins = None
+        self._metadata[metadata.id] = metadata
+        self._by_type[metadata.plugin_type].append(plugin)
+        self._type_counts[metadata.plugin_type] += 1
+        self._state_counts[plugin.state] += 1
+        summary = {
+            "id": metadata.id,
+            "name": metadata.name,
+            "version": str(metadata.version),
+            "type": metadata.plugin_type.value,
+            "state": plugin.state.value,
+        }
+        self._summaries[metadata.id] = summary
+        plugin._state_listener = partial(self._track_transition, summary)
         logger.info("Plugin registered", plugin_id=metadata.id)
         return True
 
@@ -908,12 +1344,22 @@ class PluginManager:
         """
         plugin = self._plugins.get(plugin_id)
         if not plugin:
-            return False
+            if self._pending.pop(plugin_id, None) is None:
+                return False
+            logger.info("Plugin unregistered", plugin_id=plugin_id)
+            return True
         
         plugin.deactivate()
         plugin.unload()
         
+        plugin._state_listener = None
+        plugin_type = self._metadata.pop(plugin_id).plugin_type
+        del self._summaries[plugin_id]
+        self._by_type[plugin_type].remove(plugin)
+        self._type_counts[plugin_type] -= 1
+        self._state_counts[plugin.state] -= 1
         del self._plugins[plugin_id]
+        self._all_plugins = None
         logger.info("Plugin unregistered", plugin_id=plugin_id)
         return True
 
@@ -921,22 +1367,29 @@ class PluginManager:
         """Get a plugin by ID."""
         return self._plugins.get(plugin_id)
 
-    def get_all_plugins(self) -> list[Plugin]:
-        """Get all registered plugins."""
-        return list(self._plugins.values())
+    def get_all_plugins(self) -> tuple[Plugin, ...]:
+        """
+        Get all registered plugins.
+
+        The tuple is a cached snapshot rebuilt after registration changes;
+        wrap it in ``list()`` if a mutable copy is needed.
+        """
+        if self._all_plugins is None:
+            self._all_plugins = tuple(self._plugins.values())
+        return self._all_plugins
 
     def get_plugins_by_type(self, plugin_type: PluginType) -> list[Plugin]:
         """Get all plugins of a specific type."""
-        return [
-            p for p in self._plugins.values()
-            if p.metadata.plugin_type == plugin_type
-        ]
+        return list(self._by_type.get(plugin_type, ()))
 
     def activate_plugin(self, plugin_id: str) -> bool:
-        """Activate a plugin."""
+        """Activate a plugin, loading it first if registered lazily."""
         plugin = self._plugins.get(plugin_id)
+        if not plugin and plugin_id in self._pending:
+            plugin = self._load_pending(plugin_id)
         if not plugin:
             return False
+        
         return plugin.activate()
 
     def deactivate_plugin(self, plugin_id: str) -> bool:
@@ -944,14 +1397,51 @@ class PluginManager:
         plugin = self._plugins.get(plugin_id)
         if not plugin:
             return False
+        
         return plugin.deactivate()
 
+    def _track_transition(
+        self,
+        summary: dict[str, str],
+        plugin: Plugin,
+        old_state: PluginState,
+        new_state: PluginState,
+    ) -> None:
+        """Keep state counts and the report row in step."""
+        summary["state"] = new_state.value
+        self._state_counts[old_state] -= 1
+        self._state_counts[new_state] += 1
+
+
+    def _active_plugins(self, plugin_type: PluginType) -> list[Plugin]:
+        """
+        Snapshot the active plugins of a type in registration order.
+
+        Callers iterate the snapshot, so a plugin that changes state while
+        the loop runs cannot shift the list and make it skip another one.
+        """
+        return [
+            plugin for plugin in self._by_type[plugin_type]
+            if plugin.state is PluginState.ACTIVE
+        ]
+
     def subscribe_to_events(
         self,
         handler: Callable[[IntegrationEvent], None],
+        trusted: bool = False,
     ) -> None:
-        """Subscribe to integration events."""
-        self._event_bus.append(handler)
+        """
+        Subscribe to integration events.
+
+        Args:
+            handler: Handler function.
+            trusted: Handler is known not to raise; it runs without the
+                exception guard and after the guarded handlers.
+        """
+        if trusted:
+            self._trusted_event_bus.append(handler)
+        else:
+            self._event_bus.append(handler)
 
     def publish_event(self, event: IntegrationEvent) -> None:
         """
@@ -960,11 +1450,7 @@ class PluginManager:
         Args:
             event: Event to publish.
         """
-        for handler in self._event_bus:
-            try:
-                handler(event)
-            except Exception as e:
-                logger.error("Event handler failed", error=str(e))
+        _dispatch(event, self._event_bus, self._trusted_event_bus)
 
     def collect_source_data(self) -> list[dict[str, Any]]:
         """
@@ -973,15 +1459,19 @@ class PluginManager:
         Returns:
             Combined data from all sources.
         """
-        all_data = []
+        all_data: list[dict[str, Any]] = []
         
-        for plugin in self.get_plugins_by_type(PluginType.SOURCE):
-            if plugin.state != PluginState.ACTIVE:
-                continue
+        sources = cast(list[SourcePlugin], self._active_plugins(PluginType.SOURCE))
+        if not sources:
+            return all_data
+        
+        # Sources usually wait on network I/O, so fetch them concurrently
+        with ThreadPoolExecutor(max_workers=min(32, len(sources))) as executor:
+            futures = [(plugin, executor.submit(plugin.fetch_data)) for plugin in sources]
             
-            if isinstance(plugin, SourcePlugin):
+            for plugin, future in futures:
                 try:
-                    data = plugin.fetch_data()
+                    data = future.result()
                     if plugin.validate_data(data):
                         all_data.extend(data)
                 except Exception as e:
@@ -1008,23 +1498,20 @@ class PluginManager:
         """
         results = []
         
-        for plugin in self.get_plugins_by_type(PluginType.ANALYSIS):
-            if plugin.state != PluginState.ACTIVE:
-                continue
-            
-            if isinstance(plugin, AnalysisPlugin):
-                try:
-                    result = plugin.analyze(data)
-                    results.append({
-                        "plugin_id": plugin.metadata.id,
-                        "result": result,
-                    })
-                except Exception as e:
-                    logger.error(
-                        "Analysis plugin error",
-                        plugin_id=plugin.metadata.id,
-                        error=str(e),
-                    )
+        analyzers = cast(list[AnalysisPlugin], self._active_plugins(PluginType.ANALYSIS))
+        for plugin in analyzers:
+            try:
+                result = plugin.analyze(data)
+                results.append({
+                    "plugin_id": plugin.metadata.id,
+                    "result": result,
+                })
+            except Exception as e:
+                logger.error(
+                    "Analysis plugin error",
+                    plugin_id=plugin.metadata.id,
+                    error=str(e),
+                )
         
         return results
 
@@ -1037,13 +1524,11 @@ class PluginManager:
         """
         events = []
         
-        for plugin in self.get_plugins_by_type(PluginType.INTEGRATION):
-            if plugin.state != PluginState.ACTIVE:
-                continue
-            
-            if isinstance(plugin, IntegrationPlugin):
-                plugin_events = plugin.get_pending_outbound_events()
-                events.extend(plugin_events)
+        integrations = cast(
+            list[IntegrationPlugin], self._active_plugins(PluginType.INTEGRATION)
+        )
+        for plugin in integrations:
+            events.extend(plugin.get_pending_outbound_events())
         
         # Publish events
         for event in events:
@@ -1056,24 +1541,13 @@ class PluginManager:
         return {
             "total_plugins": len(self._plugins),
             "by_type": {
-                pt.value: len(self.get_plugins_by_type(pt))
+                pt.value: self._type_counts[pt]
                 for pt in PluginType
             },
             "by_state": {
-                state.value: sum(
-                    1 for p in self._plugins.values()
-                    if p.state == state
-                )
+                state.value: self._state_counts[state]
                 for state in PluginState
             },
-            "plugins": [
-                {
-                    "id": p.metadata.id,
-                    "name": p.metadata.name,
-                    "version": str(p.metadata.version),
-                    "type": p.metadata.plugin_type.value,
-                    "state": p.state.value,
-                }
-                for p in self._plugins.values()
-            ],
+            "plugins": [summary.copy() for summary in self._summaries.values()],
+            "pending_plugins": list(self._pending),
         }
@@ -6,11 +6,17 @@ and proactive alert generation with accuracy tracking.
 """
 
 from dataclasses import dataclass, field
+from functools import lru_cache
 from datetime import datetime, timezone, timedelta
 from enum import Enum
 from typing import Any
-from collections import defaultdict
+from collections import Counter, OrderedDict, defaultdict, deque
+from collections.abc import Iterable
+from bisect import bisect_right
+from itertools import pairwise
+import heapq
 import math
+import re
 
 import structlog
 
@@ -22,8 +28,63 @@ from src.models import (
 )
 from src.graph.connection import get_connection
 
+try:
+    # C parser, several times faster than fromisoformat; optional
+    from ciso8601 import parse_datetime as _parse_iso
+except ImportError:
+    _parse_iso = datetime.fromisoformat
+
 logger = structlog.get_logger(__name__)
 
+# Sentiment keywords and their polarity
+_SENTIMENT_POLARITY: dict[str, int] = {
+    **dict.fromkeys((
+        "crisis", "disaster", "failure", "collapse", "shortage",
+        "strike", "protest", "closure", "bankruptcy", "disruption",
+        "delay", "shutdown", "halt", "suspend", "warning",
+    ), -1),
+    **dict.fromkeys((
+        "recovery", "improvement", "resolution", "agreement",
+        "stable", "growth", "expansion", "success", "reopening",
+    ), 1),
+}
+
+# One lookahead alternation finds the longest keyword starting at each
+# position; any shorter keyword there is a prefix of it, so each match
+# also credits the keywords that prefix it.
+_SENTIMENT_RE = re.compile(
+    "(?=("
+    + "|".join(map(re.escape, sorted(_SENTIMENT_POLARITY, key=len, reverse=True)))
+    + "))"
+)
+_SENTIMENT_PREFIXES: dict[str, tuple[str, ...]] = {
+    keyword: tuple(p for p in _SENTIMENT_POLARITY if keyword.startswith(p))
+    for keyword in _SENTIMENT_POLARITY
+}
+
+# Enum lookups by stored value
+_EVENT_TYPES_BY_VALUE: dict[str, EventType] = {e.value: e for e in EventType}
+_SEVERITIES_BY_VALUE: dict[str, SeverityLevel] = {s.value: s for s in SeverityLevel}
+
+# Numeric weight of each severity label
+_SEVERITY_SCORES = {"Low": 1, "Medium": 2, "High": 3, "Critical": 4}
+
+
+def _event_month(detected_at: Any) -> int:
+    """
+    Get the month of an event timestamp.
+
+    ISO strings starting "YYYY-MM-" are read by slicing rather than parsed in
+    full; anything else goes through ``_parse_iso``.
+    """
+    if isinstance(detected_at, str):
+        if detected_at[4:5] == "-" and detected_at[7:8] == "-":
+            month = int(detected_at[5:7])
+            if 1 <= month <= 12:
+                return month
+        detected_at = _parse_iso(detected_at)
+    return detected_at.month
+
 
 # =============================================================================
 # Enums and Data Classes
@@ -108,7 +169,7 @@ class RiskForecast:
     created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
 
-@dataclass
+@dataclass(slots=True)
 class ForecastAccuracy:
     """Accuracy metrics for historical forecasts."""
 
@@ -136,6 +197,32 @@ class PredictiveAlert:
     created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
 
+@dataclass
+class RiskEventBatch:
+    """
+    Column-oriented view of a batch of risk events.
+
+    Holds only the fields the analyzers read, pulled out of the RiskEvent
+    models once, so several analyses over the same batch scan flat tuples.
+    """
+
+    locations: tuple[str, ...]
+    event_types: tuple[EventType, ...]
+    detected_at: tuple[datetime, ...]
+    severities: tuple[SeverityLevel, ...]
+
+    @classmethod
+    def from_events(cls, events: Iterable[RiskEvent]) -> "RiskEventBatch":
+        """Build a batch from RiskEvent models."""
+        rows = [(e.location, e.event_type, e.detected_at, e.severity) for e in events]
+        if not rows:
+            return cls((), (), (), ())
+        return cls(*map(tuple, zip(*rows, strict=True)))
+
+    def __len__(self) -> int:
+        return len(self.locations)
+
+
 # =============================================================================
 # Pattern Analyzer
 # =============================================================================
@@ -186,7 +273,8 @@ class PatternAnalyzer:
             conn = self._get_connection()
             cutoff = datetime.now(timezone.utc) - timedelta(days=lookback_years * 365)
 
-            # Query historical risk events
+            # Build a month histogram and severity total per location and
+            # type in the database; null severities score as Medium
             query = """
             MATCH (e:RiskEvent)
             WHERE e.detected_at >= $cutoff
@@ -194,11 +282,23 @@ class PatternAnalyzer:
             if location:
                 query += " AND e.location = $location"
             query += """
-            RETURN e.event_type as event_type,
-                   e.location as location,
-                   e.severity as severity,
-                   e.detected_at as detected_at
-            ORDER BY e.detected_at
+            WITH e.location as location,
+                 e.event_type as event_type,
+                 datetime(e.detected_at).month as month,
+                 CASE e.severity
+                     WHEN 'Low' THEN 1
+                     WHEN 'Medium' THEN 2
+                     WHEN 'High' THEN 3
+                     WHEN 'Critical' THEN 4
+                     ELSE 2
+                 END as severity_score
+            WITH location, event_type, month,
+                 count(*) as count,
+                 sum(severity_score) as severity_sum
+            RETURN location, event_type,
+                   collect({month: month, count: count}) as histogram,
+                   sum(count) as total,
+                   sum(severity_sum) as severity_sum
             """
 
             params = {"cutoff": cutoff.isoformat()}
@@ -207,22 +307,25 @@ class PatternAnalyzer:
 
             results = await conn.execute_query(query, params)
 
-            # Group events by location and type
-            grouped = defaultdict(lambda: defaultdict(list))
+            # Analyze each group's histogram for seasonal patterns
             for row in results:
-                loc = row.get("location", "Unknown")
-                evt_type = row.get("event_type", "Other")
-                grouped[loc][evt_type].append({
-                    "detected_at": row.get("detected_at"),
-                    "severity": row.get("severity"),
-                })
-
-            # Analyze each group for seasonal patterns
-            for loc, type_events in grouped.items():
-                for evt_type, events in type_events.items():
-                    pattern = self._detect_seasonal_pattern(loc, evt_type, events)
-                    if pattern:
-                        patterns.append(pattern)
+                total_events = row["total"]
+                if total_events < 3:
+                    continue
+                month_counts = [0] * 13
+                for bucket in row.get("histogram") or []:
+                    month = bucket.get("month")
+                    if month:
+                        month_counts[month] += bucket["count"]
+                pattern = self._seasonal_from_counts(
+                    row.get("location", "Unknown"),
+                    row.get("event_type", "Other"),
+                    month_counts,
+                    row["severity_sum"],
+                    total_events,
+                )
+                if pattern:
+                    patterns.append(pattern)
 
         except Exception as e:
             logger.warning("Seasonal pattern analysis failed", error=str(e))
@@ -247,54 +350,74 @@ class PatternAnalyzer:
             return None
 
         try:
-            # Extract months from events
-            month_counts = defaultdict(int)
-            severity_sum = 0.0
+            # Extract months from events (index 0 unused)
+            month_counts = [0] * 13
+            severity_sum = 0
+            severity_scores = _SEVERITY_SCORES
             
             for event in events:
                 detected_at = event.get("detected_at")
                 if detected_at:
-                    if isinstance(detected_at, str):
-                        detected_at = datetime.fromisoformat(detected_at.replace("Z", "+00:00"))
-                    month_counts[detected_at.month] += 1
-                
-                severity = event.get("severity", "Medium")
-                severity_map = {"Low": 1, "Medium": 2, "High": 3, "Critical": 4}
-                severity_sum += severity_map.get(severity, 2)
-
-            total_events = len(events)
-            avg_severity = severity_sum / total_events if total_events > 0 else 2.0
-
-            # Find peak months (above average)
-            avg_monthly = total_events / 12
-            peak_months = [
-                month for month, count in month_counts.items()
-                if count > avg_monthly * 1.5
-            ]
-
-            if not peak_months:
-                return None
-
-            # Calculate frequency (events per year)
-            years_span = max(1, len(events) / 12)
-            frequency = total_events / years_span
+                    month_counts[_event_month(detected_at)] += 1
+                severity_sum += severity_scores.get(event.get("severity", "Medium"), 2)
 
-            # Calculate confidence based on data volume
-            confidence = min(1.0, len(events) / 10)
-
-            return SeasonalPattern(
-                location=location,
-                event_type=EventType(event_type) if event_type in [e.value for e in EventType] else EventType.OTHER,
-                peak_months=sorted(peak_months),
-                frequency=frequency,
-                avg_severity=avg_severity,
-                confidence=confidence,
+            return self._seasonal_from_counts(
+                location, event_type, month_counts, severity_sum, len(events)
             )
 
         except Exception as e:
             logger.debug("Pattern detection failed", error=str(e))
             return None
 
+    def _seasonal_from_counts(
+        self,
+        location: str,
+        event_type: str,
+        month_counts: list[int],
+        severity_sum: int,
+        total_events: int,
+    ) -> SeasonalPattern | None:
+        """
+        Build a seasonal pattern from aggregated event counts.
+
+        Args:
+            location: Location of events.
+            event_type: Type of events.
+            month_counts: Events per month, indexed 1-12 (index 0 unused).
+            severity_sum: Sum of the events' severity scores.
+            total_events: Number of events, including undated ones.
+
+        Returns:
+            SeasonalPattern if any month peaks, None otherwise.
+        """
+        avg_severity = severity_sum / total_events if total_events > 0 else 2.0
+
+        # Find peak months (above average)
+        threshold = total_events / 12 * 1.5
+        peak_months = [
+            month for month in range(1, 13)
+            if month_counts[month] > threshold
+        ]
+
+        if not peak_months:
+            return None
+
+        # Calculate frequency (events per year)
+        years_span = max(1, total_events / 12)
+        frequency = total_events / years_span
+
+        # Calculate confidence based on data volume
+        confidence = min(1.0, total_events / 10)
+
+        return SeasonalPattern(
+            location=location,
+            event_type=_EVENT_TYPES_BY_VALUE.get(event_type, EventType.OTHER),
+            peak_months=peak_months,
+            frequency=frequency,
+            avg_severity=avg_severity,
+            confidence=confidence,
+        )
+
     async def identify_recurring_patterns(
         self, min_occurrences: int = 3
     ) -> list[RiskPattern]:
@@ -355,26 +478,22 @@ class PatternAnalyzer:
         """Create a RiskPattern from aggregated data."""
         try:
             # Calculate severity distribution
-            severity_dist = defaultdict(int)
-            for sev in severities:
-                if sev:
-                    severity_dist[sev] += 1
-            
-            total = sum(severity_dist.values()) or 1
+            severity_dist = Counter(filter(None, severities))
+            total = severity_dist.total() or 1
             severity_distribution = {
-                SeverityLevel(k): v / total
+                _SEVERITIES_BY_VALUE[k]: v / total
                 for k, v in severity_dist.items()
-                if k in [s.value for s in SeverityLevel]
+                if k in _SEVERITIES_BY_VALUE
             }
 
-            # Parse dates and calculate metrics
-            parsed_dates = []
-            for d in dates:
-                if d:
-                    if isinstance(d, str):
-                        parsed_dates.append(datetime.fromisoformat(d.replace("Z", "+00:00")))
-                    elif isinstance(d, datetime):
-                        parsed_dates.append(d)
+            # Parse dates and calculate metrics; both ciso8601 and
+            # fromisoformat (3.11+) read a trailing "Z" themselves
+            parse = _parse_iso
+            parsed_dates = [
+                parse(d) if isinstance(d, str) else d
+                for d in dates
+                if d and isinstance(d, (str, datetime))
+            ]
 
             last_occurrence = max(parsed_dates) if parsed_dates else None
 
@@ -407,7 +526,7 @@ class PatternAnalyzer:
             return RiskPattern(
                 pattern_id=pattern_id,
                 location=location,
-                event_type=EventType(event_type) if event_type in [e.value for e in EventType] else EventType.OTHER,
+                event_type=_EVENT_TYPES_BY_VALUE.get(event_type, EventType.OTHER),
                 frequency_per_year=frequency_per_year,
                 avg_duration_days=7.0,  # Default estimate
                 severity_distribution=severity_distribution,
@@ -421,13 +540,13 @@ class PatternAnalyzer:
             return None
 
     def calculate_frequency_metrics(
-        self, events: list[RiskEvent]
+        self, events: list[RiskEvent] | RiskEventBatch
     ) -> dict[str, float]:
         """
         Calculate frequency metrics from a list of events.
 
         Args:
-            events: List of RiskEvent objects.
+            events: List of RiskEvent objects, or a batch of them.
 
         Returns:
             Dictionary of frequency metrics.
@@ -440,10 +559,7 @@ class PatternAnalyzer:
                 "avg_days_between": 0.0,
             }
 
-        # Sort by date
-        sorted_events = sorted(events, key=lambda e: e.detected_at)
-
-        if len(sorted_events) < 2:
+        if len(events) < 2:
             return {
                 "total_events": len(events),
                 "events_per_month": 0.0,
@@ -451,18 +567,21 @@ class PatternAnalyzer:
                 "avg_days_between": 0.0,
             }
 
+        # Sort the timestamps alone rather than the events
+        if isinstance(events, RiskEventBatch):
+            dates = sorted(events.detected_at)
+        else:
+            dates = sorted([e.detected_at for e in events])
+
         # Calculate time span
-        time_span = (sorted_events[-1].detected_at - sorted_events[0].detected_at).days
+        time_span = (dates[-1] - dates[0]).days
         weeks = max(time_span / 7, 1)
         months = max(time_span / 30, 1)
 
-        # Calculate gaps between events
-        gaps = []
-        for i in range(1, len(sorted_events)):
-            gap = (sorted_events[i].detected_at - sorted_events[i-1].detected_at).days
-            gaps.append(gap)
-
-        avg_gap = sum(gaps) / len(gaps) if gaps else 0
+        # Average whole-day gap between consecutive events
+        avg_gap = sum((later - earlier).days for earlier, later in pairwise(dates)) / (
+            len(dates) - 1
+        )
 
         return {
             "total_events": len(events),
@@ -477,6 +596,53 @@ class PatternAnalyzer:
 # =============================================================================
 
 
+@lru_cache(maxsize=4096)
+def _score_sentiment(text: str) -> float:
+    """Keyword sentiment of a text; the same snippet is often scored repeatedly."""
+    # Simple keyword-based sentiment for demonstration
+    # In production, use a proper NLP model
+    found: set[str] = set()
+    for match in _SENTIMENT_RE.finditer(text.lower()):
+        found.update(_SENTIMENT_PREFIXES[match.group(1)])
+
+    if not found:
+        return 0.0
+
+    # Score from -1 to 1: net polarity over distinct keywords present
+    return sum(_SENTIMENT_POLARITY[kw] for kw in found) / len(found)
+
+
+@lru_cache(maxsize=64)
+def _recommended_actions(level: WarningLevel, event_type: EventType) -> tuple[str, ...]:
+    """Recommended actions for a warning level and event type."""
+    base_actions = []
+
+    if level in [WarningLevel.WARNING, WarningLevel.CRITICAL]:
+        base_actions.extend([
+            "Review and activate backup suppliers",
+            "Increase inventory buffers for critical components",
+            "Alert procurement team for expedited sourcing",
+        ])
+
+    if level == WarningLevel.CRITICAL:
+        base_actions.extend([
+            "Activate business continuity plan",
+            "Notify executive leadership",
+            "Begin customer impact assessment",
+        ])
+
+    # Type-specific actions
+    type_actions = {
+        EventType.STRIKE: ["Monitor labor negotiations", "Prepare alternative logistics"],
+        EventType.WEATHER: ["Check weather forecasts", "Review transportation routes"],
+        EventType.GEOPOLITICAL: ["Monitor news sources", "Review regulatory requirements"],
+        EventType.CYBER_ATTACK: ["Enhance security monitoring", "Verify backup systems"],
+    }
+
+    base_actions.extend(type_actions.get(event_type, []))
+    return tuple(base_actions[:5])  # Limit to 5 actions
+
+
 class EarlyWarningDetector:
     """
     Detects early warning signals from sentiment analysis and patterns.
@@ -495,6 +661,11 @@ class EarlyWarningDetector:
         WarningLevel.CRITICAL: 0.9,
     }
 
+    # Thresholds in ascending order, for bisecting a signal strength
+    _THRESHOLD_ORDER = sorted(THRESHOLDS.items(), key=lambda x: x[1])
+    _THRESHOLD_VALUES = tuple(threshold for _, threshold in _THRESHOLD_ORDER)
+    _THRESHOLD_LEVELS = tuple(level for level, _ in _THRESHOLD_ORDER)
+
     def __init__(self, connection=None):
         """
         Initialize the early warning detector.
@@ -504,6 +675,8 @@ class EarlyWarningDetector:
         """
         self._connection = connection
         self._active_warnings: dict[str, EarlyWarning] = {}
+        # (expires_at, warning_id) for warnings that expire; may hold stale entries
+        self._expiry_heap: list[tuple[datetime, str]] = []
 
     def analyze_sentiment(self, text: str) -> float:
         """
@@ -515,56 +688,46 @@ class EarlyWarningDetector:
         Returns:
             Sentiment score from -1 (very negative) to 1 (very positive).
         """
-        # Simple keyword-based sentiment for demonstration
-        # In production, use a proper NLP model
-        text_lower = text.lower()
-
-        negative_keywords = [
-            "crisis", "disaster", "failure", "collapse", "shortage",
-            "strike", "protest", "closure", "bankruptcy", "disruption",
-            "delay", "shutdown", "halt", "suspend", "warning",
-        ]
-        positive_keywords = [
-            "recovery", "improvement", "resolution", "agreement",
-            "stable", "growth", "expansion", "success", "reopening",
-        ]
-
-        neg_count = sum(1 for kw in negative_keywords if kw in text_lower)
-        pos_count = sum(1 for kw in positive_keywords if kw in text_lower)
-
-        total = neg_count + pos_count
-        if total == 0:
+        if not text:
             return 0.0
-
-        # Score from -1 to 1
-        return (pos_count - neg_count) / total
+        return _score_sentiment(text)
 
     def detect_escalating_signals(
         self,
-        recent_events: list[RiskEvent],
+        recent_events: list[RiskEvent] | RiskEventBatch,
         historical_baseline: float,
     ) -> list[EarlyWarning]:
         """
         Detect escalating risk signals compared to baseline.
 
         Args:
-            recent_events: Recent risk events (e.g., last 7 days).
+            recent_events: Recent risk events (e.g., last 7 days), as a list
+                or a batch.
             historical_baseline: Historical average events per period.
 
         Returns:
             List of early warnings for escalating situations.
         """
         warnings = []
+        
+        # One timestamp for the whole batch
+        now = datetime.now(timezone.utc)
+        now_ts = now.timestamp()
+        expires_at = now + timedelta(days=7)
+
+        # Count event types per location in a single pass
+        location_types: defaultdict[str, Counter] = defaultdict(Counter)
+        if isinstance(recent_events, RiskEventBatch):
+            pairs = zip(
+                recent_events.locations, recent_events.event_types, strict=True
+            )
+        else:
+            pairs = ((e.location, e.event_type) for e in recent_events)
+        for location, event_type in pairs:
+            location_types[location][event_type] += 1
 
-        # Group by location
-        location_counts = defaultdict(lambda: {"count": 0, "events": []})
-        for event in recent_events:
-            location_counts[event.location]["count"] += 1
-            location_counts[event.location]["events"].append(event)
-
-        for location, data in location_counts.items():
-            count = data["count"]
-            events = data["events"]
+        for location, type_counts in location_types.items():
+            count = type_counts.total()
 
             # Calculate escalation ratio
             if historical_baseline > 0:
@@ -578,23 +741,15 @@ class EarlyWarningDetector:
             if signal_strength < self.THRESHOLDS[WarningLevel.WATCH]:
                 continue
 
-            # Determine warning level
-            warning_level = WarningLevel.WATCH
-            for level, threshold in sorted(
-                self.THRESHOLDS.items(), key=lambda x: x[1], reverse=True
-            ):
-                if signal_strength >= threshold:
-                    warning_level = level
-                    break
-
-            # Get most common event type
-            type_counts = defaultdict(int)
-            for e in events:
-                type_counts[e.event_type] += 1
-            most_common_type = max(type_counts, key=type_counts.get)
+            # Highest level whose threshold the signal reaches
+            index = bisect_right(self._THRESHOLD_VALUES, signal_strength) - 1
+            warning_level = self._THRESHOLD_LEVELS[max(0, index)]
+
+            # Get most common event type (first seen wins ties)
+            most_common_type = type_counts.most_common(1)[0][0]
 
             warning = EarlyWarning(
-                warning_id=f"warning-{location}-{datetime.now().timestamp()}",
+                warning_id=f"warning-{location}-{now_ts}",
                 location=location,
                 event_type=most_common_type,
                 warning_level=warning_level,
@@ -605,11 +760,13 @@ class EarlyWarningDetector:
                     f"{count} events detected recently",
                 ],
                 recommended_actions=self._get_recommended_actions(warning_level, most_common_type),
-                expires_at=datetime.now(timezone.utc) + timedelta(days=7),
+                detected_at=now,
+                expires_at=expires_at,
             )
 
             warnings.append(warning)
             self._active_warnings[warning.warning_id] = warning
+            heapq.heappush(self._expiry_heap, (expires_at, warning.warning_id))
 
         return warnings
 
@@ -617,42 +774,22 @@ class EarlyWarningDetector:
         self, level: WarningLevel, event_type: EventType
     ) -> list[str]:
         """Get recommended actions based on warning level and type."""
-        base_actions = []
-
-        if level in [WarningLevel.WARNING, WarningLevel.CRITICAL]:
-            base_actions.extend([
-                "Review and activate backup suppliers",
-                "Increase inventory buffers for critical components",
-                "Alert procurement team for expedited sourcing",
-            ])
-
-        if level == WarningLevel.CRITICAL:
-            base_actions.extend([
-                "Activate business continuity plan",
-                "Notify executive leadership",
-                "Begin customer impact assessment",
-            ])
-
-        # Type-specific actions
-        type_actions = {
-            EventType.STRIKE: ["Monitor labor negotiations", "Prepare alternative logistics"],
-            EventType.WEATHER: ["Check weather forecasts", "Review transportation routes"],
-            EventType.GEOPOLITICAL: ["Monitor news sources", "Review regulatory requirements"],
-            EventType.CYBER_ATTACK: ["Enhance security monitoring", "Verify backup systems"],
-        }
-
-        base_actions.extend(type_actions.get(event_type, []))
-        return base_actions[:5]  # Limit to 5 actions
+        return list(_recommended_actions(level, event_type))
 
     def get_active_warnings(self) -> list[EarlyWarning]:
         """Get all currently active warnings."""
         now = datetime.now(timezone.utc)
-        # Filter out expired warnings
-        active = [
-            w for w in self._active_warnings.values()
-            if w.expires_at is None or w.expires_at > now
-        ]
-        return active
+        
+        # Drop warnings as they expire; only newly expired entries are visited
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            _, warning_id = heapq.heappop(heap)
+            warning = self._active_warnings.get(warning_id)
+            # The ID may since have been reused by a later warning
+            if warning is not None and warning.expires_at is not None and warning.expires_at <= now:
+                del self._active_warnings[warning_id]
+        
+        return list(self._active_warnings.values())
 
 
 # =============================================================================
@@ -660,6 +797,47 @@ class EarlyWarningDetector:
 # =============================================================================
 
 
+@lru_cache(maxsize=64)
+def _preventive_actions(event_type: EventType, severity: SeverityLevel) -> tuple[str, ...]:
+    """Preventive actions for an event type and predicted severity."""
+    actions = []
+
+    # Severity-based actions
+    if severity in [SeverityLevel.HIGH, SeverityLevel.CRITICAL]:
+        actions.extend([
+            "Pre-position additional inventory",
+            "Verify and test backup supplier relationships",
+            "Prepare customer communication templates",
+        ])
+
+    # Type-specific actions
+    type_actions = {
+        EventType.STRIKE: [
+            "Review labor contract expiration dates",
+            "Identify alternative logistics providers",
+        ],
+        EventType.WEATHER: [
+            "Monitor long-range weather forecasts",
+            "Review flood/storm insurance coverage",
+        ],
+        EventType.GEOPOLITICAL: [
+            "Monitor political developments",
+            "Review trade compliance requirements",
+        ],
+        EventType.FIRE: [
+            "Verify fire safety certifications",
+            "Review business interruption insurance",
+        ],
+        EventType.PANDEMIC: [
+            "Review health and safety protocols",
+            "Assess remote work capabilities",
+        ],
+    }
+
+    actions.extend(type_actions.get(event_type, []))
+    return tuple(actions[:5])
+
+
 class RiskForecaster:
     """
     Generates risk forecasts using historical patterns and current signals.
@@ -667,6 +845,14 @@ class RiskForecaster:
     Creates probability-based predictions with confidence intervals.
     """
 
+    # Probability multipliers by pattern trend
+    TREND_MULTIPLIERS = {
+        TrendDirection.INCREASING: 1.3,
+        TrendDirection.DECREASING: 0.7,
+        TrendDirection.STABLE: 1.0,
+        TrendDirection.CYCLICAL: 1.1,
+    }
+
     def __init__(self, connection=None):
         """
         Initialize the risk forecaster.
@@ -695,25 +881,35 @@ class RiskForecaster:
         """
         forecasts = []
         now = datetime.now(timezone.utc)
+        now_ts = now.timestamp()
+        window_end = now + timedelta(days=forecast_days)
 
+        candidates = []
         for pattern in patterns:
             # Calculate probability based on pattern frequency and trend
-            base_probability = self._calculate_base_probability(pattern, forecast_days)
+            base_probability = self._calculate_base_probability(
+                pattern, forecast_days, now
+            )
 
             # Adjust for trend
-            trend_multiplier = {
-                TrendDirection.INCREASING: 1.3,
-                TrendDirection.DECREASING: 0.7,
-                TrendDirection.STABLE: 1.0,
-                TrendDirection.CYCLICAL: 1.1,
-            }.get(pattern.trend, 1.0)
+            trend_multiplier = self.TREND_MULTIPLIERS.get(pattern.trend, 1.0)
 
             probability = min(1.0, base_probability * trend_multiplier)
 
             # Skip low probability forecasts
             if probability < 0.15:
                 continue
+            candidates.append((pattern, probability))
 
+        if not candidates:
+            return forecasts
+
+        # Look up affected entities for every location in one query
+        affected_by_location = await self._get_affected_entities_bulk(
+            list({pattern.location for pattern, _ in candidates})
+        )
+
+        for pattern, probability in candidates:
             # Calculate confidence interval
             confidence_interval = self._calculate_confidence_interval(
                 probability, pattern.confidence
@@ -722,22 +918,23 @@ class RiskForecaster:
             # Determine predicted severity
             predicted_severity = self._predict_severity(pattern.severity_distribution)
 
-            # Get affected entities
-            affected = await self._get_affected_entities(pattern.location)
+            # Each forecast owns its list; forecasts for a location share the lookup
+            affected = list(affected_by_location.get(pattern.location, ()))
 
             forecast = RiskForecast(
-                forecast_id=f"forecast-{pattern.pattern_id}-{now.timestamp()}",
+                forecast_id=f"forecast-{pattern.pattern_id}-{now_ts}",
                 location=pattern.location,
                 event_type=pattern.event_type,
                 predicted_severity=predicted_severity,
                 probability=probability,
                 confidence_interval=confidence_interval,
                 forecast_window_start=now,
-                forecast_window_end=now + timedelta(days=forecast_days),
+                forecast_window_end=window_end,
                 affected_entities=affected,
                 preventive_actions=self._generate_preventive_actions(
                     pattern.event_type, predicted_severity
                 ),
+                created_at=now,
             )
 
             forecasts.append(forecast)
@@ -746,21 +943,27 @@ class RiskForecaster:
         return forecasts
 
     def _calculate_base_probability(
-        self, pattern: RiskPattern, forecast_days: int
+        self,
+        pattern: RiskPattern,
+        forecast_days: int,
+        now: datetime | None = None,
     ) -> float:
         """Calculate base probability from pattern frequency."""
         # Expected events in forecast window
         expected_events = (pattern.frequency_per_year / 365) * forecast_days
 
-        # Probability of at least one event (Poisson approximation)
+        # Probability of at least one event (Poisson approximation);
+        # expm1 stays accurate when few events are expected
         if expected_events > 0:
-            probability = 1 - math.exp(-expected_events)
+            probability = -math.expm1(-expected_events)
         else:
             probability = 0.0
 
         # Adjust for recency of last occurrence
         if pattern.last_occurrence:
-            days_since = (datetime.now(timezone.utc) - pattern.last_occurrence).days
+            if now is None:
+                now = datetime.now(timezone.utc)
+            days_since = (now - pattern.last_occurrence).days
             expected_gap = 365 / max(pattern.frequency_per_year, 0.1)
             
             if days_since > expected_gap * 1.5:
@@ -794,62 +997,45 @@ class RiskForecaster:
 
     async def _get_affected_entities(self, location: str) -> list[str]:
         """Get entities potentially affected by event at location."""
+        affected = await self._get_affected_entities_bulk([location])
+        return affected.get(location, [])
+
+    async def _get_affected_entities_bulk(
+        self, locations: list[str]
+    ) -> dict[str, list[str]]:
+        """
+        Get entities potentially affected by events at several locations.
+
+        Args:
+            locations: Locations to look up.
+
+        Returns:
+            Up to 20 affected entity IDs per location; locations without
+            suppliers are omitted.
+        """
         try:
             conn = self._connection or get_connection()
             query = """
-            MATCH (s:Supplier)-[:LOCATED_IN]->(l:Location {name: $location})
+            UNWIND $locations AS location
+            MATCH (s:Supplier)-[:LOCATED_IN]->(l:Location {name: location})
             OPTIONAL MATCH (s)-[:SUPPLIES]->(c:Component)
             OPTIONAL MATCH (c)-[:PART_OF]->(p:Product)
-            RETURN collect(DISTINCT s.id) + collect(DISTINCT c.id) + collect(DISTINCT p.id) as affected
-            LIMIT 100
+            RETURN location,
+                   collect(DISTINCT s.id) + collect(DISTINCT c.id) + collect(DISTINCT p.id) as affected
             """
-            results = await conn.execute_query(query, {"location": location})
-            if results:
-                return [e for e in results[0].get("affected", []) if e][:20]
+            results = await conn.execute_query(query, {"locations": locations})
+            return {
+                row["location"]: [e for e in row.get("affected", []) if e][:20]
+                for row in results
+            }
         except Exception:
-            pass
-        return []
+            return {}
 
     def _generate_preventive_actions(
         self, event_type: EventType, severity: SeverityLevel
     ) -> list[str]:
         """Generate preventive actions based on event type and severity."""
-        actions = []
-
-        # Severity-based actions
-        if severity in [SeverityLevel.HIGH, SeverityLevel.CRITICAL]:
-            actions.extend([
-                "Pre-position additional inventory",
-                "Verify and test backup supplier relationships",
-                "Prepare customer communication templates",
-            ])
-
-        # Type-specific actions
-        type_actions = {
-            EventType.STRIKE: [
-                "Review labor contract expiration dates",
-                "Identify alternative logistics providers",
-            ],
-            EventType.WEATHER: [
-                "Monitor long-range weather forecasts",
-                "Review flood/storm insurance coverage",
-            ],
-            EventType.GEOPOLITICAL: [
-                "Monitor political developments",
-                "Review trade compliance requirements",
-            ],
-            EventType.FIRE: [
-                "Verify fire safety certifications",
-                "Review business interruption insurance",
-            ],
-            EventType.PANDEMIC: [
-                "Review health and safety protocols",
-                "Assess remote work capabilities",
-            ],
-        }
-
-        actions.extend(type_actions.get(event_type, []))
-        return actions[:5]
+        return list(_preventive_actions(event_type, severity))
 
 
 # =============================================================================
@@ -857,6 +1043,26 @@ class RiskForecaster:
 # =============================================================================
 
 
+# Message templates, filled with %-formatting per alert
+_ALERT_MESSAGE = (
+    "Predictive analysis indicates a %s probability of a %s severity %s event "
+    "in %s within the next %d days. "
+    "Confidence interval: %s - %s."
+)
+
+_WARNING_MESSAGE = (
+    "Early warning signals detected for %s risk in %s. "
+    "Signal strength: %s. "
+    "Contributing factors: %s."
+)
+
+
+@lru_cache(maxsize=1024)
+def _percent(value: float) -> str:
+    """Format a probability as a whole percentage; forecasts repeat values."""
+    return f"{value:.0%}"
+
+
 class ProactiveAlertGenerator:
     """
     Generates proactive alerts from predictions and forecasts.
@@ -868,17 +1074,44 @@ class ProactiveAlertGenerator:
     # Default threshold for generating alerts
     DEFAULT_PROBABILITY_THRESHOLD = 0.5
 
-    def __init__(self, probability_threshold: float | None = None):
+    # Default number of generated alerts kept
+    DEFAULT_MAX_HISTORY = 10_000
+
+    # Probability weights by predicted severity
+    SEVERITY_WEIGHTS = {
+        SeverityLevel.LOW: 0.5,
+        SeverityLevel.MEDIUM: 1.0,
+        SeverityLevel.HIGH: 1.5,
+        SeverityLevel.CRITICAL: 2.0,
+    }
+
+    # Weighted-score cut-offs, and the level reached below, between and above them
+    _LEVEL_CUTOFFS = (0.6, 1.0, 1.4)
+    _LEVELS = (
+        WarningLevel.WATCH,
+        WarningLevel.ADVISORY,
+        WarningLevel.WARNING,
+        WarningLevel.CRITICAL,
+    )
+
+    def __init__(
+        self,
+        probability_threshold: float | None = None,
+        max_history: int | None = None,
+    ):
         """
         Initialize the alert generator.
 
         Args:
             probability_threshold: Minimum probability to trigger alerts.
+            max_history: Most recent alerts to keep; older ones are dropped.
         """
         self.probability_threshold = (
             probability_threshold or self.DEFAULT_PROBABILITY_THRESHOLD
         )
-        self._generated_alerts: list[PredictiveAlert] = []
+        self._generated_alerts: deque[PredictiveAlert] = deque(
+            maxlen=max_history or self.DEFAULT_MAX_HISTORY
+        )
 
     def generate_alerts_from_forecasts(
         self, forecasts: list[RiskForecast]
@@ -892,31 +1125,29 @@ class ProactiveAlertGenerator:
         Returns:
             List of generated predictive alerts.
         """
-        alerts = []
-
-        for forecast in forecasts:
-            if forecast.probability < self.probability_threshold:
-                continue
+        threshold = self.probability_threshold
+        warning_level = self._determine_warning_level
+        message = self._generate_alert_message
 
-            # Determine warning level based on probability and severity
-            warning_level = self._determine_warning_level(
-                forecast.probability, forecast.predicted_severity
-            )
-
-            alert = PredictiveAlert(
-                alert_id=f"palert-{forecast.forecast_id}",
+        alerts = [
+            PredictiveAlert(
+                alert_id="palert-" + forecast.forecast_id,
                 forecast_id=forecast.forecast_id,
-                warning_level=warning_level,
+                # Warning level is based on probability and severity
+                warning_level=warning_level(
+                    forecast.probability, forecast.predicted_severity
+                ),
                 title=f"Predicted {forecast.event_type.value} Risk: {forecast.location}",
-                message=self._generate_alert_message(forecast),
+                message=message(forecast),
                 affected_products=forecast.affected_entities[:10],
                 preventive_actions=forecast.preventive_actions,
-                probability_threshold=self.probability_threshold,
+                probability_threshold=threshold,
             )
+            for forecast in forecasts
+            if forecast.probability >= threshold
+        ]
 
-            alerts.append(alert)
-            self._generated_alerts.append(alert)
-
+        self._generated_alerts.extend(alerts)
         return alerts
 
     def generate_alerts_from_warnings(
@@ -938,7 +1169,7 @@ class ProactiveAlertGenerator:
                 continue
 
             alert = PredictiveAlert(
-                alert_id=f"walert-{warning.warning_id}",
+                alert_id="walert-" + warning.warning_id,
                 forecast_id="",
                 warning_level=warning.warning_level,
                 title=f"Early Warning: {warning.event_type.value} signals in {warning.location}",
@@ -957,45 +1188,35 @@ class ProactiveAlertGenerator:
         self, probability: float, severity: SeverityLevel
     ) -> WarningLevel:
         """Determine warning level from probability and severity."""
-        severity_weights = {
-            SeverityLevel.LOW: 0.5,
-            SeverityLevel.MEDIUM: 1.0,
-            SeverityLevel.HIGH: 1.5,
-            SeverityLevel.CRITICAL: 2.0,
-        }
-
-        weighted_score = probability * severity_weights.get(severity, 1.0)
-
-        if weighted_score >= 1.4:
-            return WarningLevel.CRITICAL
-        elif weighted_score >= 1.0:
-            return WarningLevel.WARNING
-        elif weighted_score >= 0.6:
-            return WarningLevel.ADVISORY
-        else:
-            return WarningLevel.WATCH
+        weighted_score = probability * self.SEVERITY_WEIGHTS.get(severity, 1.0)
+        return self._LEVELS[bisect_right(self._LEVEL_CUTOFFS, weighted_score)]
 
     def _generate_alert_message(self, forecast: RiskForecast) -> str:
         """Generate alert message from forecast."""
-        return (
-            f"Predictive analysis indicates a {forecast.probability:.0%} probability "
-            f"of a {forecast.predicted_severity.value} severity {forecast.event_type.value} event "
-            f"in {forecast.location} within the next "
-            f"{(forecast.forecast_window_end - forecast.forecast_window_start).days} days. "
-            f"Confidence interval: {forecast.confidence_interval[0]:.0%} - {forecast.confidence_interval[1]:.0%}."
+        days = (forecast.forecast_window_end - forecast.forecast_window_start).days
+        low, high = forecast.confidence_interval
+        return _ALERT_MESSAGE % (
+            _percent(forecast.probability),
+            forecast.predicted_severity.value,
+            forecast.event_type.value,
+            forecast.location,
+            days,
+            _percent(low),
+            _percent(high),
         )
 
     def _generate_warning_message(self, warning: EarlyWarning) -> str:
         """Generate alert message from warning."""
-        return (
-            f"Early warning signals detected for {warning.event_type.value} risk in {warning.location}. "
-            f"Signal strength: {warning.signal_strength:.0%}. "
-            f"Contributing factors: {', '.join(warning.contributing_factors[:3])}."
+        return _WARNING_MESSAGE % (
+            warning.event_type.value,
+            warning.location,
+            _percent(warning.signal_strength),
+            ", ".join(warning.contributing_factors[:3]),
         )
 
     def get_all_alerts(self) -> list[PredictiveAlert]:
-        """Get all generated alerts."""
-        return self._generated_alerts
+        """Get all generated alerts still in the history."""
+        return list(self._generated_alerts)
 
 
 # =============================================================================
@@ -1010,10 +1231,27 @@ class ForecastAccuracyTracker:
     Compares predictions to actual outcomes and calculates accuracy metrics.
     """
 
-    def __init__(self):
-        """Initialize the accuracy tracker."""
-        self._accuracy_records: list[ForecastAccuracy] = []
-        self._forecast_outcomes: dict[str, bool] = {}
+    # Default number of outcome records kept
+    DEFAULT_MAX_HISTORY = 10_000
+
+    def __init__(self, max_history: int | None = None):
+        """
+        Initialize the accuracy tracker.
+
+        Args:
+            max_history: Most recent outcomes to keep; metrics cover only these.
+        """
+        self._max_history = max_history or self.DEFAULT_MAX_HISTORY
+        self._accuracy_records: deque[ForecastAccuracy] = deque(
+            maxlen=self._max_history
+        )
+        # Latest outcome per forecast, bounded like the records
+        self._forecast_outcomes: OrderedDict[str, bool] = OrderedDict()
+        # Running totals for the metrics, updated as outcomes are recorded
+        self._confusion: Counter[tuple[bool, bool]] = Counter()
+        self._error_sum = 0.0
+        self._squared_error_sum = 0.0
+        self._metrics: dict[str, float] | None = None
 
     def record_outcome(
         self,
@@ -1059,11 +1297,29 @@ class ForecastAccuracyTracker:
             timing_error_days=timing_error,
         )
 
-        self._accuracy_records.append(accuracy)
-        self._forecast_outcomes[forecast_id] = actual_occurred
+        records = self._accuracy_records
+        if len(records) == records.maxlen:
+            self._tally(records[0], -1)
+        records.append(accuracy)
+        self._tally(accuracy, 1)
+        outcomes = self._forecast_outcomes
+        outcomes[forecast_id] = actual_occurred
+        outcomes.move_to_end(forecast_id)
+        if len(outcomes) > self._max_history:
+            outcomes.popitem(last=False)
+        self._metrics = None
 
         return accuracy
 
+    def _tally(self, record: ForecastAccuracy, weight: int) -> None:
+        """Add (weight 1) or remove (weight -1) a record from the running totals."""
+        probability = record.predicted_probability
+        occurred = record.actual_occurred
+        self._confusion[probability >= 0.5, occurred] += weight
+        self._error_sum += weight * record.prediction_error
+        diff = probability - (1.0 if occurred else 0.0)
+        self._squared_error_sum += weight * diff * diff
+
     def calculate_metrics(self) -> dict[str, float]:
         """
         Calculate overall accuracy metrics.
@@ -1071,6 +1327,13 @@ class ForecastAccuracyTracker:
         Returns:
             Dictionary of accuracy metrics.
         """
+        # Cached until the next recorded outcome
+        if self._metrics is None:
+            self._metrics = self._compute_metrics()
+        return dict(self._metrics)
+
+    def _compute_metrics(self) -> dict[str, float]:
+        """Compute the accuracy metrics from the running totals."""
         if not self._accuracy_records:
             return {
                 "total_forecasts": 0,
@@ -1082,24 +1345,13 @@ class ForecastAccuracyTracker:
             }
 
         total = len(self._accuracy_records)
-        
+
         # Count correct predictions
-        true_positives = sum(
-            1 for r in self._accuracy_records
-            if r.predicted_probability >= 0.5 and r.actual_occurred
-        )
-        false_positives = sum(
-            1 for r in self._accuracy_records
-            if r.predicted_probability >= 0.5 and not r.actual_occurred
-        )
-        true_negatives = sum(
-            1 for r in self._accuracy_records
-            if r.predicted_probability < 0.5 and not r.actual_occurred
-        )
-        false_negatives = sum(
-            1 for r in self._accuracy_records
-            if r.predicted_probability < 0.5 and r.actual_occurred
-        )
+        confusion = self._confusion
+        true_positives = confusion[True, True]
+        false_positives = confusion[True, False]
+        true_negatives = confusion[False, False]
+        false_negatives = confusion[False, True]
 
         # Calculate metrics
         accuracy = (true_positives + true_negatives) / total if total > 0 else 0.0
@@ -1117,13 +1369,10 @@ class ForecastAccuracyTracker:
         )
 
         # Mean prediction error
-        mean_error = sum(r.prediction_error for r in self._accuracy_records) / total
+        mean_error = self._error_sum / total
 
         # Brier score (lower is better)
-        brier = sum(
-            (r.predicted_probability - (1.0 if r.actual_occurred else 0.0)) ** 2
-            for r in self._accuracy_records
-        ) / total
+        brier = self._squared_error_sum / total
 
         return {
             "total_forecasts": total,
@@ -5,10 +5,15 @@ Provides algorithms for prioritizing and ranking supply chain risks
 based on severity, timeline, and business impact.
 """
 
-from dataclasses import dataclass, field
+from bisect import bisect_right
+from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
 from enum import Enum
+from functools import cached_property
+from operator import attrgetter, mul
+from types import MappingProxyType
 from typing import Any
+import math
 
 from pydantic import BaseModel, Field
 import structlog
@@ -28,7 +33,25 @@ class PriorityFactor(str, Enum):
     CONFIDENCE = "confidence"
 
 
-@dataclass
+# Factor names in the order scores and weights are paired up
+_FACTOR_NAMES = tuple(factor.value for factor in PriorityFactor)
+
+# Risk age bounds, and the timeline score below, between and beyond them
+_TIMELINE_BOUNDS = (
+    timedelta(hours=1),
+    timedelta(hours=24),
+    timedelta(days=7),
+    timedelta(days=30),
+)
+_TIMELINE_SCORES = (1.0, 0.9, 0.7, 0.5, 0.3)
+
+
+def _revenue_total(impact: ImpactAssessment, revenue_data: dict[str, float]) -> float:
+    """Total revenue of the products an impact assessment affects."""
+    return sum(revenue_data.get(pid, 0) for pid in impact.affected_products)
+
+
+@dataclass(frozen=True)
 class PriorityWeights:
     """Configurable weights for priority calculation."""
 
@@ -38,19 +61,30 @@ class PriorityWeights:
     revenue_impact: float = 0.15
     confidence: float = 0.10
 
+    # Derived once per instance; cached_property needs the instance __dict__,
+    # so the class is not slotted (there is one instance per prioritizer)
+    @cached_property
+    def _vector(self) -> tuple[float, ...]:
+        """Weights in PriorityFactor order."""
+        return (
+            self.severity,
+            self.timeline,
+            self.products_affected,
+            self.revenue_impact,
+            self.confidence,
+        )
+
+    @cached_property
+    def _total(self) -> float:
+        """Sum of the weights."""
+        return math.fsum(self._vector)
+
     def validate(self) -> bool:
         """Validate that weights sum to 1.0."""
-        total = (
-            self.severity
-            + self.timeline
-            + self.products_affected
-            + self.revenue_impact
-            + self.confidence
-        )
-        return 0.99 <= total <= 1.01
+        return 0.99 <= self._total <= 1.01
 
 
-@dataclass
+@dataclass(slots=True)
 class PrioritizedRisk:
     """A risk event with calculated priority score."""
 
@@ -60,7 +94,13 @@ class PrioritizedRisk:
     severity_score: float
     timeline_score: float
     impact_score: float
-    factors: dict[str, float] = field(default_factory=dict)
+    # Factor scores in PriorityFactor order
+    factors: tuple[float, ...] = ()
+
+    @property
+    def factors_dict(self) -> dict[str, float]:
+        """Factor scores keyed by factor name."""
+        return dict(zip(_FACTOR_NAMES, self.factors, strict=True))
 
 
 class RiskPrioritizer:
@@ -71,13 +111,13 @@ class RiskPrioritizer:
     and risk aggregation for products with multiple threats.
     """
 
-    # Severity level to score mapping
-    SEVERITY_SCORES = {
+    # Severity level to score mapping; covers every level, read-only
+    SEVERITY_SCORES = MappingProxyType({
         SeverityLevel.LOW: 0.25,
         SeverityLevel.MEDIUM: 0.50,
         SeverityLevel.HIGH: 0.75,
         SeverityLevel.CRITICAL: 1.0,
-    }
+    })
 
     def __init__(self, weights: PriorityWeights | None = None):
         """Initialize the prioritizer with optional custom weights."""
@@ -102,15 +142,27 @@ class RiskPrioritizer:
         Returns:
             PrioritizedRisk with calculated scores.
         """
-        factors = {}
+        revenue_total = (
+            _revenue_total(impact, revenue_data) if revenue_data and impact else None
+        )
+        return self._score_risk(
+            risk, impact, revenue_total, self.weights._vector, datetime.now(timezone.utc)
+        )
 
+    def _score_risk(
+        self,
+        risk: RiskEvent,
+        impact: ImpactAssessment | None,
+        revenue_total: float | None,
+        weights: tuple[float, ...],
+        now: datetime,
+    ) -> PrioritizedRisk:
+        """Score one risk against a weight vector and clock read once per batch."""
         # Severity score
-        severity_score = self.SEVERITY_SCORES.get(risk.severity, 0.5)
-        factors["severity"] = severity_score
+        severity_score = self.SEVERITY_SCORES[risk.severity]
 
         # Timeline score (more recent = higher priority)
-        timeline_score = self._calculate_timeline_score(risk.detected_at)
-        factors["timeline"] = timeline_score
+        timeline_score = self._calculate_timeline_score(risk.detected_at, now)
 
         # Products affected score
         products_count = 0
@@ -120,29 +172,21 @@ class RiskPrioritizer:
             products_count = len(risk.affected_entities)
 
         products_score = min(products_count / 10, 1.0)  # Normalize to max 10 products
-        factors["products_affected"] = products_score
 
         # Revenue impact score
         revenue_score = 0.0
-        if revenue_data and impact:
-            total_revenue = sum(
-                revenue_data.get(pid, 0) for pid in impact.affected_products
-            )
-            revenue_score = min(total_revenue / 1_000_000, 1.0)  # Normalize to 1M
-        factors["revenue_impact"] = revenue_score
-
-        # Confidence score
-        confidence_score = risk.confidence
-        factors["confidence"] = confidence_score
+        if revenue_total is not None:
+            revenue_score = min(revenue_total / 1_000_000, 1.0)  # Normalize to 1M
 
         # Calculate weighted priority
-        priority_score = (
-            factors["severity"] * self.weights.severity
-            + factors["timeline"] * self.weights.timeline
-            + factors["products_affected"] * self.weights.products_affected
-            + factors["revenue_impact"] * self.weights.revenue_impact
-            + factors["confidence"] * self.weights.confidence
+        scores = (
+            severity_score,
+            timeline_score,
+            products_score,
+            revenue_score,
+            risk.confidence,
         )
+        priority_score = sum(map(mul, scores, weights))
 
         return PrioritizedRisk(
             risk_event=risk,
@@ -151,7 +195,7 @@ class RiskPrioritizer:
             severity_score=severity_score,
             timeline_score=timeline_score,
             impact_score=products_score,
-            factors=factors,
+            factors=scores,
         )
 
     def prioritize_risks(
@@ -174,37 +218,46 @@ class RiskPrioritizer:
         if not risks:
             return []
 
-        prioritized = []
-        for risk in risks:
-            impact = impacts.get(risk.id) if impacts else None
-            p_risk = self.calculate_priority(risk, impact, revenue_data)
-            prioritized.append(p_risk)
+        weights = self.weights._vector
+        now = datetime.now(timezone.utc)
+        impacts = impacts or {}
+
+        # Sum each impact's product revenue once for the whole batch
+        revenue_totals: dict[str, float] = {}
+        if revenue_data:
+            revenue_totals = {
+                risk_id: _revenue_total(impact, revenue_data)
+                for risk_id, impact in impacts.items()
+            }
+
+        prioritized = [
+            self._score_risk(
+                risk,
+                impacts.get(risk.id),
+                revenue_totals.get(risk.id),
+                weights,
+                now,
+            )
+            for risk in risks
+        ]
 
         # Sort by priority score descending
-        prioritized.sort(key=lambda x: x.priority_score, reverse=True)
+        prioritized.sort(key=attrgetter("priority_score"), reverse=True)
 
         # Assign ranks
-        for i, p_risk in enumerate(prioritized):
-            p_risk.priority_rank = i + 1
+        for rank, p_risk in enumerate(prioritized, start=1):
+            p_risk.priority_rank = rank
 
         return prioritized
 
-    def _calculate_timeline_score(self, detected_at: datetime) -> float:
+    def _calculate_timeline_score(
+        self, detected_at: datetime, now: datetime | None = None
+    ) -> float:
         """Calculate timeline score based on recency."""
-        now = datetime.now(timezone.utc)
-        age = now - detected_at
+        age = (now or datetime.now(timezone.utc)) - detected_at
 
         # More recent = higher score
-        if age < timedelta(hours=1):
-            return 1.0
-        elif age < timedelta(hours=24):
-            return 0.9
-        elif age < timedelta(days=7):
-            return 0.7
-        elif age < timedelta(days=30):
-            return 0.5
-        else:
-            return 0.3
+        return _TIMELINE_SCORES[bisect_right(_TIMELINE_BOUNDS, age)]
 
     def aggregate_product_risks(
         self,
@@ -219,25 +272,20 @@ class RiskPrioritizer:
         Returns:
             Dict mapping product ID to aggregated risk score.
         """
-        product_scores: dict[str, list[float]] = {}
+        # Track each product's highest score and total in one pass
+        product_scores: dict[str, tuple[float, float]] = {}
 
         for p_risk in prioritized_risks:
+            score = p_risk.priority_score
             for entity in p_risk.risk_event.affected_entities:
-                if entity not in product_scores:
-                    product_scores[entity] = []
-                product_scores[entity].append(p_risk.priority_score)
+                max_score, total = product_scores.get(entity, (score, 0.0))
+                product_scores[entity] = (max(max_score, score), total + score)
 
         # Aggregate using max + 10% of others
-        aggregated = {}
-        for product_id, scores in product_scores.items():
-            if not scores:
-                continue
-            scores.sort(reverse=True)
-            max_score = scores[0]
-            other_contribution = sum(scores[1:]) * 0.1
-            aggregated[product_id] = min(max_score + other_contribution, 1.0)
-
-        return aggregated
+        return {
+            product_id: min(max_score + (total - max_score) * 0.1, 1.0)
+            for product_id, (max_score, total) in product_scores.items()
+        }
 
     def get_no_risk_response(self) -> dict[str, Any]:
         """
@@ -259,24 +307,24 @@ class RiskPrioritizer:
         }
 
 
+# Severity sort rank (higher = more severe)
+_SEVERITY_RANK = {
+    SeverityLevel.CRITICAL: 4,
+    SeverityLevel.HIGH: 3,
+    SeverityLevel.MEDIUM: 2,
+    SeverityLevel.LOW: 1,
+}
+
+
 def sort_by_severity(risks: list[RiskEvent]) -> list[RiskEvent]:
     """Sort risks by severity (highest first)."""
-    severity_order = {
-        SeverityLevel.CRITICAL: 4,
-        SeverityLevel.HIGH: 3,
-        SeverityLevel.MEDIUM: 2,
-        SeverityLevel.LOW: 1,
-    }
-    return sorted(
-        risks,
-        key=lambda r: severity_order.get(r.severity, 0),
-        reverse=True,
-    )
+    rank = _SEVERITY_RANK.get
+    return sorted(risks, key=lambda r: rank(r.severity, 0), reverse=True)
 
 
 def sort_by_timeline(risks: list[RiskEvent]) -> list[RiskEvent]:
     """Sort risks by detection time (most recent first)."""
-    return sorted(risks, key=lambda r: r.detected_at, reverse=True)
+    return sorted(risks, key=attrgetter("detected_at"), reverse=True)
 
 
 def sort_by_affected_count(
@@ -285,8 +333,9 @@ def sort_by_affected_count(
 ) -> list[RiskEvent]:
     """Sort risks by number of affected products (highest first)."""
     def get_affected_count(risk: RiskEvent) -> int:
-        if risk.id in impacts:
-            return len(impacts[risk.id].affected_products)
+        impact = impacts.get(risk.id)
+        if impact is not None:
+            return len(impact.affected_products)
         return len(risk.affected_entities)
 
     return sorted(risks, key=get_affected_count, reverse=True)
@@ -5,16 +5,25 @@ Generates comprehensive impact reports for stakeholders with
 timeline estimates and mitigation recommendations.
 """
 
-from dataclasses import dataclass, field
+from bisect import bisect_right
+from dataclasses import dataclass, field, fields, is_dataclass
 from datetime import datetime, timezone, timedelta
 from enum import Enum
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Any
+import io
 import json
 
-from pydantic import BaseModel, Field
 import structlog
 
-from src.models import RiskEvent, SeverityLevel, ImpactAssessment
+from src.models import RiskEvent, SeverityLevel, EventType, ImpactAssessment
+
+try:
+    # C encoder that walks dataclasses and datetimes natively; optional
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = structlog.get_logger(__name__)
 
@@ -27,7 +36,7 @@ class ReportFormat(str, Enum):
     HTML = "html"
 
 
-@dataclass
+@dataclass(slots=True)
 class TimelineEstimate:
     """Estimated timeline for risk impact and recovery."""
 
@@ -38,7 +47,7 @@ class TimelineEstimate:
     notes: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class MitigationOption:
     """A mitigation option for addressing a risk."""
 
@@ -50,7 +59,7 @@ class MitigationOption:
     priority: int
 
 
-@dataclass
+@dataclass(slots=True)
 class AffectedProduct:
     """Details about an affected product."""
 
@@ -62,7 +71,7 @@ class AffectedProduct:
     alternative_sources: int
 
 
-@dataclass
+@dataclass(slots=True)
 class ImpactReport:
     """Comprehensive impact report for a risk event."""
 
@@ -80,6 +89,118 @@ class ImpactReport:
     metadata: dict[str, Any] = field(default_factory=dict)
 
 
+# Severities that call for immediate action
+_HIGH_SEVERITIES = frozenset({SeverityLevel.HIGH, SeverityLevel.CRITICAL})
+
+# Lowercase labels for report prose
+_SEVERITY_LOWER = {s: s.value.lower() for s in SeverityLevel}
+_EVENT_TYPE_LOWER = {e: e.value.lower() for e in EventType}
+
+def _days(*days: int) -> tuple[timedelta, ...]:
+    """Build a tuple of whole-day timedeltas."""
+    return tuple(timedelta(days=d) for d in days)
+
+
+# Base impact start, peak and resolution offsets by severity
+_TIMELINE_OFFSETS = MappingProxyType({
+    SeverityLevel.LOW: _days(1, 3, 7),
+    SeverityLevel.MEDIUM: _days(2, 7, 21),
+    SeverityLevel.HIGH: _days(3, 14, 45),
+    SeverityLevel.CRITICAL: _days(1, 30, 90),
+})
+_DEFAULT_TIMELINE_OFFSETS = _days(2, 7, 21)
+
+# Severity score cut-offs, and the label below, between and above them
+_SCORE_CUTOFFS = (4.0, 6.0, 8.0)
+_SCORE_LABELS = ("Low", "Medium", "High", "Critical")
+
+# Title, cost, time, effectiveness and priority for the first three assessed
+# mitigation options, in order
+_ASSESSED_MITIGATIONS = tuple(
+    (
+        f"Mitigation {i+1}",
+        "Medium" if i < 2 else "High",
+        f"{(i+1)*2}-{(i+2)*2} days",
+        0.6 - (i * 0.1),
+        i + 2,
+    )
+    for i in range(3)
+)
+
+# Shared stand-in for products without metadata; only ever read
+_NO_PRODUCT_DATA: dict[str, Any] = {}
+
+_EXECUTIVE_SUMMARY = (
+    "A {severity} severity {event_type} event has been detected at {location}. "
+    "This event affects {affected_count} product(s) in the supply chain with an "
+    "estimated severity score of {severity_score:.1f}/10. The current redundancy "
+    "level is {redundancy:.0%}, which {redundancy_note}. "
+    "Immediate attention is {urgency}."
+)
+
+
+@lru_cache(maxsize=2048)
+def _executive_summary(
+    severity: SeverityLevel,
+    event_type: EventType,
+    location: str,
+    affected_count: int,
+    severity_score: float,
+    redundancy: float,
+) -> str:
+    """Executive summary text; re-reported risks repeat the same inputs."""
+    return _EXECUTIVE_SUMMARY.format_map({
+        "severity": _SEVERITY_LOWER[severity],
+        "event_type": _EVENT_TYPE_LOWER[event_type],
+        "location": location,
+        "affected_count": affected_count,
+        "severity_score": severity_score,
+        "redundancy": redundancy,
+        "redundancy_note": (
+            "provides some protection"
+            if redundancy > 0.5
+            else "indicates significant vulnerability"
+        ),
+        "urgency": "required" if severity in _HIGH_SEVERITIES else "recommended",
+    })
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Shorten text to ``limit`` characters, marking a cut with an ellipsis."""
+    return text if len(text) <= limit else f"{text[:limit]}..."
+
+
+def _format_date(d: datetime) -> str:
+    """Format a date as YYYY-MM-DD without going through strftime."""
+    return f"{d.year:04d}-{d.month:02d}-{d.day:02d}"
+
+
+def _json_default(obj: Any) -> Any:
+    """Encode the report values the JSON encoder does not handle itself."""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if is_dataclass(obj):
+        return {f.name: getattr(obj, f.name) for f in fields(obj)}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dump_json_stdlib(report: ImpactReport) -> str:
+    """Encode a report with the standard library encoder."""
+    return json.dumps(report, default=_json_default, indent=2)
+
+
+def _dump_json_orjson(report: ImpactReport) -> str:
+    """Encode a report with orjson."""
+    return orjson.dumps(
+        report, default=_json_default, option=orjson.OPT_INDENT_2
+    ).decode()
+
+
+# Encoder chosen once at import; both encode in one pass, with nested
+# reports and dates going through the default hook
+_dump_json = _dump_json_orjson if orjson is not None else _dump_json_stdlib
+
+
 class ReportGenerator:
     """
     Generates comprehensive impact reports.
@@ -105,11 +226,43 @@ class ReportGenerator:
         Returns:
             Complete ImpactReport.
         """
+        return self._build_report(
+            risk, impact, product_data or {}, datetime.now(timezone.utc)
+        )
+
+    def generate_reports(
+        self,
+        jobs: list[tuple[RiskEvent, ImpactAssessment, dict[str, dict[str, Any]] | None]],
+    ) -> list[ImpactReport]:
+        """
+        Generate impact reports for a batch of risks.
+
+        Args:
+            jobs: (risk, impact, product_data) triples; product_data may be None.
+
+        Returns:
+            One ImpactReport per job, in order, all stamped with the same
+            generation time.
+        """
+        now = datetime.now(timezone.utc)
+        build = self._build_report
+        return [
+            build(risk, impact, product_data or {}, now)
+            for risk, impact, product_data in jobs
+        ]
+
+    def _build_report(
+        self,
+        risk: RiskEvent,
+        impact: ImpactAssessment,
+        product_data: dict[str, dict[str, Any]],
+        now: datetime,
+    ) -> ImpactReport:
+        """Build one report against a clock reading shared across a batch."""
         report_id = f"RPT-{risk.id}"
-        product_data = product_data or {}
 
         # Generate timeline estimate
-        timeline = self._estimate_timeline(risk, impact)
+        timeline = self._estimate_timeline(risk, impact, now)
 
         # Process affected products
         affected_products = self._process_affected_products(
@@ -133,8 +286,8 @@ class ReportGenerator:
         return ImpactReport(
             report_id=report_id,
             risk_event_id=risk.id,
-            generated_at=datetime.now(timezone.utc),
-            title=f"Impact Report: {risk.description[:50]}...",
+            generated_at=now,
+            title=f"Impact Report: {_truncate(risk.description, 50)}",
             executive_summary=summary,
             timeline=timeline,
             affected_products=affected_products,
@@ -153,26 +306,19 @@ class ReportGenerator:
         self,
         risk: RiskEvent,
         impact: ImpactAssessment,
+        now: datetime | None = None,
     ) -> TimelineEstimate:
         """Estimate timeline based on risk severity and type."""
-        now = datetime.now(timezone.utc)
-
-        # Base durations by severity
-        duration_map = {
-            SeverityLevel.LOW: (1, 3, 7),
-            SeverityLevel.MEDIUM: (2, 7, 21),
-            SeverityLevel.HIGH: (3, 14, 45),
-            SeverityLevel.CRITICAL: (1, 30, 90),
-        }
+        now = now or datetime.now(timezone.utc)
 
-        start_days, peak_days, resolution_days = duration_map.get(
-            risk.severity, (2, 7, 21)
+        start, peak, resolution = _TIMELINE_OFFSETS.get(
+            risk.severity, _DEFAULT_TIMELINE_OFFSETS
         )
 
         return TimelineEstimate(
-            impact_start=now + timedelta(days=start_days),
-            peak_impact=now + timedelta(days=peak_days),
-            expected_resolution=now + timedelta(days=resolution_days),
+            impact_start=now + start,
+            peak_impact=now + peak,
+            expected_resolution=now + resolution,
             confidence=0.7 + (impact.redundancy_level * 0.3),
             notes=f"Based on {risk.event_type.value} event historical patterns",
         )
@@ -184,16 +330,20 @@ class ReportGenerator:
         severity_score: float,
     ) -> list[AffectedProduct]:
         """Process and enrich affected product data."""
-        products = []
+        # Severity and delay depend only on the overall score
+        impact_severity = self._score_to_severity(severity_score)
+        estimated_delay_days = int(severity_score * 14) + 1
+        get_data = product_data.get
 
+        products = []
         for pid in product_ids:
-            data = product_data.get(pid, {})
+            data = get_data(pid) or _NO_PRODUCT_DATA
             products.append(
                 AffectedProduct(
                     product_id=pid,
                     product_name=data.get("name", f"Product {pid}"),
-                    impact_severity=self._score_to_severity(severity_score),
-                    estimated_delay_days=int(severity_score * 14) + 1,
+                    impact_severity=impact_severity,
+                    estimated_delay_days=estimated_delay_days,
                     revenue_at_risk=data.get("revenue", 0.0),
                     alternative_sources=data.get("backup_suppliers", 0),
                 )
@@ -222,15 +372,17 @@ class ReportGenerator:
         )
 
         # Add mitigation options from impact assessment
-        for i, option in enumerate(impact.mitigation_options[:3]):
+        for option, (title, cost, time_to_implement, effectiveness, priority) in zip(
+            impact.mitigation_options, _ASSESSED_MITIGATIONS, strict=False
+        ):
             mitigations.append(
                 MitigationOption(
-                    title=f"Mitigation {i+1}",
+                    title=title,
                     description=option,
-                    estimated_cost="Medium" if i < 2 else "High",
-                    time_to_implement=f"{(i+1)*2}-{(i+2)*2} days",
-                    effectiveness=0.6 - (i * 0.1),
-                    priority=i + 2,
+                    estimated_cost=cost,
+                    time_to_implement=time_to_implement,
+                    effectiveness=effectiveness,
+                    priority=priority,
                 )
             )
 
@@ -256,13 +408,13 @@ class ReportGenerator:
         affected_count: int,
     ) -> str:
         """Generate executive summary paragraph."""
-        return (
-            f"A {risk.severity.value.lower()} severity {risk.event_type.value.lower()} "
-            f"event has been detected at {risk.location}. This event affects "
-            f"{affected_count} product(s) in the supply chain with an estimated severity "
-            f"score of {impact.severity_score:.1f}/10. The current redundancy level is "
-            f"{impact.redundancy_level:.0%}, which {'provides some protection' if impact.redundancy_level > 0.5 else 'indicates significant vulnerability'}. "
-            f"Immediate attention is {'required' if risk.severity in [SeverityLevel.HIGH, SeverityLevel.CRITICAL] else 'recommended'}."
+        return _executive_summary(
+            risk.severity,
+            risk.event_type,
+            risk.location,
+            affected_count,
+            impact.severity_score,
+            impact.redundancy_level,
         )
 
     def _generate_recommendations(
@@ -275,7 +427,7 @@ class ReportGenerator:
         recommendations = []
 
         # High priority actions
-        if risk.severity in [SeverityLevel.HIGH, SeverityLevel.CRITICAL]:
+        if risk.severity in _HIGH_SEVERITIES:
             recommendations.append("Activate emergency response team")
             recommendations.append("Notify key stakeholders immediately")
 
@@ -291,80 +443,67 @@ class ReportGenerator:
 
     def _score_to_severity(self, score: float) -> str:
         """Convert numeric score to severity label."""
-        if score >= 8:
-            return "Critical"
-        elif score >= 6:
-            return "High"
-        elif score >= 4:
-            return "Medium"
-        else:
-            return "Low"
+        return _SCORE_LABELS[bisect_right(_SCORE_CUTOFFS, score)]
 
     def export_json(self, report: ImpactReport) -> str:
         """Export report to JSON format."""
-        def serialize(obj):
-            if isinstance(obj, datetime):
-                return obj.isoformat()
-            if hasattr(obj, "__dict__"):
-                return {k: serialize(v) for k, v in obj.__dict__.items()}
-            if isinstance(obj, list):
-                return [serialize(item) for item in obj]
-            if isinstance(obj, dict):
-                return {k: serialize(v) for k, v in obj.items()}
-            return obj
-
-        return json.dumps(serialize(report), indent=2)
+        return _dump_json(report)
 
     def export_markdown(self, report: ImpactReport) -> str:
         """Export report to Markdown format."""
-        lines = [
-            f"# {report.title}",
-            "",
-            f"**Report ID:** {report.report_id}",
-            f"**Generated:** {report.generated_at.strftime('%Y-%m-%d %H:%M UTC')}",
-            f"**Severity:** {report.overall_severity}",
-            "",
-            "## Executive Summary",
-            "",
-            report.executive_summary,
-            "",
-            "## Timeline",
-            "",
-            f"- **Impact Start:** {report.timeline.impact_start.strftime('%Y-%m-%d')}",
-            f"- **Peak Impact:** {report.timeline.peak_impact.strftime('%Y-%m-%d')}",
-            f"- **Expected Resolution:** {report.timeline.expected_resolution.strftime('%Y-%m-%d')}",
-            f"- **Confidence:** {report.timeline.confidence:.0%}",
-            "",
-            "## Affected Products",
-            "",
-        ]
+        buf = io.StringIO()
+        write = buf.write
+        timeline = report.timeline
+        generated = report.generated_at
+
+        write(
+            f"# {report.title}\n"
+            "\n"
+            f"**Report ID:** {report.report_id}\n"
+            f"**Generated:** {_format_date(generated)} "
+            f"{generated.hour:02d}:{generated.minute:02d} UTC\n"
+            f"**Severity:** {report.overall_severity}\n"
+            "\n"
+            "## Executive Summary\n"
+            "\n"
+            f"{report.executive_summary}\n"
+            "\n"
+            "## Timeline\n"
+            "\n"
+            f"- **Impact Start:** {_format_date(timeline.impact_start)}\n"
+            f"- **Peak Impact:** {_format_date(timeline.peak_impact)}\n"
+            f"- **Expected Resolution:** {_format_date(timeline.expected_resolution)}\n"
+            f"- **Confidence:** {timeline.confidence:.0%}\n"
+            "\n"
+            "## Affected Products\n"
+            "\n"
+        )
 
         for p in report.affected_products:
-            lines.append(f"### {p.product_name}")
-            lines.append(f"- **ID:** {p.product_id}")
-            lines.append(f"- **Impact Severity:** {p.impact_severity}")
-            lines.append(f"- **Estimated Delay:** {p.estimated_delay_days} days")
-            lines.append(f"- **Revenue at Risk:** ${p.revenue_at_risk:,.2f}")
-            lines.append("")
-
-        lines.extend([
-            "## Mitigation Options",
-            "",
-        ])
+            write(
+                f"### {p.product_name}\n"
+                f"- **ID:** {p.product_id}\n"
+                f"- **Impact Severity:** {p.impact_severity}\n"
+                f"- **Estimated Delay:** {p.estimated_delay_days} days\n"
+                f"- **Revenue at Risk:** ${p.revenue_at_risk:,.2f}\n"
+                "\n"
+            )
+
+        write("## Mitigation Options\n\n")
 
         for m in report.mitigation_options:
-            lines.append(f"### {m.priority}. {m.title}")
-            lines.append(f"- **Description:** {m.description}")
-            lines.append(f"- **Cost:** {m.estimated_cost}")
-            lines.append(f"- **Time:** {m.time_to_implement}")
-            lines.append(f"- **Effectiveness:** {m.effectiveness:.0%}")
-            lines.append("")
-
-        lines.extend([
-            "## Recommendations",
-            "",
-        ])
+            write(
+                f"### {m.priority}. {m.title}\n"
+                f"- **Description:** {m.description}\n"
+                f"- **Cost:** {m.estimated_cost}\n"
+                f"- **Time:** {m.time_to_implement}\n"
+                f"- **Effectiveness:** {m.effectiveness:.0%}\n"
+                "\n"
+            )
+
+        # Recommendations close the report without a trailing newline
+        write("## Recommendations\n")
         for r in report.recommendations:
-            lines.append(f"- {r}")
+            write(f"\n- {r}")
 
-        return "\n".join(lines)
+        return buf.getvalue()
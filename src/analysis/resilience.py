@@ -5,9 +5,14 @@ Provides multi-level resilience calculations for components, products, and portf
 Implements redundancy-based scoring with historical tracking and trend analysis.
 """
 
+import ast
+import asyncio
+import json
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
-from typing import Any
+from typing import Any, TypeVar
 
 import structlog
 
@@ -16,10 +21,17 @@ from src.models import (
     ResilienceMetrics,
     HistoricalResilienceScore,
 )
-from src.graph.connection import get_connection
+from src.graph.connection import (
+    bump_graph_generation,
+    get_connection,
+    graph_generation,
+)
 
 logger = structlog.get_logger(__name__)
 
+# Model types held by the ResilienceScorer caches
+_Cached = TypeVar("_Cached", ResilienceScore, ResilienceMetrics)
+
 
 @dataclass
 class RedundancyInfo:
@@ -33,6 +45,64 @@ class RedundancyInfo:
     has_redundancy: bool
 
 
+def _parse_factors(raw: str | None) -> dict[str, float]:
+    """
+    Decode stored resilience factors.
+
+    Factors are stored as JSON. Rows written before that were stored as a
+    Python dict repr, which is read with ``ast.literal_eval`` (never
+    ``eval``) so stored strings cannot execute code.
+    """
+    if not raw:
+        return {}
+    try:
+        factors = json.loads(raw)
+    except (ValueError, RecursionError):
+        try:
+            factors = ast.literal_eval(raw)
+        except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+            factors = None
+    if not isinstance(factors, dict):
+        logger.warning("Unreadable resilience factors", factors=raw)
+        return {}
+    return factors
+
+
+def _aggregate_components(
+    component_scores: list[ResilienceScore],
+) -> tuple[float, int, int]:
+    """
+    Reduce component scores in a single pass.
+
+    Returns:
+        Tuple of (mean score, components with backup suppliers,
+        single points of failure).
+    """
+    if not component_scores:
+        return 0.0, 0, 0
+
+    with_redundancy = 0
+    single_points = 0
+    for s in component_scores:
+        if s.redundancy_factor > 0.5:
+            with_redundancy += 1
+        elif s.redundancy_factor < 0.4:
+            single_points += 1
+
+    mean_score = sum(s.score for s in component_scores) / len(component_scores)
+    return mean_score, with_redundancy, single_points
+
+
+def _empty_component_score(component_id: str) -> ResilienceScore:
+    """Zero score used when a component cannot be scored."""
+    return ResilienceScore(
+        entity_id=component_id,
+        entity_type="component",
+        score=0.0,
+        redundancy_factor=0.0,
+    )
+
+
 class ResilienceScorer:
     """
     Calculates multi-level resilience scores for supply chain entities.
@@ -54,15 +124,94 @@ class ResilienceScorer:
     MIN_REDUNDANCY_FOR_HIGH_SCORE = 3
     SINGLE_POINT_OF_FAILURE_PENALTY = 25
 
-    def __init__(self, connection=None):
+    # Redundancy factor by supplier count and diversity score by country
+    # count; the last entry is the 1.0 cap that larger counts clamp to
+    _REDUNDANCY_TIERS = (0.0, 0.3) + tuple(
+        min(1.0, 0.6 + (n - 2) * 0.1) for n in range(2, 7)
+    )
+    _DIVERSITY_TIERS = (0.0,) + tuple(
+        min(1.0, 0.4 + (n - 1) * 0.2) for n in range(1, 5)
+    )
+
+    # Maximum cached component and product scores
+    DEFAULT_CACHE_SIZE = 4096
+    # Seconds a cached score is served; bounds staleness from writes made
+    # by other processes, which do not bump this process's generation
+    DEFAULT_CACHE_TTL = 60.0
+
+    def __init__(
+        self,
+        connection=None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+    ):
         """
         Initialize the resilience scorer.
 
         Args:
             connection: Optional Neo4j connection. Uses global if not provided.
+            cache_size: Maximum number of cached scores before the least
+                recently used are evicted. 0 disables caching.
+            cache_ttl: Seconds a cached score stays valid.
         """
         self._connection = connection
-        self._history_cache: dict[str, list[HistoricalResilienceScore]] = {}
+        self._cache_size = cache_size
+        self._cache_ttl = cache_ttl
+        self._score_cache: OrderedDict[tuple[str, int], tuple[float, ResilienceScore]] = (
+            OrderedDict()
+        )
+        self._product_cache: OrderedDict[
+            tuple[str, int], tuple[float, ResilienceMetrics]
+        ] = OrderedDict()
+        self._portfolio_cache: OrderedDict[
+            tuple[str, int], tuple[float, ResilienceMetrics]
+        ] = OrderedDict()
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+    def _cache_get(
+        self,
+        cache: OrderedDict[tuple[str, int], tuple[float, _Cached]],
+        key: tuple[str, int],
+    ) -> _Cached | None:
+        """
+        Look up a cached score, refreshing its LRU position.
+
+        Returns a copy so callers cannot mutate the cached model.
+        """
+        entry = cache.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del cache[key]
+            self._cache_misses += 1
+            return None
+        cache.move_to_end(key)
+        self._cache_hits += 1
+        return entry[1].model_copy(deep=True)
+
+    def _cache_put(
+        self,
+        cache: OrderedDict[tuple[str, int], tuple[float, _Cached]],
+        key: tuple[str, int],
+        value: _Cached,
+    ) -> None:
+        """Store a copy of a score, evicting the least recently used past the limit."""
+        if self._cache_size <= 0:
+            return
+        cache[key] = (time.monotonic() + self._cache_ttl, value.model_copy(deep=True))
+        cache.move_to_end(key)
+        if len(cache) > self._cache_size:
+            cache.popitem(last=False)
+
+    def get_stats(self) -> dict[str, int]:
+        """Get score cache statistics."""
+        return {
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "component_entries": len(self._score_cache),
+            "product_entries": len(self._product_cache),
+            "generation": graph_generation(),
+        }
 
     def _get_connection(self):
         """Get the database connection."""
@@ -87,6 +236,11 @@ class ResilienceScorer:
         Returns:
             ResilienceScore for the component.
         """
+        cache_key = (component_id, graph_generation())
+        cached = self._cache_get(self._score_cache, cache_key)
+        if cached is not None:
+            return cached
+
         try:
             conn = self._get_connection()
 
@@ -109,86 +263,152 @@ class ResilienceScorer:
 
             if not results:
                 logger.warning("Component not found", component_id=component_id)
-                return ResilienceScore(
-                    entity_id=component_id,
-                    entity_type="component",
-                    score=0.0,
-                    redundancy_factor=0.0,
-                )
+                return _empty_component_score(component_id)
 
-            row = results[0]
-            suppliers = [s for s in row.get("suppliers", []) if s.get("supplier_id")]
-
-            # Calculate redundancy factor (0-1)
-            supplier_count = len(suppliers)
-            if supplier_count == 0:
-                redundancy_factor = 0.0
-            elif supplier_count == 1:
-                redundancy_factor = 0.3
-            elif supplier_count == 2:
-                redundancy_factor = 0.6
-            else:
-                redundancy_factor = min(1.0, 0.6 + (supplier_count - 2) * 0.1)
-
-            # Calculate geographic diversity (0-1)
-            unique_countries = set(
-                s.get("country") for s in suppliers if s.get("country")
-            )
-            if len(unique_countries) == 0:
-                diversity_score = 0.0
-            elif len(unique_countries) == 1:
-                diversity_score = 0.4
-            else:
-                diversity_score = min(1.0, 0.4 + (len(unique_countries) - 1) * 0.2)
-
-            # Calculate reliability from supplier risk scores (invert: low risk = high reliability)
-            avg_risk = 0.0
-            if suppliers:
-                risk_scores = [
-                    s.get("risk_score", 50) for s in suppliers if s.get("supplier_id")
-                ]
-                avg_risk = sum(risk_scores) / len(risk_scores) if risk_scores else 50
-            reliability_score = max(0, (100 - avg_risk)) / 100
-
-            # Calculate overall score
-            score = (
-                self.REDUNDANCY_WEIGHT * redundancy_factor * 100
-                + self.DIVERSITY_WEIGHT * diversity_score * 100
-                + self.RELIABILITY_WEIGHT * reliability_score * 100
-                + self.LEAD_TIME_WEIGHT * 75  # Default lead time buffer score
+            score = self._score_from_suppliers(
+                component_id, results[0].get("suppliers", [])
             )
+            self._cache_put(self._score_cache, cache_key, score)
+            return score
 
-            # Apply single point of failure penalty
-            if supplier_count <= 1:
-                score = max(0, score - self.SINGLE_POINT_OF_FAILURE_PENALTY)
-
-            logger.debug(
-                "Component resilience calculated",
+        except Exception as e:
+            logger.error(
+                "Failed to calculate component resilience",
                 component_id=component_id,
-                score=score,
-                redundancy_factor=redundancy_factor,
-                supplier_count=supplier_count,
+                error=str(e),
             )
+            return _empty_component_score(component_id)
 
-            return ResilienceScore(
-                entity_id=component_id,
-                entity_type="component",
-                score=score,
-                redundancy_factor=redundancy_factor,
-            )
+    def _score_from_suppliers(
+        self, component_id: str, suppliers: list[dict[str, Any]]
+    ) -> ResilienceScore:
+        """
+        Score a component from its supplier rows.
+
+        Args:
+            component_id: ID of the component being scored.
+            suppliers: Supplier maps as returned by the graph queries.
+
+        Returns:
+            ResilienceScore for the component.
+        """
+        suppliers = [s for s in suppliers if s.get("supplier_id")]
+
+        # Calculate redundancy factor (0-1)
+        supplier_count = len(suppliers)
+        redundancy_tiers = self._REDUNDANCY_TIERS
+        redundancy_factor = redundancy_tiers[
+            min(supplier_count, len(redundancy_tiers) - 1)
+        ]
+
+        # Calculate geographic diversity (0-1)
+        country_count = len({s["country"] for s in suppliers if s.get("country")})
+        diversity_tiers = self._DIVERSITY_TIERS
+        diversity_score = diversity_tiers[min(country_count, len(diversity_tiers) - 1)]
+
+        # Calculate reliability from supplier risk scores (invert: low risk = high reliability)
+        avg_risk = 0.0
+        if suppliers:
+            risk_scores = [s.get("risk_score", 50) for s in suppliers]
+            avg_risk = sum(risk_scores) / len(risk_scores)
+        reliability_score = max(0, (100 - avg_risk)) / 100
+
+        # Calculate overall score
+        score = (
+            self.REDUNDANCY_WEIGHT * redundancy_factor * 100
+            + self.DIVERSITY_WEIGHT * diversity_score * 100
+            + self.RELIABILITY_WEIGHT * reliability_score * 100
+            + self.LEAD_TIME_WEIGHT * 75  # Default lead time buffer score
+        )
+
+        # Apply single point of failure penalty
+        if supplier_count <= 1:
+            score = max(0, score - self.SINGLE_POINT_OF_FAILURE_PENALTY)
+
+        logger.debug(
+            "Component resilience calculated",
+            component_id=component_id,
+            score=score,
+            redundancy_factor=redundancy_factor,
+            supplier_count=supplier_count,
+        )
 
+        return ResilienceScore(
+            entity_id=component_id,
+            entity_type="component",
+            score=score,
+            redundancy_factor=redundancy_factor,
+        )
+
+    def _score_component_row(self, row: dict[str, Any]) -> ResilienceScore:
+        """Score one component row, falling back to zero on bad data."""
+        component_id = row["component_id"]
+        try:
+            return self._score_from_suppliers(component_id, row.get("suppliers", []))
         except Exception as e:
             logger.error(
                 "Failed to calculate component resilience",
                 component_id=component_id,
                 error=str(e),
             )
-            return ResilienceScore(
-                entity_id=component_id,
-                entity_type="component",
-                score=0.0,
-                redundancy_factor=0.0,
-            )
+            return _empty_component_score(component_id)
+
+    async def _fetch_product_supplier_matrix(
+        self, product_id: str
+    ) -> list[dict[str, Any]]:
+        """
+        Fetch every component of a product with its suppliers in one query.
+
+        Args:
+            product_id: ID of the product.
+
+        Returns:
+            One row per component with ``component_id`` and ``suppliers``.
+            A product without components yields a single row whose
+            ``component_id`` is None; an unknown product yields no rows.
+        """
+        conn = self._get_connection()
+
+        query = """
+        MATCH (p:Product {id: $product_id})
+        OPTIONAL MATCH (c:Component)-[:PART_OF]->(p)
+        OPTIONAL MATCH (s:Supplier)-[:SUPPLIES]->(c)
+        OPTIONAL MATCH (s)-[:LOCATED_IN]->(l:Location)
+        RETURN c.id as component_id,
+               collect(DISTINCT {
+                   supplier_id: s.id,
+                   supplier_name: s.name,
+                   location: l.name,
+                   country: l.country,
+                   risk_score: s.risk_score
+               }) as suppliers
+        ORDER BY component_id
+        """
+        return await conn.execute_query(query, {"product_id": product_id})
+
+    @staticmethod
+    def _product_metrics(
+        product_id: str, component_scores: list[ResilienceScore]
+    ) -> ResilienceMetrics:
+        """Aggregate component scores into product-level metrics."""
+        overall_score, with_redundancy, single_points = _aggregate_components(
+            component_scores
+        )
+
+        # Redundancy coverage: % of components with backup suppliers
+        if component_scores:
+            redundancy_coverage = with_redundancy / len(component_scores)
+        else:
+            redundancy_coverage = 0.0
+
+        return ResilienceMetrics(
+            entity_id=product_id,
+            level="product",
+            overall_score=overall_score,
+            component_scores=component_scores,
+            redundancy_coverage=redundancy_coverage,
+            single_points_of_failure=single_points,
+        )
 
     async def calculate_product_resilience(
         self, product_id: str
@@ -196,26 +416,25 @@ class ResilienceScorer:
         """
         Calculate resilience score for a product (aggregated from components).
 
+        Components and their suppliers are fetched in a single query rather
+        than one query per component.
+
         Args:
             product_id: ID of the product to score.
 
         Returns:
             ResilienceMetrics for the product with component breakdown.
         """
-        try:
-            conn = self._get_connection()
+        generation = graph_generation()
+        cache_key = (product_id, generation)
+        cached = self._cache_get(self._product_cache, cache_key)
+        if cached is not None:
+            return cached
 
-            # Get all components for the product
-            query = """
-            MATCH (p:Product {id: $product_id})
-            OPTIONAL MATCH (c:Component)-[:PART_OF]->(p)
-            RETURN p.id as product_id, 
-                   p.name as product_name,
-                   collect(DISTINCT c.id) as component_ids
-            """
-            results = await conn.execute_query(query, {"product_id": product_id})
+        try:
+            rows = await self._fetch_product_supplier_matrix(product_id)
 
-            if not results:
+            if not rows:
                 logger.warning("Product not found", product_id=product_id)
                 return ResilienceMetrics(
                     entity_id=product_id,
@@ -223,51 +442,29 @@ class ResilienceScorer:
                     overall_score=0.0,
                 )
 
-            row = results[0]
-            component_ids = [cid for cid in row.get("component_ids", []) if cid]
-
-            # Calculate resilience for each component
-            component_scores: list[ResilienceScore] = []
-            for comp_id in component_ids:
-                score = await self.calculate_component_resilience(comp_id)
-                component_scores.append(score)
-
-            # Calculate aggregate metrics
-            if component_scores:
-                total_score = sum(s.score for s in component_scores)
-                overall_score = total_score / len(component_scores)
-                
-                # Redundancy coverage: % of components with backup suppliers
-                with_redundancy = sum(
-                    1 for s in component_scores if s.redundancy_factor > 0.5
-                )
-                redundancy_coverage = with_redundancy / len(component_scores)
-                
-                # Count single points of failure
-                single_points = sum(
-                    1 for s in component_scores if s.redundancy_factor < 0.4
-                )
-            else:
-                overall_score = 0.0
-                redundancy_coverage = 0.0
-                single_points = 0
+            component_scores = [
+                self._score_component_row(row)
+                for row in rows
+                if row.get("component_id")
+            ]
+            metrics = self._product_metrics(product_id, component_scores)
 
             logger.info(
                 "Product resilience calculated",
                 product_id=product_id,
-                overall_score=overall_score,
+                overall_score=metrics.overall_score,
                 component_count=len(component_scores),
-                single_points=single_points,
+                single_points=metrics.single_points_of_failure,
             )
 
-            return ResilienceMetrics(
-                entity_id=product_id,
-                level="product",
-                overall_score=overall_score,
-                component_scores=component_scores,
-                redundancy_coverage=redundancy_coverage,
-                single_points_of_failure=single_points,
-            )
+            for component_score in component_scores:
+                self._cache_put(
+                    self._score_cache,
+                    (component_score.entity_id, generation),
+                    component_score,
+                )
+            self._cache_put(self._product_cache, cache_key, metrics)
+            return metrics
 
         except Exception as e:
             logger.error(
@@ -285,50 +482,77 @@ class ResilienceScorer:
         """
         Calculate portfolio-level resilience across all products.
 
+        Every product, component and supplier is fetched in a single query
+        and grouped by product in Python.
+
         Returns:
             ResilienceMetrics for the entire portfolio.
         """
+        cache_key = ("portfolio", graph_generation())
+        cached = self._cache_get(self._portfolio_cache, cache_key)
+        if cached is not None:
+            return cached
+
         try:
             conn = self._get_connection()
 
-            # Get all products
             query = """
             MATCH (p:Product)
-            RETURN collect(p.id) as product_ids
+            OPTIONAL MATCH (c:Component)-[:PART_OF]->(p)
+            OPTIONAL MATCH (s:Supplier)-[:SUPPLIES]->(c)
+            OPTIONAL MATCH (s)-[:LOCATED_IN]->(l:Location)
+            RETURN p.id as product_id,
+                   c.id as component_id,
+                   collect(DISTINCT {
+                       supplier_id: s.id,
+                       supplier_name: s.name,
+                       location: l.name,
+                       country: l.country,
+                       risk_score: s.risk_score
+                   }) as suppliers
+            ORDER BY product_id, component_id
             """
             results = await conn.execute_query(query)
 
-            if not results or not results[0].get("product_ids"):
+            # Group component scores by product, keeping products that have
+            # no components so they still count towards the average
+            scores_by_product: dict[str, list[ResilienceScore]] = {}
+            for row in results or []:
+                prod_id = row.get("product_id")
+                if prod_id is None:
+                    continue
+                component_scores = scores_by_product.setdefault(prod_id, [])
+                if row.get("component_id"):
+                    component_scores.append(self._score_component_row(row))
+
+            if not scores_by_product:
                 return ResilienceMetrics(
                     entity_id=None,
                     level="portfolio",
                     overall_score=0.0,
                 )
 
-            product_ids = results[0]["product_ids"]
-
             # Calculate resilience for each product
             all_component_scores: list[ResilienceScore] = []
+            total_with_redundancy = 0
             total_single_points = 0
             product_scores = []
 
-            for prod_id in product_ids:
-                metrics = await self.calculate_product_resilience(prod_id)
-                all_component_scores.extend(metrics.component_scores)
-                total_single_points += metrics.single_points_of_failure
-                product_scores.append(metrics.overall_score)
+            for component_scores in scores_by_product.values():
+                product_score, with_redundancy, single_points = (
+                    _aggregate_components(component_scores)
+                )
+                all_component_scores.extend(component_scores)
+                total_with_redundancy += with_redundancy
+                total_single_points += single_points
+                # Rounded as ResilienceMetrics rounds a product's overall score
+                product_scores.append(round(product_score, 2))
 
             # Calculate portfolio aggregate
-            if product_scores:
-                overall_score = sum(product_scores) / len(product_scores)
-            else:
-                overall_score = 0.0
+            overall_score = sum(product_scores) / len(product_scores)
 
             if all_component_scores:
-                with_redundancy = sum(
-                    1 for s in all_component_scores if s.redundancy_factor > 0.5
-                )
-                redundancy_coverage = with_redundancy / len(all_component_scores)
+                redundancy_coverage = total_with_redundancy / len(all_component_scores)
             else:
                 redundancy_coverage = 0.0
 
@@ -339,7 +563,7 @@ class ResilienceScorer:
                 total_single_points=total_single_points,
             )
 
-            return ResilienceMetrics(
+            portfolio = ResilienceMetrics(
                 entity_id=None,
                 level="portfolio",
                 overall_score=overall_score,
@@ -347,6 +571,10 @@ class ResilienceScorer:
                 redundancy_coverage=redundancy_coverage,
                 single_points_of_failure=total_single_points,
             )
+            # Only the current portfolio is worth keeping
+            self._portfolio_cache.clear()
+            self._cache_put(self._portfolio_cache, cache_key, portfolio)
+            return portfolio
 
         except Exception as e:
             logger.error(
@@ -421,7 +649,7 @@ class ResilienceHistoryTracker:
                 {
                     "entity_id": entity_id,
                     "score": score,
-                    "factors": str(factors or {}),
+                    "factors": json.dumps(factors or {}),
                 },
             )
 
@@ -473,7 +701,7 @@ class ResilienceHistoryTracker:
                     entity_id=row["entity_id"],
                     score=row["score"],
                     recorded_at=row.get("recorded_at", datetime.now(timezone.utc)),
-                    factors=eval(row.get("factors", "{}")),
+                    factors=_parse_factors(row.get("factors")),
                 )
                 for row in results
             ]
@@ -539,6 +767,10 @@ class ResilienceRecalculator:
     # SLA for recalculation (in seconds)
     RECALCULATION_SLA_SECONDS = 300  # 5 minutes
 
+    # Upper bound on recalculations in flight, to stay within the driver's
+    # session pool
+    MAX_CONCURRENT_RECALCULATIONS = 16
+
     def __init__(self, connection=None):
         """
         Initialize the recalculator.
@@ -566,30 +798,36 @@ class ResilienceRecalculator:
         start_time = datetime.now(timezone.utc)
         results: dict[str, ResilienceScore] = {}
 
+        # The triggering event changed the graph, so scores cached before it
+        # must not be served to this recalculation
+        bump_graph_generation()
+
         for entity_id in affected_entity_ids:
             self._pending_recalculations[entity_id] = start_time
 
-            try:
-                # Recalculate the score
-                new_score = await self._scorer.calculate_component_resilience(entity_id)
-                results[entity_id] = new_score
-
-                # Record the new score
-                await self._tracker.record_score(
-                    entity_id,
-                    new_score.score,
-                    {"redundancy_factor": new_score.redundancy_factor},
-                )
-
-                # Remove from pending
-                del self._pending_recalculations[entity_id]
+        # Entities are independent, so their database round-trips overlap
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_RECALCULATIONS)
+        outcomes = await asyncio.gather(
+            *(
+                self._recalculate_entity(entity_id, semaphore)
+                for entity_id in affected_entity_ids
+            ),
+            return_exceptions=True,
+        )
 
-            except Exception as e:
+        for entity_id, outcome in zip(affected_entity_ids, outcomes, strict=True):
+            if isinstance(outcome, BaseException):
                 logger.error(
                     "Recalculation failed",
                     entity_id=entity_id,
-                    error=str(e),
+                    error=str(outcome),
                 )
+                continue
+
+            results[entity_id] = outcome
+
+            # Remove from pending
+            self._pending_recalculations.pop(entity_id, None)
 
         # Check SLA compliance
         end_time = datetime.now(timezone.utc)
@@ -605,6 +843,23 @@ class ResilienceRecalculator:
 
         return results
 
+    async def _recalculate_entity(
+        self, entity_id: str, semaphore: asyncio.Semaphore
+    ) -> ResilienceScore:
+        """Recalculate and record one entity's score."""
+        async with semaphore:
+            # Recalculate the score
+            new_score = await self._scorer.calculate_component_resilience(entity_id)
+
+            # Record the new score
+            await self._tracker.record_score(
+                entity_id,
+                new_score.score,
+                {"redundancy_factor": new_score.redundancy_factor},
+            )
+
+        return new_score
+
     async def get_affected_entities_for_event(
         self, risk_event_location: str
     ) -> list[str]:
@@ -11,6 +11,8 @@ from src.graph.connection import (
     setup_schema,
     validate_schema,
     clear_database,
+    bump_graph_generation,
+    graph_generation,
 )
 from src.graph.repository import SupplyChainRepository
 from src.graph.traversal import (
@@ -38,6 +40,8 @@ __all__ = [
     "setup_schema",
     "validate_schema",
     "clear_database",
+    "bump_graph_generation",
+    "graph_generation",
     # Repository
     "SupplyChainRepository",
     # Traversal
@@ -17,6 +17,31 @@ from src.config import get_settings
 
 logger = structlog.get_logger(__name__)
 
+# Bumped on writes that change the supply chain structure so in-process
+# caches keyed by the generation (such as resilience scores) stop serving
+# results computed before it. Risk event and history writes do not bump it.
+_GRAPH_GENERATION = 0
+
+
+def graph_generation() -> int:
+    """Get the current supply chain graph generation."""
+    return _GRAPH_GENERATION
+
+
+def bump_graph_generation() -> int:
+    """
+    Mark the supply chain graph as changed.
+
+    Called by the structural write paths in this package; call it after
+    any other write that affects suppliers, components or products.
+
+    Returns:
+        The new graph generation.
+    """
+    global _GRAPH_GENERATION
+    _GRAPH_GENERATION += 1
+    return _GRAPH_GENERATION
+
 
 class Neo4jConnection:
     """
@@ -295,6 +320,7 @@ async def clear_database(connection: Neo4jConnection | None = None) -> dict[str,
     result = await connection.execute_write(
         "MATCH (n) DETACH DELETE n"
     )
+    bump_graph_generation()
 
     logger.info(
         "Database cleared",
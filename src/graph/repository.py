@@ -9,7 +9,11 @@ from typing import Any
 
 import structlog
 
-from src.graph.connection import Neo4jConnection, get_connection
+from src.graph.connection import (
+    Neo4jConnection,
+    bump_graph_generation,
+    get_connection,
+)
 from src.graph.queries import (
     create_supplier_query,
     create_component_query,
@@ -82,6 +86,7 @@ class SupplyChainRepository:
         conn = await self._get_connection()
         query, params = create_supplier_query(supplier)
         result = await conn.execute_query(query, params)
+        bump_graph_generation()
 
         logger.info("Created supplier", supplier_id=supplier.id, name=supplier.name)
         return result[0] if result else {}
@@ -91,6 +96,7 @@ class SupplyChainRepository:
         conn = await self._get_connection()
         query, params = create_component_query(component)
         result = await conn.execute_query(query, params)
+        bump_graph_generation()
 
         logger.info("Created component", component_id=component.id, name=component.name)
         return result[0] if result else {}
@@ -100,6 +106,7 @@ class SupplyChainRepository:
         conn = await self._get_connection()
         query, params = create_product_query(product)
         result = await conn.execute_query(query, params)
+        bump_graph_generation()
 
         logger.info("Created product", product_id=product.id, name=product.name)
         return result[0] if result else {}
@@ -109,6 +116,7 @@ class SupplyChainRepository:
         conn = await self._get_connection()
         query, params = create_location_query(location)
         result = await conn.execute_query(query, params)
+        bump_graph_generation()
 
         logger.info("Created location", location_id=location.id, name=location.name)
         return result[0] if result else {}
@@ -142,6 +150,7 @@ class SupplyChainRepository:
             supplier_id, component_id, priority
         )
         result = await conn.execute_query(query, params)
+        bump_graph_generation()
 
         logger.debug(
             "Linked supplier to component",
@@ -162,6 +171,7 @@ class SupplyChainRepository:
             component_id, product_id, quantity
         )
         result = await conn.execute_query(query, params)
+        bump_graph_generation()
 
         logger.debug(
             "Linked component to product",
@@ -179,6 +189,7 @@ class SupplyChainRepository:
         conn = await self._get_connection()
         query, params = create_supplier_located_in_query(supplier_id, location_id)
         result = await conn.execute_query(query, params)
+        bump_graph_generation()
 
         logger.debug(
             "Linked supplier to location",
@@ -199,6 +210,7 @@ class SupplyChainRepository:
             child_id, parent_id, quantity
         )
         result = await conn.execute_query(query, params)
+        bump_graph_generation()
 
         logger.debug(
             "Linked child component to parent",
@@ -339,6 +351,7 @@ class SupplyChainRepository:
             "MATCH (s:Supplier {id: $id}) DETACH DELETE s",
             {"id": supplier_id},
         )
+        bump_graph_generation()
         deleted = result["nodes_deleted"] > 0
         if deleted:
             logger.info("Deleted supplier", supplier_id=supplier_id)
@@ -351,4 +364,5 @@ class SupplyChainRepository:
             "MATCH (p:Product {id: $id}) DETACH DELETE p",
             {"id": product_id},
         )
+        bump_graph_generation()
         return result["nodes_deleted"] > 0
@@ -158,6 +158,57 @@ class TestQueryResponseTimePerformance:
         cache.invalidate(key)
         assert cache.get(key) is None
 
+    @given(
+        keys=st.lists(cache_key_strategy, min_size=1, max_size=30, unique=True),
+        prefix=st.text(alphabet="abcAB_", min_size=0, max_size=3),
+    )
+    @settings(max_examples=50)
+    def test_invalidate_pattern_removes_only_prefix_matches(
+        self,
+        keys: list[str],
+        prefix: str,
+    ):
+        """
+        Property: Pattern invalidation removes exactly the keys with the prefix.
+        """
+        cache: QueryCache[str] = QueryCache(max_size=100)
+
+        for key in keys:
+            cache.set(key, key)
+
+        expected = {k for k in keys if k.startswith(prefix)}
+        removed = cache.invalidate_pattern(prefix)
+
+        assert removed == len(expected)
+        for key in keys:
+            if key in expected:
+                assert cache.get(key) is None
+            else:
+                assert cache.get(key) == key
+
+    @given(
+        a=st.integers(),
+        b=st.integers(),
+    )
+    @settings(max_examples=30)
+    def test_cached_decorator_reuses_results(self, a: int, b: int):
+        """
+        Property: Cached functions run once per distinct argument binding.
+        """
+        cache: QueryCache[int] = QueryCache()
+        calls = []
+
+        @cached(cache, key_prefix="test")
+        def add(x, y=0):
+            calls.append((x, y))
+            return x + y
+
+        assert add(a, b) == a + b
+        assert add(a, y=b) == a + b
+        assert add(x=a, y=b) == a + b
+        assert len(calls) == 1
+        assert add.__name__ == "add"
+
     def test_cache_clear(self):
         """
         Property: Cache clear removes all entries.
@@ -200,6 +251,33 @@ class TestEventProcessingThroughput:
         
         assert result.processed + result.failed == len(items)
 
+    @given(
+        items=st.lists(st.integers(), min_size=1, max_size=50),
+        max_workers=st.integers(min_value=2, max_value=8),
+    )
+    @settings(max_examples=20)
+    def test_threaded_batch_accounts_for_failures(
+        self,
+        items: list[int],
+        max_workers: int,
+    ):
+        """
+        Property: Threaded batches report the same counts as sequential ones.
+        """
+        processor = BatchProcessor(max_workers=max_workers)
+
+        def odd_fails(item):
+            if item % 2:
+                raise ValueError(f"odd item {item}")
+            return item
+
+        result = processor.process_batch(items, odd_fails)
+        expected_failed = sum(1 for i in items if i % 2)
+
+        assert result.failed == expected_failed
+        assert result.processed == len(items) - expected_failed
+        assert len(result.errors) == expected_failed
+
     @given(items=st.lists(st.integers(), min_size=1, max_size=50))
     @settings(max_examples=30)
     def test_batch_result_has_valid_structure(self, items: list[int]):
@@ -245,6 +323,57 @@ class TestEventProcessingThroughput:
         
         assert result.items_per_second > 0
 
+    @given(
+        batch_size=st.integers(min_value=1, max_value=50),
+        cap_factor=st.integers(min_value=1, max_value=8),
+    )
+    @settings(max_examples=20)
+    def test_adaptive_batch_size_grows_to_cap(self, batch_size: int, cap_factor: int):
+        """
+        Property: Batch size grows toward the cap while below target rate.
+        """
+        cap = batch_size * cap_factor
+        processor = BatchProcessor(
+            batch_size=batch_size,
+            max_wait_seconds=60.0,
+            target_rate=float("inf"),
+            max_batch_size=cap,
+        )
+
+        for _ in range(cap_factor + 1):
+            processor.process_batch([1, 2, 3], lambda x: x)
+
+        assert processor.batch_size == cap
+
+    def test_adaptive_batch_size_shrinks_over_latency_budget(self):
+        """
+        Property: Batch size shrinks when batches exceed the wait budget.
+        """
+        processor = BatchProcessor(
+            batch_size=8,
+            max_wait_seconds=0.001,
+            max_batch_size=64,
+        )
+
+        processor.process_batch([1, 2], lambda x: time.sleep(0.002))
+
+        assert processor.batch_size == 4
+
+    def test_process_items_uses_adaptive_batch_size(self):
+        """
+        Property: process_items sizes each batch from the tuned batch size.
+        """
+        processor = BatchProcessor(
+            batch_size=2,
+            max_wait_seconds=60.0,
+            target_rate=float("inf"),
+            max_batch_size=8,
+        )
+
+        results = processor.process_items(list(range(30)), lambda x: x)
+
+        assert [r.processed for r in results] == [2, 4, 8, 8, 8]
+
     @given(target_rate=st.floats(min_value=1.0, max_value=1000.0, allow_nan=False))
     @settings(max_examples=20)
     def test_target_rate_tracking(self, target_rate: float):
@@ -428,6 +557,29 @@ class TestDataRetentionPolicyEnforcement:
         assert len(archived) == 1
         assert len(deleted) == 0
 
+    @given(age_days=st.lists(st.integers(min_value=0, max_value=60), min_size=1, max_size=20))
+    @settings(max_examples=30)
+    def test_retention_accepts_datetime_and_epoch_dates(self, age_days: list[int]):
+        """
+        Property: Datetime, epoch, and ISO dates are classified identically.
+        """
+        manager = RetentionManager()
+        manager.add_policy(RetentionPolicy(
+            data_type="events",
+            retention_period=RetentionPeriod.DAYS_30,
+        ))
+
+        now = datetime.now(timezone.utc)
+        dates = [now - timedelta(days=d, hours=1) for d in age_days]
+        expected_archived = sum(1 for d in age_days if d >= 30)
+
+        for to_field in (lambda d: d, lambda d: d.timestamp(), lambda d: d.isoformat()):
+            items = [{"id": str(i), "created_at": to_field(d)} for i, d in enumerate(dates)]
+            retained, archived, _ = manager.apply_retention("events", items)
+
+            assert len(archived) == expected_archived
+            assert len(retained) == len(items) - expected_archived
+
     def test_indefinite_retention_keeps_all(self):
         """
         Property: Indefinite retention keeps all items.
@@ -483,6 +635,55 @@ class TestHorizontalScalability:
         
         assert retrieved == value
 
+    @given(
+        max_entries=st.integers(min_value=1, max_value=10),
+        num_keys=st.integers(min_value=1, max_value=20),
+    )
+    @settings(max_examples=30)
+    def test_shared_state_is_bounded(self, max_entries: int, num_keys: int):
+        """
+        Property: Bounded shared state keeps only the most recent keys.
+        """
+        manager = ScalingManager(max_shared_state=max_entries)
+
+        for i in range(num_keys):
+            manager.set_shared_state(f"key-{i}", i)
+
+        kept = min(max_entries, num_keys)
+        for i in range(num_keys):
+            expected = i if i >= num_keys - kept else None
+            assert manager.get_shared_state(f"key-{i}") == expected
+
+    def test_weak_shared_state_released_with_value(self):
+        """
+        Property: Weak shared state disappears once the value is released.
+        """
+        class Payload:
+            pass
+
+        manager = ScalingManager()
+        payload = Payload()
+
+        manager.set_shared_state("payload", payload, weak=True)
+        assert manager.get_shared_state("payload") is payload
+
+        del payload
+        assert manager.get_shared_state("payload") is None
+
+    @pytest.mark.parametrize(
+        "value", [{"a": 1}, [1, 2], "text", 42, (1, 2)],
+    )
+    def test_weak_shared_state_keeps_builtins_strongly(self, value):
+        """
+        Property: Values that cannot be weakly referenced are stored strongly
+        instead of raising.
+        """
+        manager = ScalingManager()
+
+        manager.set_shared_state("value", value, weak=True)
+
+        assert manager.get_shared_state("value") == value
+
     def test_instance_list_includes_self(self):
         """
         Property: Instance is registered in instance list.
@@ -9,6 +9,7 @@ Tests the plugin functionality, verifying:
 - Property 48: Extension Backward Compatibility
 """
 
+import json
 from datetime import datetime, timezone
 from hypothesis import given, settings, assume, HealthCheck
 from hypothesis import strategies as st
@@ -32,6 +33,7 @@ from src.analysis.plugins import (
     RiskTypeRegistry,
     VersionManager,
     PluginManager,
+    _reset_ids,
 )
 
 
@@ -298,6 +300,84 @@ class TestCustomRiskTypeConfiguration:
         
         assert "custom-test" in matches
 
+    @given(
+        keyword_sets=st.lists(
+            st.lists(st.text(alphabet="abwA ", min_size=1, max_size=5), max_size=4),
+            min_size=1,
+            max_size=5,
+        ),
+        text=st.text(alphabet="abwAB ", max_size=40),
+    )
+    @settings(max_examples=100)
+    def test_keyword_matching_equals_substring_search(
+        self,
+        keyword_sets: list[list[str]],
+        text: str,
+    ):
+        """
+        Property: Keyword matching agrees with a per-keyword substring check.
+        """
+        registry = RiskTypeRegistry()
+        for type_id in list(registry._risk_types):
+            registry.unregister(type_id)
+
+        for i, keywords in enumerate(keyword_sets):
+            registry.register(CustomRiskType(
+                type_id=f"type-{i}",
+                name=f"Type {i}",
+                description="",
+                keywords=keywords,
+            ))
+
+        expected = {
+            f"type-{i}"
+            for i, keywords in enumerate(keyword_sets)
+            if any(kw.lower() in text.lower() for kw in keywords)
+        }
+
+        assert set(registry.match_text(text)) == expected
+
+    def test_extraction_patterns_match_overlapping_spans(self):
+        """
+        Property: Every type whose pattern matches is reported, even when
+        another type's pattern matches the same span.
+        """
+        registry = RiskTypeRegistry()
+        for type_id, patterns in [
+            ("port", [r"port\s+closed"]),
+            ("closure", [r"closed"]),
+            ("repeat", [r"(\w)\1"]),
+        ]:
+            registry.register(CustomRiskType(
+                type_id=type_id,
+                name=type_id,
+                description="",
+                extraction_patterns=patterns,
+            ))
+
+        assert {"port", "closure"} <= set(registry.match_text("Port  CLOSED today"))
+        assert "repeat" in registry.match_text("the ferry")
+        assert not {"port", "closure", "repeat"} & set(registry.match_text("open"))
+
+    def test_conditional_group_patterns_match_outside_the_union(self):
+        """
+        Property: A pattern with a conditional group reference matches as it
+        would on its own, even when another type's pattern comes first.
+        """
+        registry = RiskTypeRegistry()
+        for type_id, patterns in [
+            ("first", [r"zzz"]),
+            ("tag", [r"(<)?\w+(?(1)>|$)"]),
+        ]:
+            registry.register(CustomRiskType(
+                type_id=type_id,
+                name=type_id,
+                description="",
+                extraction_patterns=patterns,
+            ))
+
+        assert "tag" in registry.match_text("<hello>!")
+
     def test_risk_type_unregistration(self):
         """
         Property: Risk types can be unregistered.
@@ -400,6 +480,47 @@ class TestBidirectionalIntegrationAPIs:
         # Events should be cleared after retrieval
         assert len(plugin.get_pending_outbound_events()) == 0
 
+    @given(count=st.integers(min_value=1, max_value=50))
+    @settings(max_examples=20)
+    def test_outbound_event_ids_are_unique(self, count: int):
+        """
+        Property: Outbound events always get distinct IDs.
+        """
+        plugin = TestIntegrationPluginImpl()
+        
+        events = [plugin.send_outbound_event("tick", {}) for _ in range(count)]
+        
+        assert len({event.event_id for event in events}) == count
+
+    def test_event_ids_do_not_repeat_after_restart(self):
+        """
+        Property: A restarted process, whose counter starts over, does not
+        reissue IDs from before the restart.
+        """
+        plugin = TestIntegrationPluginImpl()
+
+        before = plugin.send_outbound_event("tick", {}).event_id
+        _reset_ids()
+        after = plugin.send_outbound_event("tick", {}).event_id
+
+        assert before != after
+
+    def test_pending_outbound_events_are_bounded(self):
+        """
+        Property: A full outbound queue drops its oldest events and counts
+        them instead of growing without bound.
+        """
+        class SmallQueuePlugin(TestIntegrationPluginImpl):
+            MAX_PENDING_OUTBOUND_EVENTS = 3
+
+        plugin = SmallQueuePlugin()
+
+        events = [plugin.send_outbound_event("tick", {"n": n}) for n in range(5)]
+
+        assert plugin.dropped_outbound_events == 2
+        assert plugin.get_pending_outbound_events() == events[2:]
+        assert plugin.get_pending_outbound_events() == []
+
     def test_event_bus_subscription(self):
         """
         Property: Event bus delivers events to subscribers.
@@ -426,6 +547,88 @@ class TestBidirectionalIntegrationAPIs:
         
         assert len(received_events) == 1
 
+    def test_trusted_handlers_run_after_guarded_failures(self):
+        """
+        Property: Trusted handlers still run when a guarded handler raises.
+        """
+        plugin = TestIntegrationPluginImpl()
+        calls = []
+
+        def failing(event: IntegrationEvent):
+            raise RuntimeError("boom")
+
+        plugin.register_event_handler("evt", failing)
+        plugin.register_event_handler("fast", calls.append, trusted=True)
+        plugin.register_event_handler("evt", calls.append, trusted=True)
+
+        event = IntegrationEvent(
+            event_id="evt-1",
+            event_type="evt",
+            source="system",
+            target=plugin.metadata.id,
+            payload={},
+            timestamp=datetime.now(timezone.utc),
+        )
+
+        assert plugin.handle_inbound_event(event) is True
+        assert calls == [event]
+        assert set(plugin.get_supported_event_types()) == {"evt", "fast"}
+
+    def test_handlers_share_the_published_payload(self):
+        """
+        Property: Handlers receive the published payload itself, so writes
+        by one handler reach the handlers after it.
+        """
+        manager = PluginManager()
+        seen = []
+
+        def writer(event: IntegrationEvent):
+            event.payload["status"] = "triaged"
+
+        def reader(event: IntegrationEvent):
+            seen.append((event.payload is payload, event.payload["status"]))
+
+        manager.subscribe_to_events(writer)
+        manager.subscribe_to_events(reader, trusted=True)
+
+        payload = {"status": "open", "region": "apac"}
+        event = IntegrationEvent(
+            event_id="evt-1",
+            event_type="evt",
+            source="system",
+            target="system",
+            payload=payload,
+            timestamp=datetime.now(timezone.utc),
+        )
+        manager.publish_event(event)
+
+        assert seen == [(True, "triaged")]
+        assert event.payload is payload
+
+    def test_handlers_receive_plain_dict_payloads(self):
+        """
+        Property: Handlers get a real dict payload they can serialize.
+        """
+        manager = PluginManager()
+        results = []
+
+        def serializer(event: IntegrationEvent):
+            results.append(
+                (isinstance(event.payload, dict), json.dumps(event.payload))
+            )
+
+        manager.subscribe_to_events(serializer)
+        manager.publish_event(IntegrationEvent(
+            event_id="evt-1",
+            event_type="evt",
+            source="system",
+            target="system",
+            payload={"status": "open"},
+            timestamp=datetime.now(timezone.utc),
+        ))
+
+        assert results == [(True, '{"status": "open"}')]
+
     def test_supported_event_types(self):
         """
         Property: Integration plugins report supported event types.
@@ -440,6 +643,23 @@ class TestBidirectionalIntegrationAPIs:
         assert "type_a" in types
         assert "type_b" in types
 
+    def test_supported_event_types_keep_registration_order(self):
+        """
+        Property: Supported event types are reported in registration order,
+        with trusted-only types after the guarded ones.
+        """
+        plugin = TestIntegrationPluginImpl()
+        names = [f"type_{i}" for i in range(20)]
+
+        for name in reversed(names[:10]):
+            plugin.register_event_handler(name, lambda e: None)
+        plugin.register_event_handler(names[10], lambda e: None, trusted=True)
+        plugin.register_event_handler(names[0], lambda e: None, trusted=True)
+
+        assert plugin.get_supported_event_types() == (
+            tuple(reversed(names[:10])) + (names[10],)
+        )
+
 
 # =============================================================================
 # Property 47: Custom DSPy Module Support
@@ -539,6 +759,18 @@ class TestExtensionBackwardCompatibility:
         assert version.minor == minor
         assert version.patch == patch
 
+    @given(
+        a=st.tuples(version_component_strategy, version_component_strategy, version_component_strategy),
+        b=st.tuples(version_component_strategy, version_component_strategy, version_component_strategy),
+    )
+    @settings(max_examples=30)
+    def test_version_ordering_matches_tuples(self, a: tuple, b: tuple):
+        """
+        Property: Versions order like their (major, minor, patch) tuples.
+        """
+        assert (PluginVersion(*a) < PluginVersion(*b)) == (a < b)
+        assert PluginVersion(*a, prerelease="rc1") < PluginVersion(*a)
+
     def test_version_compatibility(self):
         """
         Property: Same major versions are compatible.
@@ -682,6 +914,113 @@ class TestPluginIntegration:
         assert result is True
         assert manager.get_plugin(plugin.metadata.id) is None
 
+    def test_plugin_deactivating_mid_run_does_not_skip_others(self):
+        """
+        Property: A plugin that deactivates itself during a run does not
+        stop the next one from running, and plugins run in registration
+        order whatever order they were activated in.
+        """
+        manager = PluginManager()
+        ran = []
+
+        class SelfDisablingAnalysisPlugin(TestAnalysisPluginImpl):
+            def analyze(self, data: dict[str, Any]) -> dict[str, Any]:
+                ran.append(self.metadata.id)
+                if self.metadata.id == "a":
+                    manager.deactivate_plugin("a")
+                return {}
+
+        for plugin_id in ["a", "b", "c"]:
+            manager.register_plugin(SelfDisablingAnalysisPlugin(plugin_id))
+        for plugin_id in ["c", "a", "b"]:
+            manager.activate_plugin(plugin_id)
+
+        results = manager.run_analysis_plugins({})
+
+        assert ran == ["a", "b", "c"]
+        assert [r["plugin_id"] for r in results] == ["a", "b", "c"]
+
+    def test_reregistering_an_id_replaces_the_plugin(self):
+        """
+        Property: Registering a plugin ID again replaces the old instance in
+        the typed indexes instead of keeping both.
+        """
+        manager = PluginManager()
+        old = TestSourcePluginImpl("src-1")
+        manager.register_plugin(old)
+        manager.activate_plugin("src-1")
+
+        new = TestSourcePluginImpl("src-1")
+        new._data = [{"id": "item-2", "content": "Replacement"}]
+        assert manager.register_plugin(new) is True
+        manager.activate_plugin("src-1")
+
+        assert manager.get_plugin("src-1") is new
+        assert manager.get_plugins_by_type(PluginType.SOURCE) == [new]
+        assert old.state is not PluginState.ACTIVE
+        assert [item["id"] for item in manager.collect_source_data()] == ["item-2"]
+
+        # The same instance can be registered again as well
+        assert manager.register_plugin(new) is True
+        assert manager.get_plugins_by_type(PluginType.SOURCE) == [new]
+
+    def test_failed_replacement_keeps_the_registered_plugin(self):
+        """
+        Property: A replacement that fails to initialize leaves the plugin
+        already registered under that ID in place and active.
+        """
+        class FailingSourcePlugin(TestSourcePluginImpl):
+            def _on_initialize(self) -> None:
+                raise RuntimeError("init failed")
+
+        manager = PluginManager()
+        old = TestSourcePluginImpl("src-1")
+        manager.register_plugin(old)
+        manager.activate_plugin("src-1")
+
+        assert manager.register_plugin(FailingSourcePlugin("src-1")) is False
+
+        assert manager.get_plugin("src-1") is old
+        assert manager.get_plugins_by_type(PluginType.SOURCE) == [old]
+        assert old.state is PluginState.ACTIVE
+
+    def test_mismatched_plugin_type_is_rejected(self):
+        """
+        Property: A plugin whose class does not match its declared type is
+        not registered.
+        """
+        class MislabeledPlugin(TestAnalysisPluginImpl):
+            @property
+            def metadata(self) -> PluginMetadata:
+                return PluginMetadata(
+                    id="mislabeled",
+                    name="Mislabeled",
+                    version=PluginVersion(1, 0, 0),
+                    plugin_type=PluginType.SOURCE,
+                )
+
+        manager = PluginManager()
+
+        assert manager.register_plugin(MislabeledPlugin()) is False
+        assert manager.get_plugin("mislabeled") is None
+        assert manager.collect_source_data() == []
+
+    def test_plugin_snapshot_tracks_registration(self):
+        """
+        Property: The cached plugin tuple is reused until registration changes.
+        """
+        manager = PluginManager()
+
+        plugin = TestSourcePluginImpl()
+        manager.register_plugin(plugin)
+
+        snapshot = manager.get_all_plugins()
+        assert snapshot == (plugin,)
+        assert manager.get_all_plugins() is snapshot
+
+        manager.unregister_plugin(plugin.metadata.id)
+        assert manager.get_all_plugins() == ()
+
     def test_activation_deactivation(self):
         """
         Property: Plugins can be activated and deactivated.
@@ -701,3 +1040,125 @@ class TestPluginIntegration:
         # Deactivate
         manager.deactivate_plugin(plugin.metadata.id)
         assert plugin.state == PluginState.DISABLED
+
+    def test_default_metadata_is_stable(self):
+        """
+        Property: Default plugin metadata keeps the same ID across accesses.
+        """
+        class DefaultSourcePlugin(SourcePlugin):
+            def fetch_data(self) -> list[dict[str, Any]]:
+                return []
+
+            def get_source_info(self) -> dict[str, Any]:
+                return {}
+
+        manager = PluginManager()
+        plugin = DefaultSourcePlugin()
+        plugin_id = plugin.metadata.id
+
+        assert plugin.metadata.id == plugin_id
+        assert manager.register_plugin(plugin) is True
+        assert manager.get_plugin(plugin_id) is plugin
+        assert manager.activate_plugin(plugin_id) is True
+
+    @given(actions=st.lists(st.sampled_from(["activate", "deactivate", "unregister"]), max_size=12))
+    @settings(max_examples=30)
+    def test_status_report_counts_track_transitions(self, actions: list[str]):
+        """
+        Property: Status report counts match the plugins' actual states.
+        """
+        manager = PluginManager()
+        plugins = [TestSourcePluginImpl(f"src-{i}") for i in range(3)]
+        for plugin in plugins:
+            manager.register_plugin(plugin)
+
+        for i, action in enumerate(actions):
+            plugin = plugins[i % len(plugins)]
+            if action == "activate":
+                plugin.activate()  # Direct transitions are tracked too
+            elif action == "deactivate":
+                manager.deactivate_plugin(plugin.metadata.id)
+            else:
+                manager.unregister_plugin(plugin.metadata.id)
+
+        registered = manager.get_all_plugins()
+        report = manager.get_status_report()
+
+        assert report["by_type"][PluginType.SOURCE.value] == len(registered)
+        for state in PluginState:
+            expected = sum(1 for p in registered if p.state == state)
+            assert report["by_state"][state.value] == expected
+        assert {row["id"]: row["state"] for row in report["plugins"]} == {
+            p.metadata.id: p.state.value for p in registered
+        }
+
+        active = sum(1 for p in registered if p.state == PluginState.ACTIVE)
+        assert len(manager.collect_source_data()) == active
+
+    def test_status_report_counts_survive_reregistration(self):
+        """
+        Property: Registering an ID twice and then unregistering it leaves
+        every status count at zero.
+        """
+        manager = PluginManager()
+        manager.register_plugin(TestSourcePluginImpl("src-1"))
+        manager.register_plugin(TestSourcePluginImpl("src-1"))
+
+        report = manager.get_status_report()
+        assert report["total_plugins"] == 1
+        assert report["by_type"][PluginType.SOURCE.value] == 1
+        assert report["by_state"][PluginState.INITIALIZED.value] == 1
+
+        manager.unregister_plugin("src-1")
+
+        report = manager.get_status_report()
+        assert report["total_plugins"] == 0
+        assert not any(report["by_type"].values())
+        assert not any(report["by_state"].values())
+        assert report["plugins"] == []
+
+    def test_pending_plugins_can_be_unregistered_and_not_shadow_loaded_ones(self):
+        """
+        Property: Metadata registration is refused for an ID already loaded,
+        and a pending registration can be unregistered before it loads.
+        """
+        manager = PluginManager()
+        manager.register_plugin(TestSourcePluginImpl("src-1"))
+        metadata = TestSourcePluginImpl("src-1").metadata
+        entry_point = f"{__name__}:TestSourcePluginImpl"
+
+        assert manager.register_metadata(entry_point, metadata) is False
+
+        pending = TestSourcePluginImpl("src-2").metadata
+        assert manager.register_metadata(entry_point, pending) is True
+        assert manager.unregister_plugin("src-2") is True
+        assert manager.get_status_report()["pending_plugins"] == []
+        assert manager.activate_plugin("src-2") is False
+
+    def test_indexed_plugin_loads_on_first_activation(self, tmp_path):
+        """
+        Property: Indexed plugins are imported only when first activated.
+        """
+        (tmp_path / PluginManager.PLUGIN_INDEX_FILE).write_text(json.dumps([
+            {
+                "entry_point": f"{__name__}:TestSourcePluginImpl",
+                "metadata": {
+                    "id": "test-source",
+                    "name": "Test Source",
+                    "version": "1.2.0",
+                    "plugin_type": "source",
+                },
+            },
+        ]))
+
+        manager = PluginManager(plugin_dir=tmp_path)
+
+        assert manager.get_plugin("test-source") is None
+        assert manager.get_status_report()["pending_plugins"] == ["test-source"]
+        assert manager.activate_plugin("test-source") is True
+        assert manager.get_status_report()["pending_plugins"] == []
+
+        plugin = manager.get_plugin("test-source")
+        assert plugin is not None
+        assert plugin.state == PluginState.ACTIVE
+        assert len(manager.collect_source_data()) == 1
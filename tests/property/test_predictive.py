@@ -10,11 +10,12 @@ Tests the predictive analytics functionality, verifying:
 """
 
 from datetime import datetime, timezone, timedelta
+from unittest.mock import AsyncMock, Mock, patch
 from hypothesis import given, settings, assume, HealthCheck
 from hypothesis import strategies as st
 import pytest
 
-from src.models import EventType, SeverityLevel
+from src.models import EventType, RiskEvent, SeverityLevel
 from src.analysis.predictive import (
     TrendDirection,
     WarningLevel,
@@ -26,8 +27,11 @@ from src.analysis.predictive import (
     PredictiveAlert,
     PatternAnalyzer,
     EarlyWarningDetector,
+    RiskForecaster,
+    RiskEventBatch,
     ProactiveAlertGenerator,
     ForecastAccuracyTracker,
+    _score_sentiment,
 )
 
 
@@ -214,6 +218,138 @@ class TestHistoricalPatternIdentification:
         
         assert pattern.frequency_per_year > 0
 
+    @given(
+        dates=st.lists(
+            st.datetimes(
+                min_value=datetime(2000, 1, 1),
+                max_value=datetime(2030, 12, 31),
+                timezones=st.just(timezone.utc),
+            ),
+            min_size=3,
+            max_size=40,
+        ),
+        as_string=st.booleans(),
+    )
+    @settings(max_examples=50)
+    def test_seasonal_peaks_match_month_counts(
+        self, dates: list[datetime], as_string: bool
+    ):
+        """
+        Property: Peak months are those with over 1.5x the average monthly
+        count, whether timestamps arrive as datetimes or ISO strings.
+        """
+        events = [
+            {
+                "detected_at": d.isoformat().replace("+00:00", "Z") if as_string else d,
+                "severity": "High",
+            }
+            for d in dates
+        ]
+        counts = {m: sum(1 for d in dates if d.month == m) for m in range(1, 13)}
+        expected = [m for m in range(1, 13) if counts[m] > len(dates) / 12 * 1.5]
+
+        pattern = PatternAnalyzer()._detect_seasonal_pattern(
+            "Test Location", EventType.WEATHER.value, events
+        )
+
+        if expected:
+            assert pattern.peak_months == expected
+            assert pattern.avg_severity == 3.0
+        else:
+            assert pattern is None
+
+    def test_recurring_pattern_parses_utc_suffix(self):
+        """
+        Property: Recurring patterns read "Z"-suffixed ISO dates as UTC.
+        """
+        pattern = PatternAnalyzer()._create_risk_pattern(
+            "Busan",
+            EventType.STRIKE.value,
+            3,
+            ["High", "High", "Low"],
+            [
+                "2024-01-05T08:00:00Z",
+                datetime(2024, 3, 1, tzinfo=timezone.utc),
+                "2024-06-30T23:59:59.5Z",
+                None,
+            ],
+        )
+
+        assert pattern.event_type == EventType.STRIKE
+        assert pattern.last_occurrence == datetime(
+            2024, 6, 30, 23, 59, 59, 500000, tzinfo=timezone.utc
+        )
+
+    async def test_seasonal_analysis_from_monthly_aggregates(self):
+        """
+        Property: Patterns built from per-group database histograms match
+        those built from the equivalent raw events.
+        """
+        rows = [
+            {"location": "Taiwan", "event_type": "Weather", "total": 8,
+             "severity_sum": 19, "histogram": [
+                 {"month": 8, "count": 5},
+                 {"month": 9, "count": 2},
+                 {"month": None, "count": 1},
+             ]},
+            {"location": "Chile", "event_type": "Strike", "total": 2,
+             "severity_sum": 4, "histogram": [{"month": 3, "count": 2}]},
+        ]
+        connection = Mock(execute_query=AsyncMock(return_value=rows))
+        analyzer = PatternAnalyzer(connection)
+
+        patterns = await analyzer.analyze_seasonal_patterns()
+
+        severities = ["High", "Critical", "High", None, None, "Low", "Medium", None]
+        months = [8, 8, 8, 8, 8, 9, 9, None]
+        events = [
+            {"detected_at": f"2024-{m:02d}-15T00:00:00Z" if m else None, "severity": sev}
+            for m, sev in zip(months, severities, strict=True)
+        ]
+        expected = analyzer._detect_seasonal_pattern("Taiwan", "Weather", events)
+
+        assert patterns == [expected]
+
+    @given(
+        offsets=st.lists(
+            st.floats(min_value=0, max_value=720, allow_nan=False),
+            min_size=2,
+            max_size=30,
+        )
+    )
+    @settings(max_examples=50)
+    def test_frequency_metrics_average_whole_day_gaps(self, offsets: list[float]):
+        """
+        Property: The average gap is the mean of whole-day gaps between
+        consecutive events, regardless of input order.
+        """
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        events = [
+            RiskEvent(
+                id=f"risk-{i}",
+                title="Port closure",
+                source="test_source",
+                source_url="https://example.com/risk",
+                event_type=EventType.WEATHER,
+                severity=SeverityLevel.MEDIUM,
+                location="Test Location",
+                description="Storm closes the port",
+                confidence=0.5,
+                detected_at=start + timedelta(days=offset),
+            )
+            for i, offset in enumerate(offsets)
+        ]
+        dates = sorted(e.detected_at for e in events)
+        gaps = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
+
+        metrics = PatternAnalyzer().calculate_frequency_metrics(events)
+
+        assert metrics["total_events"] == len(events)
+        assert metrics["avg_days_between"] == pytest.approx(sum(gaps) / len(gaps))
+        assert PatternAnalyzer().calculate_frequency_metrics(
+            RiskEventBatch.from_events(events)
+        ) == metrics
+
 
 # =============================================================================
 # Property 40: Early Warning Signal Detection
@@ -282,6 +418,111 @@ class TestEarlyWarningSignalDetection:
         """
         assert len(warning.recommended_actions) >= 1
 
+    def test_escalation_batch_shares_one_timestamp(self):
+        """
+        Property: Warnings from one batch share their detection time and
+        expire seven days after it.
+        """
+        events = [
+            RiskEvent(
+                id=f"risk-{i}",
+                title="Port closure",
+                source="test_source",
+                source_url="https://example.com/risk",
+                event_type=EventType.STRIKE,
+                severity=SeverityLevel.HIGH,
+                location=location,
+                description="Workers walk out at the port",
+                confidence=0.8,
+            )
+            for i, location in enumerate(["Busan", "Busan", "Rotterdam", "Rotterdam"])
+        ]
+
+        warnings = EarlyWarningDetector().detect_escalating_signals(events, 1.0)
+
+        assert {w.location for w in warnings} == {"Busan", "Rotterdam"}
+        assert len({w.detected_at for w in warnings}) == 1
+        assert len({w.warning_id for w in warnings}) == len(warnings)
+        for warning in warnings:
+            assert warning.expires_at - warning.detected_at == timedelta(days=7)
+
+        batch_warnings = EarlyWarningDetector().detect_escalating_signals(
+            RiskEventBatch.from_events(events), 1.0
+        )
+        assert [(w.location, w.event_type, w.warning_level) for w in batch_warnings] == [
+            (w.location, w.event_type, w.warning_level) for w in warnings
+        ]
+
+    def test_expired_warnings_are_dropped(self):
+        """
+        Property: Warnings stay active until they expire and are dropped after.
+        """
+        events = [
+            RiskEvent(
+                id=f"risk-{i}",
+                title="Port closure",
+                source="test_source",
+                source_url="https://example.com/risk",
+                event_type=EventType.STRIKE,
+                severity=SeverityLevel.HIGH,
+                location="Busan",
+                description="Workers walk out at the port",
+                confidence=0.8,
+            )
+            for i in range(3)
+        ]
+        detector = EarlyWarningDetector()
+        warnings = detector.detect_escalating_signals(events, 1.0)
+
+        assert detector.get_active_warnings() == warnings
+
+        class _NextWeek(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return datetime.now(tz) + timedelta(days=8)
+
+        with patch("src.analysis.predictive.datetime", _NextWeek):
+            assert detector.get_active_warnings() == []
+
+    @given(
+        count=st.integers(min_value=1, max_value=12),
+        baseline=st.floats(min_value=0.5, max_value=10.0, allow_nan=False),
+    )
+    @settings(max_examples=50)
+    def test_warning_level_is_highest_threshold_reached(
+        self, count: int, baseline: float
+    ):
+        """
+        Property: The warning level is the highest one whose threshold the
+        signal strength reaches.
+        """
+        events = [
+            RiskEvent(
+                id=f"risk-{i}",
+                title="Port closure",
+                source="test_source",
+                source_url="https://example.com/risk",
+                event_type=EventType.STRIKE,
+                severity=SeverityLevel.HIGH,
+                location="Busan",
+                description="Workers walk out at the port",
+                confidence=0.8,
+            )
+            for i in range(count)
+        ]
+        strength = min(1.0, count / baseline / 3)
+        reached = [
+            level for level, threshold in EarlyWarningDetector.THRESHOLDS.items()
+            if strength >= threshold
+        ]
+
+        warnings = EarlyWarningDetector().detect_escalating_signals(events, baseline)
+
+        if reached:
+            assert [w.warning_level for w in warnings] == [reached[-1]]
+        else:
+            assert warnings == []
+
     def test_sentiment_analyzer_returns_valid_range(self):
         """
         Property: Sentiment analyzer always returns value in [-1, 1].
@@ -300,6 +541,41 @@ class TestEarlyWarningSignalDetection:
             score = detector.analyze_sentiment(text)
             assert -1.0 <= score <= 1.0
 
+    @given(words=st.lists(
+        st.sampled_from([
+            "Crisis", "strike", "STRIKES", "delay", "halted", "recovery",
+            "stable", "growth", "port", "news", "reopening",
+        ]),
+        max_size=12,
+    ))
+    @settings(max_examples=100)
+    def test_sentiment_matches_keyword_counts(self, words: list[str]):
+        """
+        Property: Sentiment is net polarity over distinct keywords present.
+        """
+        text = " ".join(words).lower()
+        negative = ["crisis", "strike", "delay", "halt"]
+        positive = ["recovery", "stable", "growth", "reopening"]
+        neg = sum(1 for kw in negative if kw in text)
+        pos = sum(1 for kw in positive if kw in text)
+        expected = (pos - neg) / (pos + neg) if pos + neg else 0.0
+
+        assert EarlyWarningDetector().analyze_sentiment(" ".join(words)) == expected
+
+    def test_repeated_sentiment_text_is_scored_once(self):
+        """
+        Property: Scoring the same text again reuses the cached result.
+        """
+        _score_sentiment.cache_clear()
+        detector = EarlyWarningDetector()
+        text = "Port strike causes shipping delay"
+
+        first = detector.analyze_sentiment(text)
+        assert EarlyWarningDetector().analyze_sentiment(text) == first
+        assert _score_sentiment.cache_info().hits == 1
+        assert detector.analyze_sentiment("") == 0.0
+        assert _score_sentiment.cache_info().currsize == 1
+
 
 # =============================================================================
 # Property 41: Risk Forecast Output Format
@@ -369,6 +645,64 @@ class TestRiskForecastOutputFormat:
         # The probability should be within or very close to the interval
         assert lower <= probability <= upper or abs(probability - lower) < 0.01 or abs(probability - upper) < 0.01
 
+    async def test_forecasts_fetch_affected_entities_in_one_query(self):
+        """
+        Property: Affected entities for all forecast locations come from a
+        single database query.
+        """
+        connection = Mock(execute_query=AsyncMock(return_value=[
+            {"location": "Busan", "affected": ["sup-1", None, "comp-1"]},
+        ]))
+        patterns = [
+            RiskPattern(
+                pattern_id=f"pattern-{location}-{i}",
+                location=location,
+                event_type=EventType.STRIKE,
+                frequency_per_year=50.0,
+                avg_duration_days=7.0,
+                severity_distribution={SeverityLevel.HIGH: 1.0},
+                last_occurrence=None,
+                trend=TrendDirection.STABLE,
+                confidence=1.0,
+            )
+            for i, location in enumerate(["Busan", "Busan", "Rotterdam"])
+        ]
+
+        forecasts = await RiskForecaster(connection).generate_forecasts(patterns)
+
+        assert connection.execute_query.await_count == 1
+        assert [f.affected_entities for f in forecasts] == [
+            ["sup-1", "comp-1"], ["sup-1", "comp-1"], [],
+        ]
+
+        # Forecasts for the same location do not share one list
+        forecasts[0].affected_entities.append("prod-1")
+        assert forecasts[1].affected_entities == ["sup-1", "comp-1"]
+
+    @given(frequency=st.floats(min_value=1e-12, max_value=1e-9, allow_nan=False))
+    @settings(max_examples=50)
+    def test_rare_pattern_probability_is_accurate(self, frequency: float):
+        """
+        Property: For rare patterns P(at least one event) tracks the expected
+        event count without cancellation error.
+        """
+        pattern = RiskPattern(
+            pattern_id="rare-pattern",
+            location="Test Location",
+            event_type=EventType.WEATHER,
+            frequency_per_year=frequency,
+            avg_duration_days=7.0,
+            severity_distribution={SeverityLevel.MEDIUM: 1.0},
+            last_occurrence=None,
+            trend=TrendDirection.STABLE,
+            confidence=1.0,
+        )
+        expected_events = frequency / 365
+
+        probability = RiskForecaster()._calculate_base_probability(pattern, 1)
+
+        assert probability == pytest.approx(expected_events, rel=1e-5, abs=0)
+
 
 # =============================================================================
 # Property 42: Proactive Alert Generation
@@ -445,6 +779,82 @@ class TestProactiveAlertGeneration:
         if alerts:
             assert alerts[0].warning_level in list(WarningLevel)
 
+    @given(
+        probability=st.sampled_from([0.0, 0.3, 0.4, 0.5, 0.6, 0.7, 0.75, 0.9, 1.0]),
+        severity=severity_strategy,
+    )
+    @settings(max_examples=50)
+    def test_warning_level_follows_weighted_score_cutoffs(
+        self, probability: float, severity: SeverityLevel
+    ):
+        """
+        Property: The level is the highest cut-off the severity-weighted
+        probability reaches, with scores on a cut-off counting as reached.
+        """
+        generator = ProactiveAlertGenerator()
+        score = probability * generator.SEVERITY_WEIGHTS[severity]
+        if score >= 1.4:
+            expected = WarningLevel.CRITICAL
+        elif score >= 1.0:
+            expected = WarningLevel.WARNING
+        elif score >= 0.6:
+            expected = WarningLevel.ADVISORY
+        else:
+            expected = WarningLevel.WATCH
+
+        assert generator._determine_warning_level(probability, severity) == expected
+
+    def test_alert_message_reads_forecast_fields(self):
+        """
+        Property: Alert messages state the forecast's percentages, window
+        and location verbatim.
+        """
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        forecast = RiskForecast(
+            forecast_id="test-forecast",
+            location="100% Port",
+            event_type=EventType.STRIKE,
+            predicted_severity=SeverityLevel.HIGH,
+            probability=0.725,
+            confidence_interval=(0.6, 0.85),
+            forecast_window_start=start,
+            forecast_window_end=start + timedelta(days=30, hours=12),
+            affected_entities=[],
+            preventive_actions=[],
+        )
+
+        message = ProactiveAlertGenerator()._generate_alert_message(forecast)
+
+        assert message == (
+            "Predictive analysis indicates a 72% probability of a High severity "
+            "Strike event in 100% Port within the next 30 days. "
+            "Confidence interval: 60% - 85%."
+        )
+
+    def test_alert_affected_products_are_a_copy(self):
+        """
+        Property: An alert's affected products do not alias the forecast's
+        affected entities.
+        """
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        forecast = RiskForecast(
+            forecast_id="test-forecast",
+            location="Busan",
+            event_type=EventType.STRIKE,
+            predicted_severity=SeverityLevel.HIGH,
+            probability=0.9,
+            confidence_interval=(0.8, 1.0),
+            forecast_window_start=start,
+            forecast_window_end=start + timedelta(days=30),
+            affected_entities=["sup-1", "comp-1"],
+            preventive_actions=[],
+        )
+
+        alert = ProactiveAlertGenerator().generate_alerts_from_forecasts([forecast])[0]
+        alert.affected_products.append("prod-1")
+
+        assert forecast.affected_entities == ["sup-1", "comp-1"]
+
     @given(forecast=risk_forecast_strategy())
     @settings(max_examples=50)
     def test_alert_has_preventive_actions(self, forecast: RiskForecast):
@@ -550,6 +960,41 @@ class TestForecastAccuracyTracking:
         
         assert accuracy.prediction_error == expected_error
 
+    def test_metrics_cover_only_retained_outcomes(self):
+        """
+        Property: Once the history is full, the oldest outcome drops out of
+        the records, the per-forecast outcomes and the metrics.
+        """
+        tracker = ForecastAccuracyTracker(max_history=3)
+        fresh = ForecastAccuracyTracker()
+        for i, occurred in enumerate([False, False, True, True, True]):
+            tracker.record_outcome(forecast_id=f"forecast-{i}", actual_occurred=occurred)
+            if i >= 2:
+                fresh.record_outcome(forecast_id=f"forecast-{i}", actual_occurred=occurred)
+
+        assert [r.forecast_id for r in tracker._accuracy_records] == [
+            "forecast-2", "forecast-3", "forecast-4",
+        ]
+        assert list(tracker._forecast_outcomes) == [
+            "forecast-2", "forecast-3", "forecast-4",
+        ]
+        assert tracker.calculate_metrics() == fresh.calculate_metrics()
+
+    def test_cached_metrics_refresh_after_new_outcome(self):
+        """
+        Property: Metrics reflect every recorded outcome, and callers cannot
+        alter the cached values.
+        """
+        tracker = ForecastAccuracyTracker()
+        tracker.record_outcome(forecast_id="forecast-0", actual_occurred=True)
+
+        first = tracker.calculate_metrics()
+        first["accuracy"] = -1.0
+        assert tracker.calculate_metrics()["accuracy"] == 1.0
+
+        tracker.record_outcome(forecast_id="forecast-1", actual_occurred=False)
+        assert tracker.calculate_metrics()["accuracy"] == 0.5
+
     def test_improvement_recommendations_are_strings(self):
         """
         Property: Improvement recommendations are always strings.
@@ -594,6 +1039,35 @@ class TestForecastAccuracyTracking:
         # Brier score should be in [0, 1]
         assert 0.0 <= metrics["brier_score"] <= 1.0
 
+    @given(outcomes=st.lists(st.booleans(), min_size=1, max_size=50))
+    @settings(max_examples=30)
+    def test_metrics_match_recorded_outcomes(self, outcomes: list[bool]):
+        """
+        Property: Metrics agree with a direct count over the accuracy records.
+        """
+        tracker = ForecastAccuracyTracker()
+        for i, occurred in enumerate(outcomes):
+            tracker.record_outcome(forecast_id=f"forecast-{i}", actual_occurred=occurred)
+
+        records = tracker._accuracy_records
+        predicted = [r.predicted_probability >= 0.5 for r in records]
+        occurred = [r.actual_occurred for r in records]
+        tp = sum(p and o for p, o in zip(predicted, occurred, strict=True))
+        fp = sum(p and not o for p, o in zip(predicted, occurred, strict=True))
+        tn = sum(not p and not o for p, o in zip(predicted, occurred, strict=True))
+        brier = sum(
+            (r.predicted_probability - r.actual_occurred) ** 2 for r in records
+        ) / len(records)
+
+        metrics = tracker.calculate_metrics()
+
+        assert metrics["accuracy"] == round((tp + tn) / len(records), 3)
+        assert metrics["precision"] == round(tp / (tp + fp) if tp + fp else 0.0, 3)
+        assert metrics["brier_score"] == round(brier, 3)
+        assert metrics["mean_prediction_error"] == round(
+            sum(r.prediction_error for r in records) / len(records), 3
+        )
+
 
 # =============================================================================
 # Additional Integration Tests
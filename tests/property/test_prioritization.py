@@ -131,6 +131,31 @@ class TestRiskPrioritizationConsistency:
         # Should only be valid if sum is close to 1.0
         assert is_valid == (0.99 <= expected_sum <= 1.01)
 
+    def test_weights_are_fixed_after_validation(self):
+        """
+        Test: Weights cannot change after a prioritizer has validated them.
+
+        Feature: chain-reaction, Property 2: Risk prioritization consistency
+        Validates: Requirements 1.3
+        """
+        import dataclasses
+
+        weights = PriorityWeights()
+        RiskPrioritizer(weights)
+
+        with pytest.raises(AttributeError):
+            weights.severity = 0.9
+
+        assert weights == PriorityWeights()
+        # Cached derived values are not dataclass fields
+        assert dataclasses.asdict(weights) == {
+            "severity": 0.30,
+            "timeline": 0.20,
+            "products_affected": 0.25,
+            "revenue_impact": 0.15,
+            "confidence": 0.10,
+        }
+
     def test_same_risk_always_gets_same_priority(self):
         """
         Test: Same risk should always receive the same priority score.
@@ -157,6 +182,133 @@ class TestRiskPrioritizationConsistency:
 
         assert score1 == score2
 
+    @given(st.lists(risk_event_strategy(), min_size=1, max_size=10))
+    @settings(max_examples=30, suppress_health_check=[HealthCheck.too_slow])
+    def test_batch_scores_are_weighted_factor_sums(self, risks: list[RiskEvent]):
+        """
+        Property: Batch priority scores are the weighted sum of each risk's
+        factors, ranked from highest to lowest.
+
+        Feature: chain-reaction, Property 2: Risk prioritization consistency
+        Validates: Requirements 1.3
+        """
+        weights = PriorityWeights(
+            severity=0.4,
+            timeline=0.1,
+            products_affected=0.2,
+            revenue_impact=0.2,
+            confidence=0.1,
+        )
+        prioritizer = RiskPrioritizer(weights)
+
+        prioritized = prioritizer.prioritize_risks(risks)
+
+        assert [p.priority_rank for p in prioritized] == list(range(1, len(risks) + 1))
+        scores = [p.priority_score for p in prioritized]
+        assert scores == sorted(scores, reverse=True)
+        for p_risk in prioritized:
+            factors = p_risk.factors_dict
+            assert p_risk.priority_score == pytest.approx(
+                factors["severity"] * weights.severity
+                + factors["timeline"] * weights.timeline
+                + factors["products_affected"] * weights.products_affected
+                + factors["revenue_impact"] * weights.revenue_impact
+                + factors["confidence"] * weights.confidence
+            )
+
+    @given(st.sampled_from([
+        (timedelta(0), 1.0),
+        (timedelta(minutes=59), 1.0),
+        (timedelta(hours=1), 0.9),
+        (timedelta(hours=23, minutes=59), 0.9),
+        (timedelta(hours=24), 0.7),
+        (timedelta(days=7), 0.5),
+        (timedelta(days=29, hours=23), 0.5),
+        (timedelta(days=30), 0.3),
+        (timedelta(days=400), 0.3),
+    ]))
+    @settings(max_examples=20)
+    def test_timeline_score_steps_down_at_age_bounds(self, case: tuple[timedelta, float]):
+        """
+        Property: A risk exactly at an age bound gets the older bucket's score.
+
+        Feature: chain-reaction, Property 2: Risk prioritization consistency
+        Validates: Requirements 1.3
+        """
+        age, expected = case
+        now = datetime.now(timezone.utc)
+
+        assert RiskPrioritizer()._calculate_timeline_score(now - age, now) == expected
+
+    def test_batch_revenue_scores_match_single_risk_scores(self):
+        """
+        Test: Revenue-weighted batch scores match scoring each risk alone.
+
+        Feature: chain-reaction, Property 2: Risk prioritization consistency
+        Validates: Requirements 1.3
+        """
+        now = datetime.now(timezone.utc)
+        risks = [
+            RiskEvent(
+                id=f"RISK-{i}", event_type=EventType.WEATHER, description="Storm",
+                location="Taiwan", severity=SeverityLevel.HIGH, confidence=0.9,
+                detected_at=now, source_url="http://x", affected_entities=["P"],
+            )
+            for i in range(3)
+        ]
+        impacts = {
+            f"RISK-{i}": ImpactAssessment(
+                risk_event_id=f"RISK-{i}",
+                affected_suppliers=[],
+                affected_components=[],
+                affected_products=products,
+                impact_paths=[],
+                severity_score=5.0,
+                redundancy_level=0.5,
+                mitigation_options=[],
+            )
+            for i, products in enumerate([["PROD-1"], ["PROD-1", "PROD-2"], []])
+        }
+        revenue_data = {"PROD-1": 400_000.0, "PROD-2": 900_000.0}
+        prioritizer = RiskPrioritizer()
+
+        prioritized = prioritizer.prioritize_risks(risks, impacts, revenue_data)
+
+        revenue_scores = {
+            p.risk_event.id: p.factors_dict["revenue_impact"] for p in prioritized
+        }
+        assert revenue_scores == {"RISK-0": 0.4, "RISK-1": 1.0, "RISK-2": 0.0}
+        for p_risk in prioritized:
+            single = prioritizer.calculate_priority(
+                p_risk.risk_event, impacts[p_risk.risk_event.id], revenue_data
+            )
+            assert single.factors == p_risk.factors
+
+    @given(st.lists(risk_event_strategy(), min_size=1, max_size=10))
+    @settings(max_examples=30, suppress_health_check=[HealthCheck.too_slow])
+    def test_product_risk_is_max_plus_tenth_of_others(self, risks: list[RiskEvent]):
+        """
+        Property: A product's aggregated risk is its highest priority score
+        plus 10% of the rest, capped at 1.0.
+
+        Feature: chain-reaction, Property 2: Risk prioritization consistency
+        Validates: Requirements 1.3
+        """
+        prioritizer = RiskPrioritizer()
+        prioritized = prioritizer.prioritize_risks(risks)
+
+        aggregated = prioritizer.aggregate_product_risks(prioritized)
+
+        scores_by_product: dict[str, list[float]] = {}
+        for p_risk in prioritized:
+            for entity in p_risk.risk_event.affected_entities:
+                scores_by_product.setdefault(entity, []).append(p_risk.priority_score)
+        assert aggregated.keys() == scores_by_product.keys()
+        for product_id, scores in scores_by_product.items():
+            scores.sort(reverse=True)
+            expected = min(scores[0] + sum(scores[1:]) * 0.1, 1.0)
+            assert aggregated[product_id] == pytest.approx(expected)
+
     def test_sort_by_severity_order(self):
         """
         Test: Sorting by severity maintains proper order.
@@ -330,6 +482,128 @@ class TestImpactReportCompleteness:
         assert timeline.peak_impact <= timeline.expected_resolution
         assert 0.0 <= timeline.confidence <= 1.0
 
+    @given(st.text(min_size=1, max_size=80))
+    @settings(max_examples=30)
+    def test_title_marks_only_truncated_descriptions(self, description: str):
+        """
+        Property: Report titles carry the description, cut to 50 characters
+        with an ellipsis only when it was longer.
+
+        Feature: chain-reaction, Property 15: Impact report completeness
+        Validates: Requirements 6.5
+        """
+        risk = RiskEvent(
+            id="RISK-0001",
+            event_type=EventType.FIRE,
+            description=description,
+            location="Japan",
+            severity=SeverityLevel.LOW,
+            confidence=0.9,
+            source_url="https://example.com",
+        )
+        impact = ImpactAssessment(
+            risk_event_id="RISK-0001",
+            affected_suppliers=[],
+            affected_components=[],
+            affected_products=[],
+            impact_paths=[],
+            severity_score=2.0,
+            redundancy_level=0.5,
+            mitigation_options=[],
+        )
+
+        title = ReportGenerator().generate_report(risk, impact).title
+
+        if len(description) <= 50:
+            assert title == f"Impact Report: {description}"
+        else:
+            assert title == f"Impact Report: {description[:50]}..."
+
+    def test_batch_reports_match_single_reports(self):
+        """
+        Test: Batch generation gives one report per job, in order, matching
+        single-report output apart from the shared generation time.
+
+        Feature: chain-reaction, Property 15: Impact report completeness
+        Validates: Requirements 6.5
+        """
+        generator = ReportGenerator()
+        jobs = []
+        for i, severity in enumerate([SeverityLevel.LOW, SeverityLevel.CRITICAL]):
+            risk = RiskEvent(
+                id=f"RISK-{i}",
+                event_type=EventType.STRIKE,
+                description=f"Strike {i}",
+                location="Germany",
+                severity=severity,
+                confidence=0.9,
+                source_url="https://example.com",
+            )
+            impact = ImpactAssessment(
+                risk_event_id=risk.id,
+                affected_suppliers=[],
+                affected_components=[],
+                affected_products=["PROD-001"],
+                impact_paths=[],
+                severity_score=3.0 + i * 5,
+                redundancy_level=0.4,
+                mitigation_options=["Negotiate"],
+            )
+            product_data = {"PROD-001": {"revenue": 10.0}} if i else None
+            jobs.append((risk, impact, product_data))
+
+        reports = generator.generate_reports(jobs)
+
+        assert [r.risk_event_id for r in reports] == ["RISK-0", "RISK-1"]
+        assert reports[0].generated_at == reports[1].generated_at
+        for report, (risk, impact, product_data) in zip(reports, jobs, strict=True):
+            single = generator.generate_report(risk, impact, product_data)
+            assert report.title == single.title
+            assert report.executive_summary == single.executive_summary
+            assert report.affected_products == single.affected_products
+            assert report.total_revenue_impact == single.total_revenue_impact
+            assert report.timeline.impact_start - report.generated_at == (
+                single.timeline.impact_start - single.generated_at
+            )
+
+    def test_timeline_is_measured_from_generation_time(self):
+        """
+        Test: Timeline dates are whole-day offsets from the report's
+        generation time.
+
+        Feature: chain-reaction, Property 15: Impact report completeness
+        Validates: Requirements 6.5
+        """
+        generator = ReportGenerator()
+        risk = RiskEvent(
+            id="RISK-0001",
+            event_type=EventType.WEATHER,
+            description="Typhoon",
+            location="Taiwan",
+            severity=SeverityLevel.HIGH,
+            confidence=0.9,
+            detected_at=datetime.now(timezone.utc),
+            source_url="https://example.com",
+            affected_entities=["Fab"],
+        )
+        impact = ImpactAssessment(
+            risk_event_id="RISK-0001",
+            affected_suppliers=["SUP-001"],
+            affected_components=["COMP-001"],
+            affected_products=["PROD-001"],
+            impact_paths=[],
+            severity_score=7.0,
+            redundancy_level=0.5,
+            mitigation_options=[],
+        )
+
+        report = generator.generate_report(risk, impact)
+        timeline = report.timeline
+
+        assert timeline.impact_start - report.generated_at == timedelta(days=3)
+        assert timeline.peak_impact - report.generated_at == timedelta(days=14)
+        assert timeline.expected_resolution - report.generated_at == timedelta(days=45)
+
     @given(st.sampled_from(list(SeverityLevel)))
     @settings(max_examples=10)
     def test_report_severity_matches_risk(self, severity: SeverityLevel):
@@ -410,6 +684,64 @@ class TestImpactReportCompleteness:
         assert "report_id" in parsed
         assert "executive_summary" in parsed
 
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_json_export_matches_report_fields(self, use_orjson: bool, monkeypatch):
+        """
+        Test: JSON export holds every report field, with dates as ISO strings,
+        whichever encoder is used.
+
+        Feature: chain-reaction, Property 15: Impact report completeness
+        Validates: Requirements 6.5
+        """
+        import dataclasses
+        import json
+
+        from src.analysis import reporting
+
+        if not use_orjson:
+            monkeypatch.setattr(reporting, "_dump_json", reporting._dump_json_stdlib)
+        elif reporting.orjson is None:
+            pytest.skip("orjson is not installed")
+
+        generator = ReportGenerator()
+        risk = RiskEvent(
+            id="RISK-0001",
+            event_type=EventType.STRIKE,
+            description="Dock strike in Zürich",
+            location="Zürich",
+            severity=SeverityLevel.HIGH,
+            confidence=0.8,
+            detected_at=datetime.now(timezone.utc),
+            source_url="https://example.com",
+            affected_entities=["Port"],
+        )
+        impact = ImpactAssessment(
+            risk_event_id="RISK-0001",
+            affected_suppliers=["SUP-001"],
+            affected_components=["COMP-001"],
+            affected_products=["PROD-001", "PROD-002"],
+            impact_paths=[],
+            severity_score=6.5,
+            redundancy_level=0.3,
+            mitigation_options=["Reroute shipments"],
+        )
+        report = generator.generate_report(
+            risk, impact, {"PROD-001": {"name": "Chip", "revenue": 1234.5}}
+        )
+
+        def isoformat_dates(value):
+            if isinstance(value, datetime):
+                return value.isoformat()
+            if isinstance(value, dict):
+                return {k: isoformat_dates(v) for k, v in value.items()}
+            if isinstance(value, list):
+                return [isoformat_dates(v) for v in value]
+            return value
+
+        parsed = json.loads(generator.export_json(report))
+
+        assert parsed == isoformat_dates(dataclasses.asdict(report))
+
     def test_markdown_export_has_sections(self):
         """
         Test: Markdown export contains all sections.
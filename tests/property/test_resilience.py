@@ -9,7 +9,10 @@ Tests the resilience scoring functionality, verifying:
 - Property 15: Resilience Recalculation Timeliness
 """
 
+import asyncio
+import json
 from datetime import datetime, timezone, timedelta
+from unittest.mock import AsyncMock, Mock
 from hypothesis import given, settings, assume
 from hypothesis import strategies as st
 import pytest
@@ -19,6 +22,13 @@ from src.models import (
     ResilienceMetrics,
     HistoricalResilienceScore,
 )
+from src.analysis.resilience import (
+    ResilienceHistoryTracker,
+    ResilienceRecalculator,
+    ResilienceScorer,
+    _aggregate_components,
+)
+from src.graph import SupplyChainRepository, bump_graph_generation, graph_generation
 
 
 # =============================================================================
@@ -243,6 +253,32 @@ class TestRedundancyImpactOnResilience:
         assert resilience.score == round(score, 2)
         assert resilience.redundancy_factor == redundancy
 
+    @given(count=st.integers(min_value=0, max_value=1000))
+    @settings(max_examples=100)
+    def test_redundancy_and_diversity_tiers_match_formulas(self, count: int):
+        """
+        Property: The tier tables give the same factors as the piecewise
+        redundancy and diversity formulas, including past the 1.0 cap.
+        """
+        if count == 0:
+            expected_redundancy = 0.0
+            expected_diversity = 0.0
+        elif count == 1:
+            expected_redundancy = 0.3
+            expected_diversity = 0.4
+        else:
+            expected_redundancy = min(1.0, 0.6 + (count - 2) * 0.1)
+            expected_diversity = min(1.0, 0.4 + (count - 1) * 0.2)
+
+        redundancy_tiers = ResilienceScorer._REDUNDANCY_TIERS
+        diversity_tiers = ResilienceScorer._DIVERSITY_TIERS
+        assert redundancy_tiers[min(count, len(redundancy_tiers) - 1)] == expected_redundancy
+        assert diversity_tiers[min(count, len(diversity_tiers) - 1)] == expected_diversity
+
+        suppliers = [{"supplier_id": f"sup-{i}", "country": f"C{i}"} for i in range(count)]
+        score = ResilienceScorer(Mock())._score_from_suppliers("comp-1", suppliers)
+        assert score.redundancy_factor == expected_redundancy
+
 
 # =============================================================================
 # Property 13: Multi-Level Resilience Metrics
@@ -321,6 +357,160 @@ class TestMultiLevelResilienceMetrics:
         assert metrics.single_points_of_failure >= 0
         assert 0.0 <= metrics.redundancy_coverage <= 1.0
 
+    async def test_product_resilience_fetches_components_in_one_query(self):
+        """
+        Property: Product scores come from a single supplier-matrix query and
+        match scoring each component on its own.
+        """
+        rows = [
+            {"component_id": "comp-1", "suppliers": [
+                {"supplier_id": "sup-1", "country": "TW", "risk_score": 30},
+                {"supplier_id": "sup-2", "country": "JP", "risk_score": 50},
+                {"supplier_id": "sup-3", "country": "TW", "risk_score": 10},
+            ]},
+            {"component_id": "comp-2", "suppliers": [
+                {"supplier_id": "sup-4", "country": "CN", "risk_score": 80},
+            ]},
+            {"component_id": "comp-3", "suppliers": [{"supplier_id": None}]},
+        ]
+        connection = Mock(execute_query=AsyncMock(return_value=rows))
+        scorer = ResilienceScorer(connection)
+
+        metrics = await scorer.calculate_product_resilience("prod-1")
+
+        assert connection.execute_query.await_count == 1
+        expected = [
+            scorer._score_from_suppliers(row["component_id"], row["suppliers"])
+            for row in rows
+        ]
+        assert [(s.entity_id, s.score, s.redundancy_factor)
+                for s in metrics.component_scores] == [
+            (s.entity_id, s.score, s.redundancy_factor) for s in expected
+        ]
+        assert metrics.single_points_of_failure == 2
+        assert metrics.redundancy_coverage == pytest.approx(1 / 3)
+
+    async def test_portfolio_resilience_groups_rows_by_product(self):
+        """
+        Property: Portfolio metrics are built from one query, and products
+        without components still count towards the average.
+        """
+        supplier = {"supplier_id": "sup-1", "country": "TW", "risk_score": 20}
+        rows = [
+            {"product_id": "prod-1", "component_id": "comp-1", "suppliers": [supplier]},
+            {"product_id": "prod-1", "component_id": "comp-2", "suppliers": [supplier]},
+            {"product_id": "prod-2", "component_id": None, "suppliers": []},
+        ]
+        connection = Mock(execute_query=AsyncMock(return_value=rows))
+        scorer = ResilienceScorer(connection)
+
+        portfolio = await scorer.calculate_portfolio_resilience()
+
+        assert connection.execute_query.await_count == 1
+        component_score = scorer._score_from_suppliers("comp-1", [supplier]).score
+        assert portfolio.overall_score == round(component_score / 2, 2)
+        assert len(portfolio.component_scores) == 2
+        assert portfolio.single_points_of_failure == 2
+
+    @given(component_scores=st.lists(resilience_score_model_strategy(), max_size=30))
+    @settings(max_examples=50)
+    def test_single_pass_aggregate_matches_separate_reductions(
+        self, component_scores: list[ResilienceScore]
+    ):
+        """
+        Property: The single-pass component aggregate equals computing the
+        mean and both redundancy counts separately.
+        """
+        mean_score, with_redundancy, single_points = _aggregate_components(
+            component_scores
+        )
+
+        if component_scores:
+            assert mean_score == sum(s.score for s in component_scores) / len(
+                component_scores
+            )
+        else:
+            assert mean_score == 0.0
+        assert with_redundancy == sum(
+            1 for s in component_scores if s.redundancy_factor > 0.5
+        )
+        assert single_points == sum(
+            1 for s in component_scores if s.redundancy_factor < 0.4
+        )
+
+    async def test_scores_are_cached_until_the_graph_changes(self):
+        """
+        Property: Repeat lookups within a graph generation reuse the cached
+        score; bumping the generation forces a fresh query.
+        """
+        connection = Mock(execute_query=AsyncMock(return_value=[
+            {"component_id": "comp-1", "suppliers": [
+                {"supplier_id": "sup-1", "country": "TW", "risk_score": 20},
+            ]},
+        ]))
+        scorer = ResilienceScorer(connection)
+
+        first = await scorer.calculate_component_resilience("comp-1")
+        first.score = -1.0
+        second = await scorer.calculate_component_resilience("comp-1")
+        assert second is not first
+        assert second.score >= 0.0
+        assert connection.execute_query.await_count == 1
+
+        bump_graph_generation()
+        await scorer.calculate_component_resilience("comp-1")
+        assert connection.execute_query.await_count == 2
+
+        stats = scorer.get_stats()
+        assert (stats["hits"], stats["misses"]) == (1, 2)
+
+    async def test_score_cache_evicts_least_recently_used(self):
+        """
+        Property: The score cache never grows past its configured size.
+        """
+        connection = Mock(execute_query=AsyncMock(return_value=[
+            {"component_id": "comp", "suppliers": []},
+        ]))
+        scorer = ResilienceScorer(connection, cache_size=2)
+
+        for component_id in ["comp-1", "comp-2", "comp-1", "comp-3"]:
+            await scorer.calculate_component_resilience(component_id)
+        await scorer.calculate_component_resilience("comp-1")
+
+        assert scorer.get_stats()["component_entries"] == 2
+        assert connection.execute_query.await_count == 3
+
+    async def test_only_structural_writes_invalidate_scores(self, sample_risk_event):
+        """
+        Property: Supply chain structure writes bump the graph generation;
+        risk event writes do not, so they keep cached scores usable.
+        """
+        repository = SupplyChainRepository(
+            Mock(execute_query=AsyncMock(return_value=[]))
+        )
+
+        before = graph_generation()
+        await repository.create_risk_event(sample_risk_event)
+        assert graph_generation() == before
+
+        await repository.link_supplier_to_component("sup-1", "comp-1")
+        assert graph_generation() == before + 1
+
+    async def test_score_cache_entries_expire(self):
+        """
+        Property: A cached score is not served past its TTL, so writes made
+        by other processes are picked up.
+        """
+        connection = Mock(execute_query=AsyncMock(return_value=[
+            {"component_id": "comp-1", "suppliers": []},
+        ]))
+        scorer = ResilienceScorer(connection, cache_ttl=0.0)
+
+        await scorer.calculate_component_resilience("comp-1")
+        await scorer.calculate_component_resilience("comp-1")
+
+        assert connection.execute_query.await_count == 2
+
 
 # =============================================================================
 # Property 14: Historical Resilience Tracking
@@ -422,6 +612,33 @@ class TestHistoricalResilienceTracking:
         # Trend is deterministic based on score change
         assert expected_trend in {"stable", "improving", "declining"}
 
+    async def test_factors_round_trip_through_storage_as_json(self):
+        """
+        Property: Recorded factors are stored as JSON and read back intact,
+        while legacy dict-repr rows still load without being evaluated.
+        """
+        connection = Mock(execute_write=AsyncMock(), execute_query=AsyncMock())
+        tracker = ResilienceHistoryTracker(connection)
+        factors = {"redundancy_factor": 0.6, "diversity": 0.4}
+
+        await tracker.record_score("comp-1", 72.5, factors)
+        stored = connection.execute_write.await_args.args[1]["factors"]
+        assert json.loads(stored) == factors
+
+        connection.execute_query.return_value = [
+            {"entity_id": "comp-1", "score": 72.5, "factors": stored},
+            {"entity_id": "comp-1", "score": 70.0, "factors": str(factors)},
+            {"entity_id": "comp-1", "score": 65.0,
+             "factors": "__import__('os').getcwd()"},
+            {"entity_id": "comp-1", "score": 60.0, "factors": None},
+            {"entity_id": "comp-1", "score": 55.0, "factors": "1"},
+            {"entity_id": "comp-1", "score": 50.0, "factors": "[0.5, 0.4]"},
+            {"entity_id": "comp-1", "score": 45.0, "factors": "(" * 100_000},
+        ]
+        history = await tracker.get_history("comp-1")
+
+        assert [h.factors for h in history] == [factors, factors, {}, {}, {}, {}, {}]
+
 
 # =============================================================================
 # Property 15: Resilience Recalculation Timeliness
@@ -486,6 +703,50 @@ class TestResilienceRecalculationTimeliness:
         age = datetime.now(timezone.utc) - resilience.calculated_at
         assert age < timedelta(minutes=1)
 
+    async def test_recalculation_overlaps_entities_within_limit(self):
+        """
+        Property: Recalculation runs entities concurrently, never exceeding
+        the configured number in flight, and scores every entity.
+        """
+        in_flight = 0
+        peak = 0
+
+        async def execute_query(query, params):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            return [{"component_id": params["component_id"], "suppliers": []}]
+
+        connection = Mock(execute_query=execute_query, execute_write=AsyncMock())
+        recalculator = ResilienceRecalculator(connection)
+        entity_ids = [f"entity-{i}" for i in range(40)]
+
+        results = await recalculator.trigger_recalculation(entity_ids)
+
+        assert list(results) == entity_ids
+        assert 1 < peak <= ResilienceRecalculator.MAX_CONCURRENT_RECALCULATIONS
+        assert connection.execute_write.await_count == len(entity_ids)
+
+    async def test_cancelled_recalculation_is_not_reported_as_a_score(self):
+        """
+        Property: An entity whose recalculation is cancelled is left out of
+        the results and stays pending.
+        """
+        async def execute_query(query, params):
+            if params["component_id"] == "entity-1":
+                raise asyncio.CancelledError()
+            return [{"component_id": params["component_id"], "suppliers": []}]
+
+        connection = Mock(execute_query=execute_query, execute_write=AsyncMock())
+        recalculator = ResilienceRecalculator(connection)
+
+        results = await recalculator.trigger_recalculation(["entity-0", "entity-1"])
+
+        assert list(results) == ["entity-0"]
+        assert "entity-1" in recalculator._pending_recalculations
+
 
 # =============================================================================
 # Trend Calculation Tests